@@ -11,13 +11,20 @@ import os
 import re
 import queue
 from datetime import datetime
-from concurrent.futures import ThreadPoolExecutor, as_completed, Future
+from collections.abc import Iterator
+from concurrent.futures import ThreadPoolExecutor, Future, wait
 
 # ----------------------------------------------------------------------
 # Import the scraper (the huge script you posted earlier)
 # ----------------------------------------------------------------------
 try:
-    from scraper_v3 import ContactScraper, MapsScraper, save_results
+    from scraper_v3 import (
+        AIMDController, BrowserPool, ContactScraper, DNSCache, Fetcher, HostScheduler,
+        JobJournal, MapsScraper, NegativeCache,
+        PARSER_BACKENDS, RenderHistory, ResponseCache, ResultSink, SiteAliases,
+        drop_dead_hosts, failure_reason, file_job_name, get_output_dir, get_page_class,
+        group_site_aliases, harvest_sites,
+    )
 except Exception as e:
     messagebox.showerror(
         "Import Error",
@@ -29,16 +36,23 @@ except Exception as e:
 # ----------------------------------------------------------------------
 # Helper wrappers – keep the scraper code untouched
 # ----------------------------------------------------------------------
-def scrape_one_site(url: str) -> dict:
+def scrape_one_site(
+    url: str,
+    fetcher: Fetcher | None = None,
+    parser: str = "html.parser",
+    browser_pool: BrowserPool | None = None,
+) -> dict:
     """Run ContactScraper on a single URL and return its dict result."""
-    scraper = ContactScraper(url)
+    scraper = ContactScraper(
+        url, fetcher=fetcher, parser=parser, browser_pool=browser_pool
+    )
     return scraper.run()
 
 
-def get_maps_sites(keywords: str, limit: int) -> list[str]:
-    """Run MapsScraper and return the list of website URLs."""
+def get_maps_sites(keywords: str, limit: int) -> Iterator[str]:
+    """Run MapsScraper, yielding each website URL as soon as it's found."""
     maps = MapsScraper(keywords, limit=limit)
-    return maps.run()
+    yield from maps.iter_websites()
 
 
 # ----------------------------------------------------------------------
@@ -66,8 +80,13 @@ class ScraperGUI:
         self.max_workers_var = tk.IntVar(value=12)
         self.save_results_var = tk.BooleanVar(value=True)
         self.file_path_var = tk.StringVar()
+        self.parser_var = tk.StringVar(value="html.parser")
+        self.use_cache_var = tk.BooleanVar(value=False)
+        self.adaptive_var = tk.BooleanVar(value=False)
+        self.controller: AIMDController | None = None
 
         self.is_running = False
+        self.resume_job = False  # file mode: continue the file's unfinished job
         self.executor: ThreadPoolExecutor | None = None
         self.futures: dict[Future, str] = {}   # future → site URL
         self.results: list[dict] = []
@@ -157,13 +176,28 @@ class ScraperGUI:
         # ---- Workers ----
         self.workers_lbl = ttk.Label(f, text="Max Threads:")
         self.workers_spn = ttk.Spinbox(
-            f, from_=1, to=30, textvariable=self.max_workers_var, width=10
+            f, from_=1, to=500, textvariable=self.max_workers_var, width=10
         )
 
+        # ---- Parser backend (always visible) ----
+        ttk.Label(f, text="HTML Parser:").grid(row=98, column=0, sticky="w", pady=5)
+        ttk.Combobox(
+            f, textvariable=self.parser_var, values=list(PARSER_BACKENDS),
+            state="readonly", width=12
+        ).grid(row=98, column=1, sticky="w", pady=5, padx=5)
+
         # ---- Save checkbox ----
         ttk.Checkbutton(
             f, text="Save results to JSON/CSV", variable=self.save_results_var
         ).grid(row=99, column=0, columnspan=2, sticky="w", pady=10)
+        ttk.Checkbutton(
+            f, text="Use HTTP cache (re-runs skip unchanged pages)",
+            variable=self.use_cache_var
+        ).grid(row=100, column=0, columnspan=2, sticky="w")
+        ttk.Checkbutton(
+            f, text="Adaptive concurrency (Max Threads becomes the upper bound)",
+            variable=self.adaptive_var
+        ).grid(row=101, column=0, columnspan=2, sticky="w")
 
         self.on_mode_change()   # initial visibility
 
@@ -326,9 +360,10 @@ class ScraperGUI:
                 self._insert_tree_row(res)
                 self.completed += 1
                 self.progress["value"] = (self.completed / self.total_sites) * 100
-                self.status_lbl.config(
-                    text=f"Completed: {self.completed}/{self.total_sites}"
-                )
+                status = f"Completed: {self.completed}/{self.total_sites}"
+                if self.controller:
+                    status += f" · limit {self.controller.limit}"
+                self.status_lbl.config(text=status)
             except queue.Empty:
                 break
 
@@ -372,6 +407,11 @@ class ScraperGUI:
             if not path or not os.path.isfile(path):
                 messagebox.showerror("File", "Select a valid URL file")
                 return False
+        try:
+            get_page_class(self.parser_var.get())
+        except RuntimeError as e:
+            messagebox.showerror("Parser", str(e))
+            return False
         return True
 
     def start_scraping(self):
@@ -380,6 +420,9 @@ class ScraperGUI:
 
         # ---- CLEAN PREVIOUS RUN ----
         self._reset_run_state()
+        self.resume_job = self.mode_var.get() == "file" and self._ask_resume(
+            self.file_path_var.get()
+        )
 
         self.is_running = True
         self.start_btn.config(state="disabled")
@@ -392,6 +435,23 @@ class ScraperGUI:
 
         threading.Thread(target=self._scrape_worker, daemon=True).start()
 
+    def _ask_resume(self, path: str) -> bool:
+        """Offer to continue an interrupted run over the same URL file."""
+        name = file_job_name(path)
+        if not JobJournal.path_for(name).exists():
+            return False
+        journal = JobJournal(name)
+        counts = journal.counts()
+        journal.close()
+        done = counts["completed"] + counts["failed"]
+        if not done or not (counts["pending"] or counts["failed"]):
+            return False
+        return messagebox.askyesno(
+            "Resume",
+            f"A previous run of this file finished {done} of {done + counts['pending']} "
+            f"URLs ({counts['failed']} failed).\n\nResume it? (No starts over)",
+        )
+
     def _reset_run_state(self):
         """Make sure a brand-new executor is used on every click."""
         if self.executor:
@@ -415,61 +475,169 @@ class ScraperGUI:
     # Core scraping worker (runs in its own thread)
     # ------------------------------------------------------------------
     def _scrape_worker(self):
+        # kept local: stop_scraping() clears self.executor from the UI thread
+        journal = executor = fetcher = browser_pool = sink = None
         try:
             mode = self.mode_var.get()
             max_workers = self.max_workers_var.get()
+            parser = self.parser_var.get()
 
             # ---- 1. Gather URLs -------------------------------------------------
             if mode == "url":
                 sites = [self.url_var.get().strip()]
                 self.total_sites = 1
             elif mode == "keywords":
+                # scraped as they're found; total_sites grows while Maps scrolls
                 self.log(f"Searching Google Maps: {self.keywords_var.get()}", "info")
                 sites = get_maps_sites(self.keywords_var.get(),
                                       self.num_sites_var.get())
-                self.total_sites = len(sites)
-                self.log(f"Found {self.total_sites} sites", "success")
+                self.total_sites = 0
             else:   # file
                 path = self.file_path_var.get()
                 with open(path, "r", encoding="utf-8") as f:
                     sites = [line.strip() for line in f if line.strip()]
+                journal = JobJournal(file_job_name(path))
+                if self.resume_job:
+                    sites = journal.todo(max_attempts=3)
+                    self.log(f"Resuming: {len(sites)} URLs left", "success")
+                else:
+                    journal.reset()
+                    journal.add(sites)
+                    journal.set_meta(mode="file", source=path, output=self._output_name())
+                    self.log(f"Loaded {len(sites)} URLs from file", "success")
                 self.total_sites = len(sites)
-                self.log(f"Loaded {self.total_sites} URLs from file", "success")
 
-            if not sites:
+            if isinstance(sites, list) and not sites:
                 self.log("No sites to scrape", "error")
                 return
 
             # ---- 2. **NEW** ThreadPoolExecutor for THIS run --------------------
-            self.executor = ThreadPoolExecutor(max_workers=max_workers)
-            self.futures = {
-                self.executor.submit(scrape_one_site, url): url for url in sites
-            }
+            # one pooled HTTP session shared by all workers (keep-alive per host)
+            cache = negative = history = None
+            if self.use_cache_var.get():
+                cache_dir = get_output_dir() / "http_cache"
+                cache = ResponseCache(cache_dir / "responses.sqlite3")
+                negative = NegativeCache(cache_dir / "failures.sqlite3")
+                history = RenderHistory(cache_dir / "renders.sqlite3")
+            # AIMD limit on requests in flight, bounded by the thread count
+            self.controller = None
+            if self.adaptive_var.get():
+                self.controller = AIMDController(
+                    initial=min(16, max_workers), min_limit=min(4, max_workers),
+                    max_limit=max_workers,
+                )
+            dns_cache = DNSCache()  # one lookup per host for the whole run
+            fetcher = Fetcher(
+                pool_connections=max(100, max_workers * 2),
+                cache=cache,
+                negative=negative,
+                # per-host / per-IP rate limits
+                scheduler=HostScheduler(dns_cache=dns_cache),
+                controller=self.controller,
+                dns_cache=dns_cache,
+            )
+            # a few long-lived browsers shared by every worker for React/Vue pages
+            browser_pool = BrowserPool(size=min(2, max_workers), history=history)
+            # results go to disk as they land, not all at once at the end
+            if self.save_results_var.get():
+                # a resumed file job keeps appending to its original files
+                name = journal.meta()["output"] if journal else self._output_name()
+                sink = ResultSink(name, final_json=True)
+
+            def record(result: dict):
+                self.add_result(result)
+                if sink:
+                    sink.write(result)
+                if journal:
+                    journal.record(result["website"], result, error=failure_reason(result))
+
+            # http/https, www and UTM variants of one site are scraped once
+            aliases = SiteAliases()
+            if isinstance(sites, list):
+                # domains that don't exist are reported now, not after a timeout per probe
+                sites = drop_dead_hosts(sites, dns_cache, 32, record)
+                if len(sites) > 1:
+                    aliases.update(group_site_aliases(sites, fetcher))
+                    if len(aliases.groups) < len(sites):
+                        self.log(f"{len(sites)} URLs are {len(aliases.groups)} distinct sites", "info")
+                    sites = list(aliases.groups)
+            else:
+                def count_input(url: str):
+                    self.total_sites += 1
+
+                sites = harvest_sites(sites, aliases, dns_cache, record, count_input)
+            executor = self.executor = ThreadPoolExecutor(max_workers=max_workers)
+            futures = self.futures = {}
+            finished = queue.Queue()   # completed futures, then None
+
+            def feed():
+                # submits while Maps is still scrolling in keywords mode
+                try:
+                    for url in sites:
+                        if not self.is_running:
+                            break
+                        try:
+                            future = executor.submit(
+                                scrape_one_site, url, fetcher, parser, browser_pool
+                            )
+                        except RuntimeError:  # stopped between the check and the submit
+                            break
+                        futures[future] = url
+                        future.add_done_callback(finished.put)
+                    if mode == "keywords" and self.is_running:
+                        if self.total_sites:
+                            self.log(f"Found {self.total_sites} sites", "success")
+                        else:
+                            self.log("No sites to scrape", "error")
+                except Exception as e:
+                    self.log(f"Gathering sites failed: {e}", "error")
+                finally:
+                    wait(list(futures))
+                    finished.put(None)
+
+            threading.Thread(target=feed, daemon=True).start()
 
             # ---- 3. Consume futures --------------------------------------------
-            for future in as_completed(self.futures):
+            for future in iter(finished.get, None):
                 if not self.is_running:
                     break
-                url = self.futures[future]
+                url = futures[future]
                 try:
                     result = future.result()
+                    error = failure_reason(result)
                 except Exception as exc:
                     result = {"website": url, "emails": "Error", "numbers": "Error"}
+                    error = str(exc)
                     self.log(f"{url} → {exc}", "error")
                 finally:
-                    self.add_result(result)
-
-            # ---- 4. Clean shutdown of the pool ---------------------------------
-            self.executor.shutdown(wait=True)
-
-            # ---- 5. Auto-save --------------------------------------------------
-            if self.save_results_var.get() and self.results:
-                self._auto_save()
-
-            self.log("Scraping finished", "success")
+                    for row in aliases.finish({**result, "website": url}):
+                        self.add_result(row)
+                        if sink:
+                            sink.write(row)
+                        if journal:
+                            journal.record(row["website"], row, error=error)
+
+            if self.is_running:
+                self.log("Scraping finished", "success")
         except Exception as e:
             self.log(f"Fatal error: {e}", "error")
         finally:
+            # ---- 4. Clean shutdown, also after Stop or an error ----------------
+            # running sites finish first: they still use the fetcher/browsers
+            if executor:
+                executor.shutdown(wait=True, cancel_futures=True)
+            if browser_pool:
+                browser_pool.close()
+            if fetcher:
+                fetcher.close()
+
+            # ---- 5. Auto-save --------------------------------------------------
+            if sink:
+                sink.close()
+                if sink.count:
+                    self.log(f"Auto-saved → {sink.jsonl_path}", "success")
+            if journal:
+                journal.close()
             self.root.after(0, self._finished)
 
 
@@ -491,17 +659,14 @@ class ScraperGUI:
     # ------------------------------------------------------------------
     # Export / auto-save
     # ------------------------------------------------------------------
-    def _auto_save(self):
+    def _output_name(self) -> str:
         timestamp = datetime.now().strftime("%Y-%m-%d_%H-%M-%S")
         base = {
             "url": "single",
             "keywords": re.sub(r"[^\w\-_]", "_", self.keywords_var.get()),
             "file": "file",
         }[self.mode_var.get()]
-
-        name = f"contacts_[{base}]_{timestamp}"
-        save_results(self.results, name)
-        self.log(f"Auto-saved → json_data/{name}.json", "success")
+        return f"contacts_[{base}]_{timestamp}"
 
     def export_results(self):
         if not self.results:
@@ -8,14 +8,18 @@ import os
 import json
 import csv
 import re
+import time
 from typing import Optional
 from datetime import datetime
 from pprint import pprint
 from typing import List, Set, Dict
 import urllib.parse
 from urllib.parse import urlparse
+import atexit
+import queue
+import threading
 import requests
-from concurrent.futures import ThreadPoolExecutor
+from concurrent.futures import Future, ThreadPoolExecutor
 from colorama import init, Fore, Style
 from bs4 import BeautifulSoup, XMLParsedAsHTMLWarning
 # from selenium import webdriver
@@ -234,12 +238,255 @@ def normalize_phone(phone: str) -> Optional[str]:
     return None
 
 
+# ==============================
+# Browser Pool
+# ==============================
+# Analytics / ad / session-replay hosts; nothing on them carries contact info
+TRACKER_HOSTS = (
+    "google-analytics.com",
+    "googletagmanager.com",
+    "googlesyndication.com",
+    "googleadservices.com",
+    "doubleclick.net",
+    "adservice.google.com",
+    "connect.facebook.net",
+    "analytics.tiktok.com",
+    "static.ads-twitter.com",
+    "bat.bing.com",
+    "clarity.ms",
+    "hotjar.com",
+    "mc.yandex.ru",
+    "cdn.segment.com",
+    "mixpanel.com",
+    "crazyegg.com",
+    "js-agent.newrelic.com",
+    "nr-data.net",
+    "scorecardresearch.com",
+    "adnxs.com",
+    "taboola.com",
+    "outbrain.com",
+)
+
+
+class RenderProfile:
+    """
+    What a rendered page is allowed to download.
+
+    `attach(page)` routes every request of the page: Playwright resource
+    types in `block_types`, TRACKER_HOSTS and hosts in `deny` are aborted
+    unless the host is in `allow`. Returns a dict counting blocked requests.
+    """
+
+    BLOCK_TYPES = ("image", "media", "font")
+
+    def __init__(
+        self,
+        block_types=BLOCK_TYPES,
+        trackers: bool = True,
+        deny=(),
+        allow=(),
+    ):
+        self.block_types = set(block_types)
+        self.deny = (TRACKER_HOSTS if trackers else ()) + tuple(deny)
+        self.allow = tuple(allow)
+
+    @staticmethod
+    def _listed(host: str, hosts) -> bool:
+        return any(host == h or host.endswith("." + h) for h in hosts)
+
+    def blocks(self, resource_type: str, url: str) -> bool:
+        host = (urlparse(url).hostname or "").lower()
+        if self._listed(host, self.allow):
+            return False
+        return resource_type in self.block_types or self._listed(host, self.deny)
+
+    def attach(self, page) -> Dict[str, int]:
+        stats = {"blocked": 0}
+        if not (self.block_types or self.deny):
+            return stats
+
+        def handle(route):
+            request = route.request
+            if self.blocks(request.resource_type, request.url):
+                stats["blocked"] += 1
+                route.abort()
+            else:
+                route.continue_()
+
+        page.route("**/*", handle)
+        return stats
+
+
+# Bytes the page itself pulled over the network (document + subresources), as
+# Resource Timing reports them. Cross-origin responses without
+# Timing-Allow-Origin count as 0, so this is a lower bound; requests the
+# RenderProfile blocked were never sent and aren't in it at all.
+TRANSFERRED_JS = (
+    "() => performance.getEntriesByType('navigation')"
+    ".concat(performance.getEntriesByType('resource'))"
+    ".reduce((n, e) => n + (e.transferSize || 0), 0)"
+)
+
+# Polled by wait_until_ready. The MutationObserver is installed on the first
+# call and kept on window; body text is only sent back when the DOM changed.
+READINESS_JS = """
+(seen) => {
+  let q = window.__scraperQuiet;
+  if (!q) {
+    q = window.__scraperQuiet = {last: Date.now(), n: 0};
+    new MutationObserver(() => { q.last = Date.now(); q.n++; }).observe(
+      document, {subtree: true, childList: true, characterData: true});
+  }
+  return {
+    links: !!document.querySelector('a[href^="mailto:"], a[href^="tel:"]'),
+    quiet: (Date.now() - q.last) / 1000,
+    n: q.n,
+    text: q.n === seen ? null : (document.body ? document.body.innerText : ""),
+  };
+}
+"""
+
+
+def wait_until_ready(page, timeout: float, quiet: float = 1.0, poll: float = 0.25) -> str:
+    """
+    Block until a rendered page is worth reading and return why: it has a
+    mailto:/tel: link, a phone number or email in its text, or its DOM has
+    not changed for `quiet` seconds. Never waits past `timeout`.
+    """
+    deadline = time.monotonic() + timeout
+    seen = -1
+    while True:
+        state = page.evaluate(READINESS_JS, seen)
+        if state["links"]:
+            return "contact link"
+        if state["text"] is not None:
+            seen = state["n"]
+            patterns = (Patterns.PHONE_NP, Patterns.NEW_PHONE_NP, Patterns.NEW_NEW_PHONE_NP,
+                        Patterns.OTHER_PHONE_NP, Patterns.EMAIL)
+            if any(pat.search(state["text"]) for pat in patterns):
+                return "contact text"
+        if state["quiet"] >= quiet:
+            return "quiet"
+        if time.monotonic() >= deadline:
+            return "timeout"
+        page.wait_for_timeout(poll * 1000)
+
+
+class BrowserPool:
+    """
+    Long-lived headless Firefox instances shared by all worker threads.
+
+    Playwright's sync objects may only be used from the thread that created
+    them, so each of the `size` slots is a dedicated thread owning one
+    browser. `run(job)` calls `job` with a fresh, isolated BrowserContext on
+    the next free slot and blocks until it returns. A slot relaunches its
+    browser after `max_pages` jobs or once it has disconnected. Jobs should
+    spend at most `render_timeout` seconds loading and waiting on a page,
+    and attach `profile` to the pages they open.
+    """
+
+    def __init__(
+        self,
+        size: int = 2,
+        max_pages: int = 50,
+        headless: bool = True,
+        render_timeout: float = 10,
+        profile: Optional[RenderProfile] = None,
+    ):
+        self.size = size
+        self.max_pages = max_pages
+        self.render_timeout = render_timeout
+        self.profile = profile or RenderProfile()
+        self.headless = headless
+        self._jobs: "queue.Queue" = queue.Queue()
+        self._threads: List[threading.Thread] = []
+        self._lock = threading.Lock()
+
+    def run(self, job):
+        with self._lock:
+            if not self._threads:
+                for i in range(self.size):
+                    t = threading.Thread(target=self._slot, name=f"browser-{i}", daemon=True)
+                    t.start()
+                    self._threads.append(t)
+        future: Future = Future()
+        self._jobs.put((job, future))
+        return future.result()
+
+    def _slot(self):
+        try:
+            with sync_playwright() as p:
+                self._serve(p)
+        except Exception as e:
+            log_error(f"Browser slot failed: {e}")
+            # keep draining so callers get the error instead of waiting forever
+            for job, future in iter(self._jobs.get, None):
+                future.set_exception(e)
+
+    def _serve(self, p):
+        browser = None
+        served = 0
+        for job, future in iter(self._jobs.get, None):
+            try:
+                if browser is None or not browser.is_connected() or served >= self.max_pages:
+                    self._close(browser)
+                    browser = p.firefox.launch(headless=self.headless)
+                    served = 0
+                context = browser.new_context()
+                try:
+                    result = job(context)
+                finally:
+                    served += 1
+                    self._close(context)
+            except Exception as e:
+                future.set_exception(e)
+            else:
+                future.set_result(result)
+        self._close(browser)
+
+    @staticmethod
+    def _close(handle):
+        try:
+            if handle is not None:
+                handle.close()
+        except Exception:
+            pass
+
+    def close(self):
+        with self._lock:
+            threads, self._threads = self._threads, []
+        for _ in threads:
+            self._jobs.put(None)
+        for t in threads:
+            t.join(timeout=10)
+
+
+_default_browser_pool: Optional[BrowserPool] = None
+_default_browser_pool_lock = threading.Lock()
+
+
+def default_browser_pool() -> BrowserPool:
+    """Process-wide BrowserPool for callers that don't inject their own."""
+    global _default_browser_pool
+    with _default_browser_pool_lock:
+        if _default_browser_pool is None:
+            _default_browser_pool = BrowserPool()
+            atexit.register(_default_browser_pool.close)
+        return _default_browser_pool
+
+
 # ==============================
 # Core Scraper Module
 # ==============================
 class ContactScraper:
-    def __init__(self, url: str, use_headless: bool = True):
+    def __init__(
+        self,
+        url: str,
+        use_headless: bool = True,
+        browser_pool: Optional[BrowserPool] = None,
+    ):
         self.url = url.rstrip("/")
+        self.browser_pool = browser_pool or default_browser_pool()
         self.content = ""
         self.is_react = False
         self.has_sitemap = False
@@ -249,7 +496,7 @@ class ContactScraper:
         self.about_pages: List[str] = []
         # self.options = Options()
         self.allow_redirects = True
-        self.seen_links = []
+        self.seen_links: Set[str] = set()
         self.html_content = None
         self.root_domain = self._get_root_domain(self.url)
         # if use_headless:
@@ -508,43 +755,53 @@ class ContactScraper:
         # ------------------------------------------------------------------
         # Helper – run a single Playwright scrape
         # ------------------------------------------------------------------
+        def _render(context, target_url: str):
+            page = context.new_page()
+            stats = self.browser_pool.profile.attach(page)
+            # Mimic a real browser
+            page.set_extra_http_headers({
+                "User-Agent": USER_AGENTS[0],
+                "Accept": "*/*",
+            })
+            budget = self.browser_pool.render_timeout
+            deadline = time.monotonic() + budget
+            page.goto(target_url, wait_until="domcontentloaded", timeout=budget * 1000)
+            # Wait for hydration only until contact info shows up or the DOM settles
+            reason = wait_until_ready(page, timeout=max(0, deadline - time.monotonic()))
+            log_debug(
+                f"Rendered {target_url} ({reason}; the page downloaded at least"
+                f" {page.evaluate(TRANSFERRED_JS) / 1024:.0f} KB;"
+                f" {stats['blocked']} requests blocked, size unknown)"
+            )
+            hrefs = [link.get_attribute("href") or "" for link in page.query_selector_all("a")]
+            return page.content(), hrefs
+
         def _run_playwright(target_url: str) -> None:
-            with sync_playwright() as p:
-                browser = p.firefox.launch(headless=True)
-                page = browser.new_page()
-                # Mimic a real browser
-                page.set_extra_http_headers({
-                    "User-Agent": USER_AGENTS[0],
-                    "Accept": "*/*",
-                })
-                try:
-                    page.goto(target_url, wait_until="networkidle", timeout=15000)
-                    # Give JS a moment to hydrate
-                    page.wait_for_timeout(3000)
-                    html = page.content()
-                    self.extract_from_text(html)
-                    self.handle_hyperlinks(html)
-
-                    # mailto: / tel: links (same as Selenium version)
-                    for link in page.query_selector_all("a"):
-                        href = link.get_attribute("href") or ""
-                        if href.startswith("mailto:"):
-                            email = href[7:].split("?")[0]
-                            if Patterns.EMAIL.match(email):
-                                self.emails.add(email.lower())
-                        elif href.startswith("tel:"):
-                            phone = href[4:].strip()
-                            for pat in (Patterns.PHONE_NP, Patterns.NEW_PHONE_NP,
-                                        Patterns.NEW_NEW_PHONE_NP, Patterns.OTHER_PHONE_NP):
-                                if pat.search(phone):
-                                    self.phones.add(phone)
-                                    break
-                except PlaywrightTimeoutError:
-                    log_error(f"Playwright timeout on {target_url}")
-                except Exception as e:
-                    log_error(f"Playwright error on {target_url}: {e}")
-                finally:
-                    browser.close()
+            try:
+                # only the render holds a pooled browser; extraction runs here
+                html, hrefs = self.browser_pool.run(
+                    lambda context: _render(context, target_url)
+                )
+                self.extract_from_text(html)
+                self.handle_hyperlinks(html)
+
+                # mailto: / tel: links (same as Selenium version)
+                for href in hrefs:
+                    if href.startswith("mailto:"):
+                        email = href[7:].split("?")[0]
+                        if Patterns.EMAIL.match(email):
+                            self.emails.add(email.lower())
+                    elif href.startswith("tel:"):
+                        phone = href[4:].strip()
+                        for pat in (Patterns.PHONE_NP, Patterns.NEW_PHONE_NP,
+                                    Patterns.NEW_NEW_PHONE_NP, Patterns.OTHER_PHONE_NP):
+                            if pat.search(phone):
+                                self.phones.add(phone)
+                                break
+            except PlaywrightTimeoutError:
+                log_error(f"Playwright timeout on {target_url}")
+            except Exception as e:
+                log_error(f"Playwright error on {target_url}: {e}")
 
         # ------------------------------------------------------------------
         # When forced → always run Playwright (fallback for empty results)
@@ -576,7 +833,7 @@ class ContactScraper:
                         href.startswith("https") or href.startswith("http")
                     ):
                         if self._is_same_root_domain(href):
-                            self.seen_links.append(href)
+                            self.seen_links.add(href)
                             keywords = ["about", "contact"]
                             for k in keywords:
                                 if k in href.lower():
@@ -658,9 +915,16 @@ class ContactScraper:
 # Google Maps URL Extractor
 # ==============================
 class MapsScraper:
-    def __init__(self, keywords: str, limit: int = 4, inpfile=None):
+    def __init__(
+        self,
+        keywords: str,
+        limit: int = 4,
+        inpfile=None,
+        profile: Optional[RenderProfile] = None,
+    ):
         self.keywords = keywords
         self.limit = limit
+        self.profile = profile or RenderProfile()
         self.search_url = f"https://www.google.com/maps/search/{urllib.parse.quote_plus(keywords)}?hl=en"
         self.websites: Set[str] = set()
         self.inpfile = inpfile
@@ -682,10 +946,10 @@ class MapsScraper:
             page.set_extra_http_headers({
                 "User-Agent": USER_AGENTS[0],
             })
+            self.profile.attach(page)
 
             try:
-                page.goto(self.search_url, wait_until="networkidle", timeout=30_000)
-                page.wait_for_timeout(3000)  # Let UI settle
+                page.goto(self.search_url, wait_until="domcontentloaded", timeout=30_000)
 
                 # Wait for the website links to appear
                 page.wait_for_selector('a[data-value="Website"]', timeout=20_000)
@@ -725,9 +989,16 @@ class MapsScraper:
                         if len(self.websites) >= self.limit:
                             break
 
-                    # Scroll down
+                    # Scroll down, then wait for the next batch of results (3s at most)
                     page.evaluate("el => el.scrollTop += 600", scroll_container)
-                    page.wait_for_timeout(3000)
+                    try:
+                        page.wait_for_function(
+                            "n => document.querySelectorAll('a[data-value=\"Website\"]').length > n",
+                            arg=len(links),
+                            timeout=3000,
+                        )
+                    except PlaywrightTimeoutError:
+                        pass
 
                     # Get new scroll height
                     new_height = page.evaluate("el => el.scrollTop", scroll_container)
@@ -801,15 +1072,61 @@ def main():
     parser.add_argument(
         "-l", "--log", action="store_true", help="Save output to JSON file"
     )
+    parser.add_argument(
+        "--browsers",
+        type=int,
+        default=2,
+        help="Headless Firefox instances shared by all workers (default: 2)",
+    )
+    parser.add_argument(
+        "--browser-recycle",
+        type=int,
+        default=50,
+        help="Pages a browser renders before it is restarted (default: 50)",
+    )
+    parser.add_argument(
+        "--render-timeout",
+        type=float,
+        default=10,
+        help="Max seconds to load and wait for one rendered page (default: 10)",
+    )
+    parser.add_argument(
+        "--full-render",
+        action="store_true",
+        help="Let rendered pages load images, media, fonts and trackers\n"
+        "(blocked by default)",
+    )
+    parser.add_argument(
+        "--block-hosts",
+        default="",
+        help="Extra comma-separated hosts to block while rendering",
+    )
+    parser.add_argument(
+        "--allow-hosts",
+        default="",
+        help="Comma-separated hosts never blocked while rendering",
+    )
     args = parser.parse_args()
+    profile = RenderProfile(
+        block_types=() if args.full_render else RenderProfile.BLOCK_TYPES,
+        trackers=not args.full_render,
+        deny=[h.strip() for h in args.block_hosts.split(",") if h.strip()],
+        allow=[h.strip() for h in args.allow_hosts.split(",") if h.strip()],
+    )
+    browser_pool = BrowserPool(
+        size=args.browsers,
+        max_pages=args.browser_recycle,
+        render_timeout=args.render_timeout,
+        profile=profile,
+    )
     results = []
     if args.url:
-        scraper = ContactScraper(args.url)
+        scraper = ContactScraper(args.url, browser_pool=browser_pool)
         result = scraper.run()
         results.append(result)
         pprint(result)
     elif args.keywords:
-        maps = MapsScraper(args.keywords, limit=args.number)
+        maps = MapsScraper(args.keywords, limit=args.number, profile=profile)
         websites = maps.run()
         if not websites:
             log_error("No websites found.")
@@ -819,7 +1136,7 @@ def main():
 
         def subscraper(site: str):
             try:
-                scraper = ContactScraper(site)
+                scraper = ContactScraper(site, browser_pool=browser_pool)
                 result = scraper.run()
                 results.append(result)
                 pprint(result)
@@ -849,7 +1166,7 @@ def main():
             site = site.strip()
             try:
                 if site:
-                    scraper = ContactScraper(site)
+                    scraper = ContactScraper(site, browser_pool=browser_pool)
                     result = scraper.run()
                     results.append(result)
                     pprint(result)
@@ -873,6 +1190,8 @@ def main():
         filename = f"contacts_[{keyword_part}]_{timestamp}"
         save_results(results, filename)
 
+    browser_pool.close()
+
 
 if __name__ == "__main__":
     main()
@@ -12,13 +12,21 @@ import time
 from typing import Optional
 from datetime import datetime
 from pprint import pprint
-from typing import List, Set, Dict
+from typing import AsyncIterator, Callable, Iterable, Iterator, List, Set, Dict, Tuple, Union
 import urllib.parse
-from urllib.parse import urlparse
+import threading
+import atexit
+from contextlib import asynccontextmanager, contextmanager
+from pathlib import Path
+from http.cookiejar import DefaultCookiePolicy
+from dataclasses import dataclass, field
+from urllib.parse import parse_qsl, urlencode, urlparse, urlunparse
 import requests
-from concurrent.futures import ThreadPoolExecutor
+from requests.adapters import HTTPAdapter
+from concurrent.futures import Future, ProcessPoolExecutor, ThreadPoolExecutor
 from colorama import init, Fore, Style
 from bs4 import BeautifulSoup, XMLParsedAsHTMLWarning
+from bs4.element import CData, NavigableString, Tag
 from selenium import webdriver
 from selenium.webdriver.firefox.options import Options
 from selenium.webdriver.common.by import By
@@ -28,6 +36,42 @@ from selenium.common.exceptions import TimeoutException
 import urllib3
 import warnings
 import pdb
+import asyncio
+import socket
+import ipaddress
+import email.utils
+import sqlite3
+import hashlib
+import multiprocessing
+import heapq
+import bisect
+import itertools
+import codecs
+import zlib
+import xml.etree.ElementTree as ET
+from collections import deque
+from functools import cached_property
+
+try:  # optional: only needed for --engine async
+    import aiohttp
+except ImportError:
+    aiohttp = None
+try:  # optional: C Aho-Corasick for KeywordAutomaton (pure-Python fallback below)
+    import ahocorasick
+except ImportError:
+    ahocorasick = None
+try:  # optional: faster parser backends (--parser lxml / selectolax)
+    import lxml
+except ImportError:
+    lxml = None
+try:
+    from selectolax.lexbor import LexborHTMLParser
+except ImportError:
+    LexborHTMLParser = None
+try:  # optional: real record TTLs for DNSCache (fixed TTL otherwise)
+    import dns.resolver
+except ImportError:
+    dns = None
 
 warnings.filterwarnings("ignore", category=XMLParsedAsHTMLWarning)
 # disable Insecure Connection Warnings
@@ -55,8 +99,34 @@ _VALID_AREA_CODES = {
     "092", "093", "094", "095", "096", "097", "099",
 }
 
-# Build a single alternation pattern – sorted longest-first so that 010 matches before 01
-_AREA_CODE_PATTERN = "|".join(sorted(_VALID_AREA_CODES, key=len, reverse=True))
+def _trie_pattern(codes) -> str:
+    """
+    Factor digit codes into a trie-shaped regex (e.g. 0(?:1[019]?|2[1345679])).
+    At any position the text picks a single path through the trie and the
+    greedy `?` still tries the longest code first, so it matches exactly like
+    a longest-first alternation without testing ~120 literals one by one.
+    """
+    if all(len(code) == 1 for code in codes):
+        return codes[0] if len(codes) == 1 else f"[{''.join(sorted(codes))}]"
+    branches: Dict[str, List[str]] = {}
+    for code in codes:
+        branches.setdefault(code[0], []).append(code[1:])
+    parts = []
+    for head, tails in sorted(branches.items()):
+        rest = [tail for tail in tails if tail]
+        if not rest:
+            parts.append(head)
+        else:
+            sub = _trie_pattern(rest)
+            if "|" in sub:
+                sub = f"(?:{sub})"
+            optional = "?" if len(rest) < len(tails) else ""
+            parts.append(f"{head}{sub}{optional}")
+    return "|".join(parts)
+
+
+# Single pattern for every area code – longest-first, so that 010 matches before 01
+_AREA_CODE_PATTERN = _trie_pattern(sorted(_VALID_AREA_CODES))
 
 
 # ==============================
@@ -160,13 +230,69 @@ class Patterns:
     )
 
 
+class ContactMatcher:
+    """
+    One-pass phone/email candidate scanner over a block of text.
+
+    Every phone pattern only ever matches digits, separators (`-`, `.`,
+    whitespace) and `+`, so a phone can only sit inside a run of those
+    characters containing at least 5 digits. One cheap scan finds those
+    runs and the four phone patterns only validate inside them; the email
+    patterns only run when an `@` / `[at]` / `(at)` marker is present.
+    Candidates are identical to running every pattern over the whole text.
+    """
+
+    PHONE_PATTERNS = (
+        Patterns.PHONE_NP,
+        Patterns.NEW_PHONE_NP,
+        Patterns.NEW_NEW_PHONE_NP,
+        Patterns.OTHER_PHONE_NP,
+    )
+    EMAIL_PATTERNS = (Patterns.EMAIL, Patterns.EMAIL_STRICT)
+    # a run of phone characters holding >= 5 digits (the shortest NEW_PHONE_NP mobile)
+    DIGIT_RUN = re.compile(r"[+\d](?:[\s+.\-]*\d){4}[\d\s+.\-]*")
+    EMAIL_HINT = re.compile(r"@|\[at\]|\(at\)", re.IGNORECASE)
+
+    def scan(self, text: str) -> List[tuple]:
+        """Return (kind, value, (start, end)) for every phone and email candidate."""
+        found = []
+        for run in self.DIGIT_RUN.finditer(text):
+            # endpos one past the run, so \b still sees the following character
+            start, end = run.start(), min(run.end() + 1, len(text))
+            for pattern in self.PHONE_PATTERNS:
+                for match in pattern.finditer(text, start, end):
+                    found.append(("phone", match.group(), match.span()))
+        if self.EMAIL_HINT.search(text):
+            for pattern in self.EMAIL_PATTERNS:
+                for match in pattern.finditer(text):
+                    found.append(("email", match.group(), match.span()))
+        return found
+
+    def has_phone(self, text: str) -> bool:
+        for run in self.DIGIT_RUN.finditer(text):
+            start, end = run.start(), min(run.end() + 1, len(text))
+            if any(pattern.search(text, start, end) for pattern in self.PHONE_PATTERNS):
+                return True
+        return False
+
+    def has_email(self, text: str) -> bool:
+        return bool(self.EMAIL_HINT.search(text)) and any(
+            pattern.search(text) for pattern in self.EMAIL_PATTERNS
+        )
+
+
+CONTACT_MATCHER = ContactMatcher()
+
+
 REACT_INDICATORS = [
     'id="root"',
     "id='root'",
-    "[data-reactroot]",
-    "[data-reactid]",
-    "[data-react-root]",
-    "react",
+    "data-reactroot",
+    "data-reactid",
+    "data-react-root",
+    "react-dom",
+    "react.production.min.js",
+    "react.development.js",
 ]
 USER_AGENTS = [
     "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/129.0.0.0 Safari/537.36",
@@ -222,6 +348,131 @@ CONTACT_KEYWORDS = [
     "address",
     "location",
 ]
+VUE_INDICATORS = [
+    # Vue 2 fingerprints
+    "__vue__",
+    "data-v-",
+    "_v-",
+    "vue.min.js",
+    "vue.global.prod.js",
+    # Vue 3 fingerprints
+    "__vue_app__",
+    "__VUE__",
+    "@vue/runtime-core",
+    "runtime-dom",
+    # Common
+    "Vue.config",
+    "vue-devtools",
+    'id="app"',
+]
+
+
+class KeywordAutomaton:
+    """
+    Aho-Corasick automaton over several named keyword groups.
+
+    Built once at import; `find` reports which keywords of every group occur
+    in a text in a single linear pass, `contains` stops at the first hit of
+    one group. Matching is case-insensitive except for the groups listed in
+    `case_sensitive`, whose hits are re-checked against the original text.
+    Uses the C `ahocorasick` package when installed.
+    """
+
+    def __init__(self, groups: Dict[str, List[str]], case_sensitive=()):
+        self.groups = groups
+        self.case_sensitive = set(case_sensitive)
+        entries: Dict[str, List[tuple]] = {}
+        for group, keywords in groups.items():
+            for kw in keywords:
+                entries.setdefault(kw.lower(), []).append((group, kw))
+        if ahocorasick is not None:
+            self._native = ahocorasick.Automaton()
+            for key, value in entries.items():
+                self._native.add_word(key, value)
+            self._native.make_automaton()
+        else:
+            self._native = None
+            self._build(entries)
+
+    def _build(self, entries: Dict[str, List[tuple]]):
+        # trie
+        goto: List[Dict[str, int]] = [{}]
+        out: List[List[tuple]] = [[]]
+        for key, value in entries.items():
+            state = 0
+            for ch in key:
+                if ch not in goto[state]:
+                    goto.append({})
+                    out.append([])
+                    goto[state][ch] = len(goto) - 1
+                state = goto[state][ch]
+            out[state] = out[state] + value
+        # failure links, folded into a full transition table (BFS order)
+        fail = [0] * len(goto)
+        delta: List[Dict[str, int]] = [dict(goto[0])] + [None] * (len(goto) - 1)
+        queue = deque(goto[0].values())
+        while queue:
+            state = queue.popleft()
+            delta[state] = dict(delta[fail[state]])
+            for ch, nxt in goto[state].items():
+                delta[state][ch] = nxt
+                fail[nxt] = delta[fail[state]].get(ch, 0) if state else 0
+                out[nxt] = out[nxt] + out[fail[nxt]]
+                queue.append(nxt)
+        self._delta, self._out = delta, out
+
+    def _hits(self, text: str):
+        """Yield (end_index, group, keyword) for every occurrence."""
+        lowered = text.lower()
+        same_length = len(lowered) == len(text)
+        if self._native is not None:
+            matches = self._native.iter(lowered)
+        else:
+            matches = self._scan(lowered)
+        for end, found in matches:
+            for group, kw in found:
+                if group in self.case_sensitive:
+                    if same_length:
+                        if text[end - len(kw) + 1 : end + 1] != kw:
+                            continue
+                    elif kw not in text:
+                        continue
+                yield end, group, kw
+
+    def _scan(self, lowered: str):
+        delta, out = self._delta, self._out
+        state = 0
+        for i, ch in enumerate(lowered):
+            state = delta[state].get(ch, 0)
+            if out[state]:
+                yield i, out[state]
+
+    def find(self, text: str) -> Dict[str, Set[str]]:
+        found: Dict[str, Set[str]] = {group: set() for group in self.groups}
+        for _end, group, kw in self._hits(text):
+            found[group].add(kw)
+        return found
+
+    def contains(self, text: str, group: str) -> bool:
+        return any(hit_group == group for _end, hit_group, _kw in self._hits(text))
+
+    def spans(self, text: str, group: str) -> List[Tuple[int, int]]:
+        """(start, end) of every occurrence of one group's keywords, in order of end."""
+        return [
+            (end - len(kw) + 1, end + 1)
+            for end, hit_group, kw in self._hits(text)
+            if hit_group == group
+        ]
+
+
+KEYWORD_AUTOMATON = KeywordAutomaton(
+    {
+        "contact": CONTACT_KEYWORDS,
+        "react": REACT_INDICATORS,
+        "vue": VUE_INDICATORS,
+    },
+    case_sensitive=["react"],  # REACT_INDICATORS have always been exact substrings
+)
 
 
 # ==============================
@@ -272,489 +523,3108 @@ def normalize_phone(phone: str) -> Optional[str]:
 
 
 # ==============================
-# Core Scraper Module
+# HTTP Fetch Layer
 # ==============================
-class ContactScraper:
-    def __init__(self, url: str, use_headless: bool = True):
-        self.url = url.rstrip("/")
-        self.content = ""
-        self.is_react = False
-        self.has_sitemap = False
-        self.captcha_detected = False
-        self.emails: Set[str] = set()
-        self.phones: Set[str] = set()
-        self.about_pages: List[str] = []
-        self.options = Options()
-        self.allow_redirects = True
-        self.seen_links = []
-        self.html_content = None
-        self.root_domain = self._get_root_domain(self.url)
-        if use_headless:
-            self.options.add_argument("--headless")
+@dataclass
+class FetchResult:
+    """What the fetch layer hands back to the scraper (mirrors requests.Response)."""
+    url: str
+    status_code: int
+    text: str = ""
+    headers: Dict[str, str] = field(default_factory=dict)
+    from_cache: bool = False
+    truncated: bool = False  # body cut off at the fetcher's max_body
 
-    def _get_root_domain(self, url: str) -> str:
-        """Extract the root domain (e.g., example.edu.np) from URL."""
-        parsed = urlparse(url)
-        domain = parsed.netloc.lower()
-        # For .edu.np, include the college name as root
-        parts = domain.split(".")
-        if len(parts) >= 3 and parts[-2] == "edu" and parts[-1] == "np":
-            return ".".join(parts[-3:])
-        # Fallback for other domains (e.g., example.com)
-        if len(parts) >= 2:
-            return ".".join(parts[-2:])
-        return domain
 
-    def fetch_page(self) -> bool:
-        try:
-            response = requests.get(
-                self.url,
-                headers=HEADERS,
-                timeout=5,
-                allow_redirects=self.allow_redirects,
-                verify=False,
-            )
-            if response.status_code // 100 in [4, 5]:
-                headers = ALT_HEADERS
-                response = requests.get(
-                    self.url,
-                    headers=headers,
-                    timeout=5,
-                    allow_redirects=self.allow_redirects,
-                    verify=False,
-                )
-            if response.status_code != 200:
-                log_error(f"{self.url} returned {response.status_code}")
-                # return False
-            self.content = response.text
-            self.is_react = any(ind in self.content for ind in REACT_INDICATORS)
-            self.is_vue = self.is_vue_page(self.content)
-            if self.is_vue:
-                log_info("Vue.js detected → will use Selenium")
-                self.is_react = False  # Vue wins over generic React checks
-            else:
-                self.is_react = any(ind in self.content for ind in REACT_INDICATORS)
-            # self.captcha_detected = "captcha" in self.content.lower()
-            if self.captcha_detected:
-                log_error("CAPTCHA detected. Skipping content scraping.")
-                return False
-            self._check_sitemap()
-            return True
-        except requests.RequestException as e:
-            log_error(f"Failed to fetch {self.url}: {e}")
-            return False
+MAX_BODY = 5 << 20  # bytes of one page worth reading; the rest is dropped
+CHARSET_META = re.compile(rb"""<meta[^>]+charset\s*=\s*["']?\s*([\w.:-]+)""", re.IGNORECASE)
 
-    def fetch_common_paths(self):
-        for edu_path in EDU_PATHS:
-            try:
-                response = requests.get(
-                    f"{self.url}{edu_path}",
-                    allow_redirects=self.allow_redirects,
-                    verify=False,
-                    timeout=3,
-                )
-                log_info(f"Checking {self.url}{edu_path}")
-                if response.status_code != 200:
-                    log_error(f"{self.url} returned {response.status_code}")
-                    continue
-                self.extract_from_text(response.text)
-                self.handle_hyperlinks(response.text)
-            except requests.RequestException:
-                log_error(f"Failed to fetch {self.url}: e")
 
-    def _check_sitemap(self):
-        sitemap_urls = [f"{self.url}/sitemap.xml", f"{self.url}/sitemap"]
+def is_page_type(content_type: str) -> bool:
+    """Whether a Content-Type can hold a page worth extracting (HTML/XML/text)."""
+    media = content_type.split(";", 1)[0].strip().lower()
+    return not media or media.startswith("text/") or "html" in media or "xml" in media
+
+
+def sniff_charset(content_type: str, head: bytes) -> str:
+    """Encoding of a body: BOM, then the Content-Type charset, then <meta>, then UTF-8."""
+    for bom, name in ((codecs.BOM_UTF8, "utf-8-sig"), (codecs.BOM_UTF16_LE, "utf-16"), (codecs.BOM_UTF16_BE, "utf-16")):
+        if head.startswith(bom):
+            return name
+    candidates = [
+        param.split("=", 1)[1].strip("\"' ")
+        for param in content_type.split(";")[1:]
+        if param.strip().lower().startswith("charset=")
+    ]
+    if match := CHARSET_META.search(head):
+        candidates.append(match.group(1).decode("ascii", "ignore"))
+    for name in candidates:
         try:
-            for sm_url in sitemap_urls:
-                res = requests.get(
-                    sm_url,
-                    headers=HEADERS,
-                    timeout=5,
-                    allow_redirects=self.allow_redirects,
-                    verify=False,
-                )
-                if res.status_code // 100 in [4, 5]:
-                    res = requests.get(
-                        self.url,
-                        headers=ALT_HEADERS,
-                        timeout=5,
-                        allow_redirects=self.allow_redirects,
-                        verify=False,
-                    )
-                if res.status_code // 100 == 2:
-                    self.has_sitemap = True
-                    ###
-                    for url in set(Patterns.ABOUT_PAGE.findall(res.text)):
-                        if self._is_same_root_domain(url):
-                            pprint(url)
-                            self.about_pages.append(url)
-                    self.about_pages = list(set(self.about_pages))
-                    # self.about_pages = list(set(Patterns.ABOUT_PAGE.findall(res.text)))
-                    log_debug(
-                        f"Found {len(self.about_pages)} about/contact pages in sitemap"
-                    )
-        except requests.RequestException:
-            pass
+            return codecs.lookup(name).name
+        except LookupError:
+            continue
+    return "utf-8"
 
-    def _is_same_root_domain(self, url: str) -> bool:
-        """Check if the given URL has the same root domain as self.url."""
-        if not url.startswith(("http://", "https://")):
-            # Relative URL: assume same domain
-            return True
-        target_root = self._get_root_domain(url)
-        return target_root == self.root_domain
 
-    def extract_from_html(self, html: str):
-        parser = BeautifulSoup(html, "html.parser")
-        for email in Patterns.EMAIL.findall(html):
-            self.emails.add(email.lower())
-        # Phones
-        # for match in Patterns.PHONE_NP.finditer(html):
-        #     if norm := normalize_phone(match.group()):
-        #         self.phones.add(norm)
+class BodyReader:
+    """
+    Decodes a response body as its chunks arrive, keeping at most
+    `max_bytes` of it. The charset is sniffed from the first 2 KB, so no
+    chunk is held twice; once the cap is hit feed() returns False and the
+    page is marked truncated.
+    """
 
-    def extract_from_contact_sections(self, html: str) -> set:
-        soup = BeautifulSoup(html, "html.parser")
-        phones = set()
-        # 1. Find <div>, <section>, <p> with contact keywords
-        for tag in soup.find_all(["div", "section", "p", "li", "span", "footer", "a"]):
-            text = tag.get_text().lower()
-            if any(kw in text for kw in CONTACT_KEYWORDS):
-                # Extract phones ONLY from this tag
-                for match in Patterns.PHONE_NP.finditer(tag.get_text()):
-                    norm = normalize_phone(match.group())
-                    if norm:
-                        self.phones.add(norm)
-
-                for match in Patterns.NEW_PHONE_NP.finditer(tag.get_text()):
-                    norm = normalize_phone(match.group())
-                    if norm:
-                        self.phones.add(norm)
-
-                for match in Patterns.NEW_NEW_PHONE_NP.finditer(tag.get_text()):
-                    norm = normalize_phone(match.group())
-                    if norm:
-                        self.phones.add(norm)
-
-                for match in Patterns.OTHER_PHONE_NP.finditer(tag.get_text()):
-                    norm = normalize_phone(match.group())
-                    if norm:
-                        self.phones.add(norm)
-
-                for match in Patterns.EMAIL.finditer(tag.get_text()):
-                    norm = match.group()
-                    self.emails.add(norm)
-
-                for match in Patterns.EMAIL_STRICT.finditer(tag.get_text()):
-                    norm = match.group()
-                    self.emails.add(norm)
+    SNIFF_BYTES = 2048
 
-        # 2. Bonus: Footer is gold
-        footer = soup.find("footer")
-        if footer:
-            for match in Patterns.PHONE_NP.finditer(footer.get_text()):
-                norm = normalize_phone(match.group())
-                if norm:
-                    self.phones.add(norm)
-            for match in Patterns.NEW_PHONE_NP.finditer(footer.get_text()):
-                norm = normalize_phone(match.group())
-                if norm:
-                    self.phones.add(norm)
-            for match in Patterns.NEW_NEW_PHONE_NP.finditer(footer.get_text()):
-                norm = normalize_phone(match.group())
-                if norm:
-                    self.phones.add(norm)
-            for match in Patterns.OTHER_PHONE_NP.finditer(footer.get_text()):
-                norm = normalize_phone(match.group())
-                if norm:
-                    self.phones.add(norm)
-            for match in Patterns.EMAIL.finditer(footer.get_text()):
-                norm = match.group()
-                self.emails.add(norm)
-            for match in Patterns.EMAIL_STRICT.finditer(footer.get_text()):
-                norm = match.group()
-                self.emails.add(norm)
+    def __init__(self, content_type: str = "", max_bytes: int = MAX_BODY):
+        self.content_type = content_type
+        self.max_bytes = max_bytes
+        self.size = 0
+        self.truncated = False
+        self._head = b""
+        self._decoder = None
+        self._parts: List[str] = []
 
-        if DEBUGGER == True:
-            print(self.emails)
-            print(self.phones)
-            pdb.set_trace()
+    def feed(self, chunk: bytes) -> bool:
+        room = self.max_bytes - self.size
+        if len(chunk) > room:
+            chunk, self.truncated = chunk[:room], True
+        self.size += len(chunk)
+        if self._decoder is None:
+            self._head += chunk
+            if len(self._head) >= self.SNIFF_BYTES or self.truncated:
+                self._start()
+        else:
+            self._parts.append(self._decoder.decode(chunk))
+        return not self.truncated
 
-        return phones
+    def _start(self):
+        encoding = sniff_charset(self.content_type, self._head)
+        self._decoder = codecs.getincrementaldecoder(encoding)(errors="replace")
+        self._parts.append(self._decoder.decode(self._head))
+        self._head = b""
 
-    def extract_from_text(self, text: str):
-        # Emails
-        for email in Patterns.EMAIL.findall(text):
-            self.emails.add(email.lower())
-        # Extract mailto: links
-        soup = BeautifulSoup(text, "html.parser")
-        # 1. Find <div>, <section>, <p> with contact keywords
-        links = soup("a")
-        if links is not None:
-            for link in links:
-                if "href" in list(link.attrs.keys()):
-                    href = str(link["href"])
-                    if href.startswith("mailto:"):
-                        email = href[7:].split("?")[0]
-                        if Patterns.EMAIL.match(email):
-                            self.emails.add(email.lower())
-                    elif href.startswith("tel:"):
-                        phone = href[4:]
-                        if bool(Patterns.PHONE_NP.search(phone.strip())):
-                            self.phones.add(phone)
-                        elif bool(Patterns.NEW_PHONE_NP.search(phone.strip())):
-                            self.phones.add(phone)
-                        elif bool(Patterns.NEW_NEW_PHONE_NP.search(phone.strip())):
-                            self.phones.add(phone)
-                        elif bool(Patterns.OTHER_PHONE_NP.search(phone.strip())):
-                            self.phones.add(phone)
+    def text(self) -> str:
+        if self._decoder is None:
+            self._start()
+        self._parts.append(self._decoder.decode(b"", final=True))
+        return "".join(self._parts)
 
-        # Phones
-        # for match in Patterns.PHONE_NP.finditer(text):
-        # if norm := normalize_phone(match.group()):
-        # self.phones.add(norm)
-        smart_phones = self.extract_from_contact_sections(text)
-        self.phones.update(smart_phones)
 
-    def scrape_static(self):
-        if not self.content:
-            return
-        self.extract_from_text(self.content)
-        self.handle_hyperlinks(self.content)
-        if self.has_sitemap:
-            for page in self.about_pages:  # limit to avoid spam
-                try:
-                    res = requests.get(
-                        page,
-                        headers=HEADERS,
-                        timeout=5,
-                        allow_redirects=self.allow_redirects,
-                        verify=False,
-                    )
-                    if res.status_code == 200:
-                        self.extract_from_text(res.text)
-                        # self.phones.update(self.extract_from_contact_sections(res.text))
-                except:
-                    continue
+class ResponseCache:
+    """
+    Persistent on-disk HTTP response cache (one SQLite file) keyed by URL.
 
-    def scrape_dynamic(self, url, forced=False):
-        if forced:
-            driver = None
-            try:
-                driver = webdriver.Firefox(options=self.options)
-                driver.get(url)
-                time.sleep(5)
-                # body_text = driver.find_element(By.TAG_NAME, "body").text
-                html_content = driver.page_source
-                self.extract_from_text(html_content)
-                self.handle_hyperlinks(html_content)
-                # Extract mailto: links
-                links = driver.find_elements(By.TAG_NAME, "a")
-                for link in links:
-                    href = link.get_attribute("href") or ""
-                    if href.startswith("mailto:"):
-                        email = href[7:].split("?")[0]
-                        if Patterns.EMAIL.match(email):
-                            self.emails.add(email.lower())
-            except Exception as e:
-                log_error(f"Selenium failed for {url}: {e}")
-            finally:
-                if driver:
-                    driver.quit()
-        if not (self.is_vue or self.is_react):
-            return
-        driver = None
-        try:
-            driver = webdriver.Firefox(options=self.options)
-            driver.get(url)
-            time.sleep(5)
-            # body_text = driver.find_element(By.TAG_NAME, "body").text
-            html_content = driver.page_source
-            self.extract_from_text(html_content)
-            self.handle_hyperlinks(html_content)
-            # Extract mailto: links
-            links = driver.find_elements(By.TAG_NAME, "a")
-            for link in links:
-                href = link.get_attribute("href") or ""
-                if href.startswith("mailto:"):
-                    email = href[7:].split("?")[0]
-                    if Patterns.EMAIL.match(email):
-                        self.emails.add(email.lower())
-        except Exception as e:
-            log_error(f"Selenium failed for {url}: {e}")
-        finally:
-            if driver:
-                driver.quit()
+    Stores body, status and the ETag/Last-Modified validators of every 200
+    response. Entries younger than `ttl` seconds are served without touching
+    the network; older ones are revalidated with If-None-Match /
+    If-Modified-Since, and a 304 refreshes them in place. The total body size
+    is kept under `max_bytes` by evicting the least recently used entries.
+    Safe to share between worker threads.
+    """
 
-    def handle_hyperlinks(self, html: str):
-        """
-        Hyperlinks like "Contact Us", "About Us" etc. may exist,
-        despite the site not having sitemap.xml
-        """
-        parser = BeautifulSoup(html, "html.parser")
-        links = parser("a")
-        if links is not None:
-            for link in links:
-                if "href" in list(link.attrs.keys()):
-                    href = str(link["href"])
-                    if href not in self.seen_links and (
-                        href.startswith("https") or href.startswith("http")
-                    ):
-                        if self._is_same_root_domain(href):
-                            self.seen_links.append(href)
-                            keywords = ["about", "contact"]
-                            for k in keywords:
-                                if k in href.lower():
-                                    log_debug(f"Found {k} Hyperlink at {href}")
-                                    res = requests.get(
-                                        f"{href}",
-                                        allow_redirects=self.allow_redirects,
-                                        verify=False,
-                                        timeout=5,
-                                    )
-                                    if res.status_code == 200:
-                                        self.extract_from_text(res.text)
-                                    else:
-                                        log_error(f"{href} returned {res.status_code}")
+    def __init__(self, path, ttl: float = 7 * 24 * 3600, max_bytes: int = 2 << 30):
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self.lock = threading.Lock()
+        self.db = sqlite3.connect(str(path), check_same_thread=False)
+        self.db.execute("PRAGMA journal_mode=WAL")
+        self.db.execute(
+            """
+            CREATE TABLE IF NOT EXISTS responses (
+                url TEXT PRIMARY KEY,
+                final_url TEXT,
+                status INTEGER,
+                headers TEXT,
+                body TEXT,
+                etag TEXT,
+                last_modified TEXT,
+                stored_at REAL,
+                accessed_at REAL,
+                size INTEGER
+            )
+            """
+        )
+        self.db.execute(
+            "CREATE INDEX IF NOT EXISTS responses_lru ON responses (accessed_at)"
+        )
+        self.total_bytes = self.db.execute(
+            "SELECT COALESCE(SUM(size), 0) FROM responses"
+        ).fetchone()[0]
 
-    def is_vue_page(self, html: str) -> bool:
-        """Return True if Vue 2 or Vue 3 is detected"""
-        checks = [
-            # Vue 2 fingerprints
-            r"__vue__",
-            r"data-v-",
-            r"_v-",
-            r"vue\.min\.js",
-            r"vue\.global\.prod\.js",
-            # Vue 3 fingerprints
-            r"__vue_app__",
-            r"__VUE__",
-            r"@vue/runtime-core",
-            r"runtime-dom",
-            # Common
-            r"Vue\.config",
-            r"vue-devtools",
-            r'id="app"',
-        ]
-        return any(re.search(pattern, html, re.IGNORECASE) for pattern in checks)
+    def lookup(self, url: str) -> Optional[Dict]:
+        """Cached entry for `url` (with a `fresh` flag), or None."""
+        with self.lock:
+            row = self.db.execute(
+                "SELECT final_url, status, headers, body, etag, last_modified, stored_at "
+                "FROM responses WHERE url = ?",
+                (url,),
+            ).fetchone()
+            if row is None:
+                return None
+            now = time.time()
+            self.db.execute("UPDATE responses SET accessed_at = ? WHERE url = ?", (now, url))
+            self.db.commit()
+        final_url, status, headers, body, etag, last_modified, stored_at = row
+        return {
+            "result": FetchResult(
+                url=final_url,
+                status_code=status,
+                text=body,
+                headers=json.loads(headers),
+                from_cache=True,
+            ),
+            "etag": etag,
+            "last_modified": last_modified,
+            "fresh": now - stored_at < self.ttl,
+        }
 
-    def clean_emails(self):
-        gibberish = ["example", "yoursite", ".png", ".svg", ".jpg", ".jpeg", ".gif"]
-        for email in self.emails.copy():
-            for g in gibberish:
-                if g in email:
-                    self.emails.remove(email)
+    def conditional_headers(self, entry: Dict) -> Dict[str, str]:
+        headers = {}
+        if entry["etag"]:
+            headers["If-None-Match"] = entry["etag"]
+        if entry["last_modified"]:
+            headers["If-Modified-Since"] = entry["last_modified"]
+        return headers
 
-    def debug_phone_regex(self):
-        for phone in self.phones:
-            print(phone)
-            # print(f"NEW_NEW_PHONE regex:\t\t{bool(Patterns.NEW_NEW_PHONE_NP.search(phone))}")
-            # print(f"NEW_PHONE regex:\t\t{bool(Patterns.NEW_PHONE_NP.search(phone))}")
-            # print(f"PHONE regex:\t\t{bool(Patterns.PHONE_NP.search(phone))}")
-            print(
-                f"OTHER_PHONE regex:\t\t{bool(Patterns.OTHER_PHONE_NP.search(phone))}"
+    def refresh(self, url: str):
+        """A 304 came back: the stored copy is good for another `ttl`."""
+        with self.lock:
+            now = time.time()
+            self.db.execute(
+                "UPDATE responses SET stored_at = ?, accessed_at = ? WHERE url = ?",
+                (now, now, url),
             )
+            self.db.commit()
 
-    def run(self) -> Dict:
-        log_info(f"Scraping: {self.url}")
-        if not self.fetch_page():
-            return {"website": self.url, "emails": [], "numbers": []}
-        self.scrape_static()
-        if self.is_react or self.is_vue:
-            self.scrape_dynamic(self.url)
-        self.fetch_common_paths()
-        if len(self.phones) == 0 or len(self.emails) == 0:
-            log_info(
-                "Static Scraping didn't return proper results\n\tTrying Dynamic Fetching"
+    def store(self, url: str, result: FetchResult):
+        if result.status_code != 200:
+            return
+        headers = {k.lower(): v for k, v in result.headers.items()}
+        size = len(result.text.encode("utf-8", "replace"))
+        if size > self.max_bytes:
+            return
+        with self.lock:
+            now = time.time()
+            old = self.db.execute("SELECT size FROM responses WHERE url = ?", (url,)).fetchone()
+            self.db.execute(
+                "INSERT OR REPLACE INTO responses VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (
+                    url,
+                    result.url,
+                    result.status_code,
+                    json.dumps(result.headers),
+                    result.text,
+                    headers.get("etag"),
+                    headers.get("last-modified"),
+                    now,
+                    now,
+                    size,
+                ),
             )
-            self.scrape_dynamic(self.url, forced=True)
+            self.total_bytes += size - (old[0] if old else 0)
+            if self.total_bytes > self.max_bytes:
+                self._evict()
+            self.db.commit()
 
-        self.clean_emails()
-        self.debug_phone_regex()
+    def _evict(self):
+        # drop least recently used entries until we're back under 90% of the budget
+        target = self.max_bytes * 0.9
+        for url, size in self.db.execute(
+            "SELECT url, size FROM responses ORDER BY accessed_at"
+        ).fetchall():
+            if self.total_bytes <= target:
+                break
+            self.db.execute("DELETE FROM responses WHERE url = ?", (url,))
+            self.total_bytes -= size
 
-        return {
-            "website": self.url,
-            "emails": sorted(self.emails) or "Not found",
-            "numbers": sorted(self.phones) or "Not found",
-        }
+    def close(self):
+        with self.lock:
+            self.db.close()
 
 
-# ==============================
-# Google Maps URL Extractor
-# ==============================
-class MapsScraper:
-    def __init__(self, keywords: str, limit: int = 4, inpfile=None):
-        self.keywords = keywords
-        self.limit = limit
-        self.search_url = f"https://www.google.com/maps/search/{urllib.parse.quote_plus(keywords)}?hl=en"
-        self.websites: Set[str] = set()
-        self.inpfile = inpfile
-        if self.inpfile:
-            try:
-                with open(self.inpfile, "r") as f:
-                    urls = f.readlines()
-                    self.limit = len(urls)
-                    self.websites.update(urls)
-            except FileNotFoundError:
-                log_error(f"{self.inpfile} not found")
+class NegativeCacheHit(requests.ConnectionError):
+    """Raised instead of connecting to a host the negative cache marks as dead."""
 
-    def run(self) -> List[str]:
-        driver = None
-        try:
-            options = Options()
-            options.add_argument("--headless")
-            driver = webdriver.Firefox(options=options)
-            driver.get(self.search_url)
-            driver.maximize_window()
-            WebDriverWait(driver, 20).until(
-                EC.presence_of_element_located((By.XPATH, "//a[@data-value='Website']"))
-            )
-            feed = driver.find_element(By.XPATH, '//div[@role="feed"]')
-            last_height = driver.execute_script("return arguments[0].scrollTop", feed)
-            while len(self.websites) < self.limit:
-                elements = driver.find_elements(By.XPATH, "//a[@data-value='Website']")
-                for el in elements:
-                    url = el.get_attribute("href")
-                    if url and url.startswith("http"):
-                        self.websites.add(url)
-                    if len(self.websites) >= self.limit:
-                        break
-                # Scroll
-                driver.execute_script("arguments[0].scrollTop += 600", feed)
-                time.sleep(3)
-                new_height = driver.execute_script(
-                    "return arguments[0].scrollTop", feed
-                )
-                if new_height == last_height:
-                    log_info("No more results. End of scroll.")
-                    break
-                last_height = new_height
-            log_info(f"Collected {len(self.websites)} websites from Maps.")
-            return list(self.websites)[: self.limit]
-        except TimeoutException:
-            log_error("Website links not found in Google Maps.")
-            return []
-        except Exception as e:
-            log_error(f"Maps scraping failed: {e}")
-            return []
-        finally:
-            if driver:
-                driver.quit()
 
+def _failure_kind(exc: BaseException) -> Optional[str]:
+    """Classify a fetch error as a host-level 'dns' / 'timeout' / 'connect' failure."""
+    chain = []
+    while exc is not None and len(chain) < 10:
+        chain.append(exc)
+        exc = exc.__cause__ or exc.__context__
+    names = {type(e).__name__ for e in chain}
+    if any(isinstance(e, socket.gaierror) for e in chain) or names & {
+        "NameResolutionError",
+        "ClientConnectorDNSError",
+    }:
+        return "dns"
+    if isinstance(chain[0], requests.ConnectTimeout) or "ConnectionTimeoutError" in names:
+        return "timeout"
+    if any(isinstance(e, ConnectionRefusedError) for e in chain) or names & {
+        "NewConnectionError",
+        "ClientConnectorError",
+    }:
+        return "connect"
+    return None  # read timeouts, resets mid-body, ... say nothing about the host
 
-# ==============================
-# CLI & Main Runner
-# ==============================
 
+class NegativeCache:
+    """
+    Persistent record of fetches that are known to fail (one SQLite file).
 
-# import os
-# import re
-# import json
-# import csv
-from pathlib import Path
-from datetime import datetime
-from concurrent.futures import ThreadPoolExecutor, as_completed
-from typing import List, Dict
+    Two kinds of entries, each with its own expiry:
+      * (host, path) misses – a 404/410 answer for a probe URL (never for a
+        homepage: fetches with probe=False skip these)
+      * dead hosts – DNS failure, connect timeout or refused connection
+    Every repeated failure doubles the entry's lifetime (exponential backoff,
+    capped at `max_ttl`); a later success deletes it. While an entry is live
+    the Fetcher answers from it without touching the network.
+    """
+
+    MISS_STATUSES = (404, 410)
+    BASE_TTL = {
+        "status": 24 * 3600,
+        "dns": 6 * 3600,
+        "timeout": 3600,
+        "connect": 3600,
+    }
+
+    def __init__(self, path, max_ttl: float = 30 * 24 * 3600):
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+        self.max_ttl = max_ttl
+        self.lock = threading.Lock()
+        self.db = sqlite3.connect(str(path), check_same_thread=False)
+        self.db.execute("PRAGMA journal_mode=WAL")
+        self.db.execute(
+            """
+            CREATE TABLE IF NOT EXISTS failures (
+                key TEXT PRIMARY KEY,
+                kind TEXT,
+                status INTEGER,
+                failures INTEGER,
+                retry_at REAL
+            )
+            """
+        )
+
+    @staticmethod
+    def _keys(url: str):
+        parsed = urlparse(url)
+        host = parsed.netloc.lower()
+        return host, f"{parsed.scheme}://{host}{parsed.path or '/'}" + (
+            f"?{parsed.query}" if parsed.query else ""
+        )
+
+    def lookup(self, url: str, probe: bool = True) -> Optional[FetchResult]:
+        """
+        Cached miss for `url`; raises NegativeCacheHit if its host is dead.
+        With probe=False only the dead-host entry is consulted.
+        """
+        host, key = self._keys(url)
+        if not probe:
+            key = host
+        now = time.time()
+        with self.lock:
+            rows = self.db.execute(
+                "SELECT key, kind, status FROM failures WHERE key IN (?, ?) AND retry_at > ?",
+                (host, key, now),
+            ).fetchall()
+        for row_key, kind, _status in rows:
+            if row_key == host:
+                raise NegativeCacheHit(f"{host} skipped: recent {kind} failure")
+        if rows:
+            return FetchResult(url=url, status_code=rows[0][2], from_cache=True)
+        return None
+
+    def _record(self, key: str, kind: str, status: Optional[int]):
+        with self.lock:
+            row = self.db.execute(
+                "SELECT failures FROM failures WHERE key = ?", (key,)
+            ).fetchone()
+            failures = (row[0] if row else 0) + 1
+            ttl = min(self.BASE_TTL[kind] * 2 ** (failures - 1), self.max_ttl)
+            self.db.execute(
+                "INSERT OR REPLACE INTO failures VALUES (?, ?, ?, ?, ?)",
+                (key, kind, status, failures, time.time() + ttl),
+            )
+            self.db.commit()
+
+    def _clear(self, *keys: str):
+        with self.lock:
+            self.db.execute(
+                f"DELETE FROM failures WHERE key IN ({', '.join('?' * len(keys))})", keys
+            )
+            self.db.commit()
+
+    def record_response(self, url: str, status: int, probe: bool = True):
+        host, key = self._keys(url)
+        if status in self.MISS_STATUSES:
+            if probe:
+                self._record(key, "status", status)
+        elif status // 100 == 2:
+            self._clear(host, key)
+        else:
+            self._clear(host)
+
+    def record_error(self, url: str, exc: BaseException):
+        kind = _failure_kind(exc)
+        if kind:
+            self._record(self._keys(url)[0], kind, None)
+
+    def close(self):
+        with self.lock:
+            self.db.close()
+
+
+def is_overload(status: int) -> bool:
+    """Statuses that mean the server (not the page) is struggling."""
+    return status >= 500 or status == 429
+
+
+STREAM_CHUNK = 64 * 1024  # body bytes handed to a stream consumer at a time
+
+
+class TokenBucket:
+    """
+    Rate limiter in virtual-time form (GCRA): `rate` requests per second with
+    bursts of up to `burst`. Reservations are booked ahead, so each caller
+    gets its own delay instead of everyone waking at once.
+    """
+
+    def __init__(self, rate: float, burst: int):
+        self.interval = 1.0 / rate
+        self.burst = burst
+        self.tat = 0.0  # theoretical arrival time of the next request
+        self.paused_until = 0.0
+
+    def reserve(self, now: float) -> float:
+        tolerance = (self.burst - 1) * self.interval
+        send_at = max(now, self.tat - tolerance, self.paused_until)
+        self.tat = max(self.tat, send_at) + self.interval
+        return send_at - now
+
+
+NXDOMAIN_ERRNOS = {socket.EAI_NONAME, getattr(socket, "EAI_NODATA", socket.EAI_NONAME)}
+
+
+class DNSCache:
+    """
+    In-process DNS cache shared by every connection of a job.
+
+    Addresses are kept for their record TTL when dnspython is installed,
+    `ttl` seconds otherwise; a host that doesn't exist is remembered for
+    `negative_ttl`, so every later probe of a dead domain fails at once
+    instead of asking the resolver again. prefetch() resolves a job's hosts
+    up front with bounded concurrency. install() routes urllib3 (and so
+    requests/Fetcher) through the cache; AsyncFetcher uses aiohttp_resolver().
+    """
+
+    def __init__(self, ttl: float = 300.0, negative_ttl: float = 3600.0, min_ttl: float = 30.0):
+        self.ttl, self.negative_ttl, self.min_ttl = ttl, negative_ttl, min_ttl
+        self.lock = threading.Lock()
+        # host -> (expires at, addresses); None addresses = NXDOMAIN
+        self._entries: Dict[str, Tuple[float, Optional[List[str]]]] = {}
+
+    @staticmethod
+    def _key(host: str) -> str:
+        return host.lower().rstrip(".")
+
+    def peek(self, host: str) -> Optional[List[str]]:
+        """Cached addresses without resolving: None if unknown or expired."""
+        with self.lock:
+            entry = self._entries.get(self._key(host))
+        if entry is None or entry[0] < time.monotonic():
+            return None
+        if entry[1] is None:
+            raise socket.gaierror(socket.EAI_NONAME, f"{host}: no such host (cached)")
+        return entry[1]
+
+    def lookup(self, host: str) -> List[str]:
+        """Addresses for host (IPv4 first); socket.gaierror if it doesn't exist."""
+        try:
+            ipaddress.ip_address(host.strip("[]"))
+            return [host.strip("[]")]
+        except ValueError:
+            pass
+        cached = self.peek(host)
+        if cached is not None:
+            return cached
+        try:
+            ips, ttl = self._query(self._key(host))
+        except socket.gaierror as e:
+            if e.errno in NXDOMAIN_ERRNOS:
+                self._store(host, self.negative_ttl, None)
+            raise  # temporary failures aren't cached
+        self._store(host, max(self.min_ttl, ttl), ips)
+        return ips
+
+    def _store(self, host: str, ttl: float, ips: Optional[List[str]]):
+        with self.lock:
+            self._entries[self._key(host)] = (time.monotonic() + ttl, ips)
+
+    def _query(self, host: str) -> Tuple[List[str], float]:
+        if dns is not None:
+            ips, ttls, error = [], [], None
+            for rdtype in ("A", "AAAA"):
+                try:
+                    answer = dns.resolver.resolve(host, rdtype)
+                except (dns.resolver.NXDOMAIN, dns.resolver.NoAnswer):
+                    continue
+                except dns.exception.DNSException as e:
+                    error = e  # e.g. the AAAA query timed out; the A records still count
+                    continue
+                ips += [record.address for record in answer]
+                ttls.append(answer.rrset.ttl)
+            if ips:
+                return ips, min(ttls)
+            if error is not None:
+                raise socket.gaierror(socket.EAI_AGAIN, f"{host}: {error}") from error
+            # not in DNS; /etc/hosts (localhost, intranet names) may still know it
+        infos = socket.getaddrinfo(host, None, proto=socket.IPPROTO_TCP)
+        ips = list(dict.fromkeys(info[4][0] for info in infos))
+        return sorted(ips, key=lambda ip: ":" in ip), self.ttl
+
+    def is_dead(self, host: str) -> bool:
+        try:
+            self.peek(host)
+        except socket.gaierror:
+            return True
+        return False
+
+    def exists(self, host: str) -> bool:
+        """Resolve one host in the calling thread; False only if it doesn't exist."""
+        try:
+            self.lookup(host)
+        except (OSError, UnicodeError):
+            pass
+        return not self.is_dead(host)
+
+    def prefetch(self, hosts: List[str], workers: int = 32) -> Set[str]:
+        """Resolve hosts in parallel, `workers` at a time; returns those that don't exist."""
+        hosts = sorted({self._key(host) for host in hosts if host})
+        with ThreadPoolExecutor(max_workers=max(1, workers), thread_name_prefix="dns") as pool:
+            futures = [pool.submit(self.lookup, host) for host in hosts]
+            for future in futures:
+                try:
+                    future.result()
+                except (OSError, UnicodeError):
+                    pass
+        return {host for host in hosts if self.is_dead(host)}
+
+    def install(self):
+        """Send urllib3's (requests') new connections through this cache."""
+        global _active_dns
+        _active_dns = self
+        urllib3.util.connection.create_connection = _create_connection
+
+    def uninstall(self):
+        global _active_dns
+        if _active_dns is self:
+            _active_dns = None
+
+    def aiohttp_resolver(self) -> "aiohttp.abc.AbstractResolver":
+        return CachedResolver(self)
+
+
+_system_create_connection = urllib3.util.connection.create_connection
+_active_dns: Optional[DNSCache] = None
+
+
+def _create_connection(address, *args, **kwargs):
+    """urllib3's create_connection, with the host looked up in _active_dns."""
+    host, port = address
+    if _active_dns is None:
+        return _system_create_connection(address, *args, **kwargs)
+    error: Optional[OSError] = None
+    for ip in _active_dns.lookup(host):
+        try:
+            return _system_create_connection((ip, port), *args, **kwargs)
+        except OSError as e:
+            error = e
+    raise error
+
+
+if aiohttp is not None:
+
+    class CachedResolver(aiohttp.abc.AbstractResolver):
+        """aiohttp resolver answering from a DNSCache (resolving in a thread on a miss)."""
+
+        def __init__(self, cache: DNSCache):
+            self.cache = cache
+
+        async def resolve(self, host, port=0, family=socket.AF_INET):
+            ips = self.cache.peek(host)
+            if ips is None:
+                ips = await asyncio.to_thread(self.cache.lookup, host)
+            results = []
+            for ip in ips:
+                ip_family = socket.AF_INET6 if ":" in ip else socket.AF_INET
+                if family in (0, ip_family):
+                    results.append(
+                        {
+                            "hostname": host,
+                            "host": ip,
+                            "port": port,
+                            "family": ip_family,
+                            "proto": 0,
+                            "flags": socket.AI_NUMERICHOST,
+                        }
+                    )
+            if not results:
+                raise OSError(f"{host}: no address for family {family}")
+            return results
+
+        async def close(self):
+            pass
+
+
+class HostScheduler:
+    """
+    Politeness layer between the scrapers and the network.
+
+    Each host, and each IP address hosts resolve to, has a TokenBucket
+    (`host_rate` / `ip_rate` requests per second), so many Maps results on
+    one shared server still count against that server. `reserve(url)` books
+    the next slot and returns the seconds to wait before sending; it never
+    sleeps itself, so threads time.sleep() and coroutines asyncio.sleep().
+    A 429 (or a 503 with Retry-After) pauses the host for the advertised
+    time and halves its rate, down to 1/MAX_SLOWDOWN of `host_rate`; once
+    the pause is over, each healthy answer doubles it back until the
+    configured rate is reached.
+    """
+
+    RETRY_STATUSES = (429, 503)
+    DEFAULT_RETRY_AFTER = 5.0
+    MAX_RETRY_AFTER = 300.0
+    MAX_SLOWDOWN = 16
+
+    def __init__(
+        self,
+        host_rate: float = 5.0,
+        host_burst: int = 10,
+        ip_rate: float = 20.0,
+        ip_burst: int = 40,
+        max_retry_wait: float = 30.0,
+        dns_cache: Optional[DNSCache] = None,
+    ):
+        self.dns_cache = dns_cache
+        self.host_rate, self.host_burst = host_rate, host_burst
+        self.ip_rate, self.ip_burst = ip_rate, ip_burst
+        self.max_retry_wait = max_retry_wait
+        self.lock = threading.Lock()
+        self._hosts: Dict[str, TokenBucket] = {}
+        self._ips: Dict[str, TokenBucket] = {}
+        self._resolved: Dict[str, Optional[str]] = {}
+
+    @staticmethod
+    def _host(url: str) -> str:
+        return (urlparse(url).hostname or "").lower()
+
+    def resolved(self, url: str) -> bool:
+        return self._host(url) in self._resolved
+
+    def ip_for(self, url: str) -> Optional[str]:
+        """IP the URL's host resolves to (looked up once, may block)."""
+        host = self._host(url)
+        if host not in self._resolved:
+            try:
+                if self.dns_cache:
+                    ip = self.dns_cache.lookup(host)[0]
+                else:
+                    ip = socket.getaddrinfo(host, None, proto=socket.IPPROTO_TCP)[0][4][0]
+            except (OSError, UnicodeError):
+                ip = None  # the request itself will report the failure
+            self._resolved[host] = ip
+        return self._resolved[host]
+
+    def reserve(self, url: str) -> float:
+        host = self._host(url)
+        ip = self.ip_for(url)
+        now = time.monotonic()
+        with self.lock:
+            if host not in self._hosts:
+                self._hosts[host] = TokenBucket(self.host_rate, self.host_burst)
+            delay = self._hosts[host].reserve(now)
+            if ip:
+                if ip not in self._ips:
+                    self._ips[ip] = TokenBucket(self.ip_rate, self.ip_burst)
+                delay = max(delay, self._ips[ip].reserve(now))
+        return delay
+
+    def throttle(self, url: str, status: int, retry_after: Optional[str]) -> Optional[float]:
+        """
+        Back off a host that answered 429/503; returns the pause in seconds.
+        Any other answer returns None, and lets a slowed host speed back up.
+        """
+        if status not in self.RETRY_STATUSES or (status == 503 and not retry_after):
+            if not is_overload(status):
+                self._recover(self._host(url))
+            return None
+        seconds = self.DEFAULT_RETRY_AFTER
+        if retry_after:
+            try:
+                seconds = float(retry_after)
+            except ValueError:
+                try:
+                    when = email.utils.parsedate_to_datetime(retry_after)
+                    seconds = when.timestamp() - time.time()
+                except (TypeError, ValueError):
+                    pass
+        seconds = min(max(seconds, 0.0), self.MAX_RETRY_AFTER)
+        host = self._host(url)
+        with self.lock:
+            bucket = self._hosts.setdefault(host, TokenBucket(self.host_rate, self.host_burst))
+            now = time.monotonic()
+            # the rest of a burst of 429s (requests already in flight) is one signal
+            if bucket.paused_until <= now:
+                slowest = self.MAX_SLOWDOWN / self.host_rate
+                bucket.interval = min(bucket.interval * 2, slowest)
+            bucket.paused_until = max(bucket.paused_until, now + seconds)
+        log_info(f"{host} answered {status}; pausing it for {seconds:.0f}s")
+        return seconds
+
+    def _recover(self, host: str):
+        base = 1.0 / self.host_rate
+        with self.lock:
+            bucket = self._hosts.get(host)
+            if bucket and bucket.interval > base and bucket.paused_until <= time.monotonic():
+                bucket.interval = max(bucket.interval / 2, base)
+
+
+class AIMDController:
+    """
+    Limit on requests in flight that adapts to the link it runs on.
+
+    Finished requests are judged in windows of `window`. A window whose
+    error ratio (transport errors, timeouts, 5xx, 429) tops
+    `max_error_ratio`, or whose median latency exceeds `latency_factor`
+    times the best median seen so far, multiplies the limit by `decrease`;
+    any other window adds `step` (additive increase). The limit stays
+    within [min_limit, max_limit].
+    """
+
+    def __init__(
+        self,
+        initial: int = 16,
+        min_limit: int = 4,
+        max_limit: int = 512,
+        window: int = 20,
+        step: float = 4,
+        decrease: float = 0.7,
+        max_error_ratio: float = 0.1,
+        latency_factor: float = 2.0,
+    ):
+        self.min_limit, self.max_limit = min_limit, max_limit
+        self._limit = float(min(max(initial, min_limit), max_limit))
+        self.window, self.step, self.decrease = window, step, decrease
+        self.max_error_ratio, self.latency_factor = max_error_ratio, latency_factor
+        self.base_latency: Optional[float] = None
+        self.lock = threading.Lock()
+        self._latencies: List[float] = []
+        self._errors = 0
+
+    @property
+    def limit(self) -> int:
+        return int(self._limit)
+
+    def record(self, latency: float, failed: bool):
+        with self.lock:
+            if failed:
+                self._errors += 1
+            else:
+                self._latencies.append(latency)
+            if self._errors + len(self._latencies) >= self.window:
+                self._adjust()
+
+    def _adjust(self):
+        errors, latencies = self._errors, sorted(self._latencies)
+        self._errors, self._latencies = 0, []
+        median = latencies[len(latencies) // 2] if latencies else None
+        if median is not None:
+            if self.base_latency is None or median < self.base_latency:
+                self.base_latency = median
+            else:
+                self.base_latency *= 1.02  # let a slower link become the new normal
+        congested = errors / self.window > self.max_error_ratio or (
+            median is not None and median > self.latency_factor * self.base_latency
+        )
+        if congested:
+            self._limit = max(self.min_limit, self._limit * self.decrease)
+        else:
+            self._limit = min(self.max_limit, self._limit + self.step)
+
+
+class Fetcher:
+    """
+    Shared HTTP session for every ContactScraper in a job.
+
+    A single requests.Session with a pooled HTTPAdapter keeps one
+    connection pool per host, so the homepage, sitemap, EDU_PATHS and
+    about/contact probes of a site reuse the same TCP+TLS connection.
+    urllib3 pools are thread-safe; cookies are disabled because the jar
+    is not (and plain requests.get never kept them between calls anyway).
+
+    With a ResponseCache attached, fresh entries are answered from disk and
+    stale ones are revalidated conditionally before downloading again. With
+    a NegativeCache attached, known 404 probes and dead hosts short-circuit.
+
+    `submit` fans independent sub-requests of a site out to a shared thread
+    pool; every request, fanned out or not, holds one of `per_host` slots
+    for its host so a single origin never sees more than that at once.
+    With a HostScheduler attached, requests also wait for their host's and
+    IP's rate limit, and one 429/503 answer with a short Retry-After is
+    retried after the pause. With an AIMDController attached, requests in
+    flight across the whole job are capped at its current limit.
+
+    Bodies are streamed: a non-page Content-Type (PDF, ZIP, images) is
+    refused from the headers alone, and no more than `max_body` bytes of a
+    page are read (see BodyReader). With a DNSCache attached, host lookups
+    go through it.
+    """
+
+    def __init__(
+        self,
+        pool_connections: int = 100,
+        pool_maxsize: int = 10,
+        cache: Optional[ResponseCache] = None,
+        negative: Optional[NegativeCache] = None,
+        per_host: int = 4,
+        fanout_workers: int = 64,
+        scheduler: Optional[HostScheduler] = None,
+        controller: Optional[AIMDController] = None,
+        max_body: int = MAX_BODY,
+        dns_cache: Optional[DNSCache] = None,
+    ):
+        self.cache = cache
+        self.negative = negative
+        self.scheduler = scheduler
+        self.controller = controller
+        self.max_body = max_body
+        self.dns_cache = dns_cache
+        if dns_cache:
+            dns_cache.install()
+        self._inflight = 0
+        self._gate = threading.Condition()
+        self.per_host = per_host
+        self._host_slots: Dict[str, threading.BoundedSemaphore] = {}
+        self._host_slots_lock = threading.Lock()
+        self.fanout = ThreadPoolExecutor(
+            max_workers=fanout_workers, thread_name_prefix="fanout"
+        )
+        self.session = requests.Session()
+        self.session.verify = False
+        self.session.cookies.set_policy(DefaultCookiePolicy(allowed_domains=[]))
+        adapter = HTTPAdapter(
+            pool_connections=pool_connections,  # number of per-host pools kept alive
+            pool_maxsize=pool_maxsize,          # keep-alive connections per host
+        )
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+
+    def get(
+        self,
+        url: str,
+        headers: Optional[Dict[str, str]] = None,
+        timeout: float = 5,
+        allow_redirects: bool = True,
+        probe: bool = True,
+    ) -> FetchResult:
+        """
+        GET url through the caches. probe=False (the homepage and its retry)
+        keeps 404/410s out of the negative cache, which is meant for guessed
+        paths: a homepage may 404 for one User-Agent and load for another.
+        """
+        if self.negative and (miss := self.negative.lookup(url, probe)):
+            return miss
+        entry = self.cache.lookup(url) if self.cache else None
+        if entry and entry["fresh"]:
+            return entry["result"]
+        if entry:
+            headers = {**(headers or {}), **self.cache.conditional_headers(entry)}
+        try:
+            response = self._send(url, headers, timeout, allow_redirects, stream=True)
+            with response:
+                if self.negative:
+                    self.negative.record_response(url, response.status_code, probe)
+                if entry and response.status_code == 304:
+                    self.cache.refresh(url)
+                    return entry["result"]
+                reader = self._body_reader(url, response.headers.get("Content-Type", ""))
+                if reader:
+                    for chunk in response.iter_content(STREAM_CHUNK):
+                        if not reader.feed(chunk):
+                            break
+        except requests.RequestException as e:
+            if self.negative:
+                self.negative.record_error(url, e)
+            raise
+        result = FetchResult(
+            url=response.url,
+            status_code=response.status_code,
+            text=reader.text() if reader else "",
+            headers=dict(response.headers),
+            truncated=bool(reader and reader.truncated),
+        )
+        if result.truncated:
+            log_debug(f"{url}: body cut off at {self.max_body // 1024} KB")
+        if self.cache and not result.truncated:
+            self.cache.store(url, result)
+        return result
+
+    def _body_reader(self, url: str, content_type: str) -> Optional[BodyReader]:
+        """A reader for the body, or None when its type isn't worth downloading."""
+        if not is_page_type(content_type):
+            log_debug(f"Skipping {url}: {content_type}")
+            return None
+        return BodyReader(content_type, self.max_body)
+
+    def resolve(self, url: str, timeout: float = 5) -> str:
+        """Final URL after following url's redirects (HEAD, no body)."""
+        if self.negative and (miss := self.negative.lookup(url)):
+            return miss.url
+        try:
+            response = self._send(url, HEADERS, timeout, True, method="HEAD")
+        except requests.RequestException as e:
+            if self.negative:
+                self.negative.record_error(url, e)
+            raise
+        response.close()
+        return response.url
+
+    def stream(
+        self,
+        url: str,
+        feed: Callable[[bytes], bool],
+        headers: Optional[Dict[str, str]] = None,
+        timeout: float = 5,
+    ) -> int:
+        """
+        GET url and hand a 200 body to feed(chunk) as it arrives, until feed
+        returns False. For large bodies (sitemaps) that shouldn't be held in
+        memory or the response cache. Returns the status code.
+        """
+        if self.negative and (miss := self.negative.lookup(url)):
+            return miss.status_code
+        try:
+            response = self._send(url, headers, timeout, True, stream=True)
+        except requests.RequestException as e:
+            if self.negative:
+                self.negative.record_error(url, e)
+            raise
+        with response:
+            if self.negative:
+                self.negative.record_response(url, response.status_code)
+            if response.status_code == 200:
+                for chunk in response.iter_content(STREAM_CHUNK):
+                    if not feed(chunk):
+                        break
+        return response.status_code
+
+    def _send(
+        self, url, headers, timeout, allow_redirects, method="GET", stream=False
+    ) -> requests.Response:
+        """
+        Send one request (retried once after a short 429/503 pause). The
+        host slot is held until the response is closed, so a streamed body
+        still counts against --per-host while it downloads.
+        """
+        for attempt in range(2):
+            if self.scheduler:
+                time.sleep(self.scheduler.reserve(url))
+            slot = self._host_slot(url)
+            slot.acquire()
+            try:
+                with self._admitted():
+                    started = time.monotonic()
+                    try:
+                        response = self.session.request(
+                            method,
+                            url,
+                            headers=headers,
+                            timeout=timeout,
+                            allow_redirects=allow_redirects,
+                            stream=stream,
+                        )
+                    except requests.RequestException:
+                        self._observe(started, failed=True)
+                        raise
+                    self._observe(started, failed=is_overload(response.status_code))
+            except BaseException:
+                slot.release()
+                raise
+            if stream:
+                self._release_on_close(response, slot)
+            else:
+                slot.release()
+            if not self.scheduler or attempt:
+                break
+            pause = self.scheduler.throttle(
+                url, response.status_code, response.headers.get("Retry-After")
+            )
+            if pause is None or pause > self.scheduler.max_retry_wait:
+                break
+            response.close()  # retried once the pause is over
+        return response
+
+    @staticmethod
+    def _release_on_close(
+        response: requests.Response, slot: threading.BoundedSemaphore
+    ) -> None:
+        """Release `slot` (once) when the streamed response is closed."""
+        close = response.close
+        released = False
+
+        def close_and_release():
+            nonlocal released
+            try:
+                close()
+            finally:
+                if not released:
+                    released = True
+                    slot.release()
+
+        response.close = close_and_release
+
+    @contextmanager
+    def _admitted(self):
+        """Hold one of the controller's in-flight slots (no-op without one)."""
+        if not self.controller:
+            yield
+            return
+        with self._gate:
+            while self._inflight >= self.controller.limit:
+                self._gate.wait()
+            self._inflight += 1
+        try:
+            yield
+        finally:
+            with self._gate:
+                self._inflight -= 1
+                self._gate.notify_all()
+
+    def _observe(self, started: float, failed: bool):
+        if self.controller:
+            self.controller.record(time.monotonic() - started, failed)
+
+    def _host_slot(self, url: str) -> threading.BoundedSemaphore:
+        host = urlparse(url).netloc.lower()
+        with self._host_slots_lock:
+            if host not in self._host_slots:
+                self._host_slots[host] = threading.BoundedSemaphore(self.per_host)
+            return self._host_slots[host]
+
+    def submit(self, url: str, **kwargs) -> Future:
+        """Run get(url, **kwargs) on the shared fan-out pool."""
+        return self.fanout.submit(self.get, url, **kwargs)
+
+    def submit_resolve(self, url: str, **kwargs) -> Future:
+        return self.fanout.submit(self.resolve, url, **kwargs)
+
+    def close(self):
+        self.fanout.shutdown(wait=False, cancel_futures=True)
+        self.session.close()
+        if self.dns_cache:
+            self.dns_cache.uninstall()
+        if self.cache:
+            self.cache.close()
+        if self.negative:
+            self.negative.close()
+
+
+_default_fetcher: Optional[Fetcher] = None
+_default_fetcher_lock = threading.Lock()
+
+
+def default_fetcher() -> Fetcher:
+    """Process-wide Fetcher for callers that don't inject their own."""
+    global _default_fetcher
+    with _default_fetcher_lock:
+        if _default_fetcher is None:
+            _default_fetcher = Fetcher()
+        return _default_fetcher
+
+
+# ==============================
+# Render Decision
+# ==============================
+# Empty mount point a client-side app renders into
+SPA_ROOT = re.compile(
+    r"<div[^>]*\bid=[\"'](?:root|app|__next|__nuxt)[\"'][^>]*>\s*</div>", re.IGNORECASE
+)
+JS_REQUIRED = re.compile(
+    r"<noscript[^>]*>[^<]*(?:enable|requires?|need)[^<]*javascript", re.IGNORECASE
+)
+INLINE_SCRIPT = re.compile(r"<script\b[^>]*>(.*?)</script>", re.IGNORECASE | re.DOTALL)
+
+
+@dataclass
+class RenderDecision:
+    render: bool
+    score: float
+    reasons: List[str]
+
+
+class RenderHistory:
+    """
+    Per-host count of browser renders and of those that found contacts
+    static scraping had missed (one SQLite file, or in memory).
+    """
+
+    def __init__(self, path=":memory:"):
+        if path != ":memory:":
+            Path(path).parent.mkdir(parents=True, exist_ok=True)
+        self.lock = threading.Lock()
+        self.db = sqlite3.connect(str(path), check_same_thread=False)
+        self.db.execute(
+            """
+            CREATE TABLE IF NOT EXISTS renders (
+                host TEXT PRIMARY KEY,
+                renders INTEGER,
+                gains INTEGER,
+                updated REAL
+            )
+            """
+        )
+
+    def outcomes(self, host: str) -> tuple:
+        """(renders, renders that gained contacts) for host."""
+        with self.lock:
+            row = self.db.execute(
+                "SELECT renders, gains FROM renders WHERE host = ?", (host.lower(),)
+            ).fetchone()
+        return row or (0, 0)
+
+    def record(self, host: str, gained: bool):
+        with self.lock:
+            self.db.execute(
+                """
+                INSERT INTO renders (host, renders, gains, updated) VALUES (?, 1, ?, ?)
+                ON CONFLICT(host) DO UPDATE SET
+                    renders = renders + 1,
+                    gains = gains + excluded.gains,
+                    updated = excluded.updated
+                """,
+                (host.lower(), int(gained), time.time()),
+            )
+            self.db.commit()
+
+    def close(self):
+        with self.lock:
+            self.db.close()
+
+
+def score_render(
+    page: "ParsedPage", missing_both: bool, history: tuple, threshold: float
+) -> RenderDecision:
+    """
+    Estimate whether rendering a page in a browser would surface contacts
+    the static HTML lacks. Signals: little visible text, an empty SPA mount
+    point, a <noscript> asking for JavaScript, inline script outweighing
+    text, and how earlier renders of the same host went.
+    """
+    score, reasons = 0.0, []
+    text_chars = sum(len(value.strip()) for kind, value in page.iter_tree() if kind == "text")
+    if text_chars < 200:
+        score += 0.5
+        reasons.append(f"near-empty body text ({text_chars} chars)")
+    elif text_chars < 800:
+        score += 0.2
+        reasons.append(f"thin body text ({text_chars} chars)")
+    if SPA_ROOT.search(page.html):
+        score += 0.3
+        reasons.append("empty SPA mount point")
+    if JS_REQUIRED.search(page.html):
+        score += 0.3
+        reasons.append("noscript asks for JavaScript")
+    script_chars = sum(len(m.group(1)) for m in INLINE_SCRIPT.finditer(page.html))
+    if script_chars >= 5 * max(text_chars, 1):
+        score += 0.2
+        reasons.append(f"script-heavy ({script_chars} script / {text_chars} text chars)")
+    if missing_both:
+        score += 0.1
+        reasons.append("no phones or emails yet")
+    renders, gains = history
+    if renders:
+        score += 0.8 * gains / renders - 0.3
+        reasons.append(f"{gains}/{renders} past renders of this host found contacts")
+    if not reasons:
+        reasons.append("static page with readable text")
+    return RenderDecision(score >= threshold, score, reasons)
+
+
+# ==============================
+# Browser Pool
+# ==============================
+# Analytics / ad / session-replay hosts; nothing on them carries contact info
+TRACKER_HOSTS = (
+    "google-analytics.com",
+    "googletagmanager.com",
+    "googlesyndication.com",
+    "googleadservices.com",
+    "doubleclick.net",
+    "adservice.google.com",
+    "connect.facebook.net",
+    "analytics.tiktok.com",
+    "static.ads-twitter.com",
+    "bat.bing.com",
+    "clarity.ms",
+    "hotjar.com",
+    "mc.yandex.ru",
+    "cdn.segment.com",
+    "mixpanel.com",
+    "crazyegg.com",
+    "js-agent.newrelic.com",
+    "nr-data.net",
+    "scorecardresearch.com",
+    "adnxs.com",
+    "taboola.com",
+    "outbrain.com",
+)
+
+
+class RenderProfile:
+    """
+    What a rendered page is allowed to download.
+
+    Images, media and fonts never carry contact details, and neither do
+    TRACKER_HOSTS or hosts in `deny`; hosts in `allow` win over both lists.
+    Firefox has no request interception over WebDriver, so the profile is
+    applied as prefs: content-type prefs for the resource types and a PAC
+    script that routes denied hosts to a dead proxy.
+    """
+
+    BLOCK_TYPES = ("image", "media", "font")
+
+    def __init__(
+        self,
+        block_types=BLOCK_TYPES,
+        trackers: bool = True,
+        deny=(),
+        allow=(),
+    ):
+        self.block_types = set(block_types)
+        self.deny = (TRACKER_HOSTS if trackers else ()) + tuple(deny)
+        self.allow = tuple(allow)
+
+    @staticmethod
+    def _listed(host: str, hosts) -> bool:
+        return any(host == h or host.endswith("." + h) for h in hosts)
+
+    def blocks_host(self, host: str) -> bool:
+        host = host.lower()
+        return self._listed(host, self.deny) and not self._listed(host, self.allow)
+
+    def pac_script(self) -> str:
+        return (
+            "function FindProxyForURL(url, host) {"
+            f" var deny = {json.dumps(self.deny)}, allow = {json.dumps(self.allow)};"
+            " function listed(hosts) { for (var i = 0; i < hosts.length; i++)"
+            " if (host == hosts[i] || dnsDomainIs(host, '.' + hosts[i])) return true;"
+            " return false; }"
+            " return listed(deny) && !listed(allow) ? 'PROXY 127.0.0.1:9' : 'DIRECT'; }"
+        )
+
+    def firefox_prefs(self) -> Dict[str, object]:
+        prefs: Dict[str, object] = {}
+        if "image" in self.block_types:
+            prefs["permissions.default.image"] = 2
+        if "font" in self.block_types:
+            prefs["gfx.downloadable_fonts.enabled"] = False
+        if "media" in self.block_types:
+            prefs["media.autoplay.default"] = 5
+            prefs["media.preload.default"] = 0
+            prefs["media.preload.auto"] = 0
+        if self.deny:
+            prefs["network.proxy.type"] = 2
+            prefs["network.proxy.autoconfig_url"] = (
+                "data:application/x-ns-proxy-autoconfig,"
+                + urllib.parse.quote(self.pac_script())
+            )
+        return prefs
+
+    def apply(self, options: Options) -> Options:
+        for name, value in self.firefox_prefs().items():
+            options.set_preference(name, value)
+        return options
+
+
+# Bytes the page itself pulled over the network (document + subresources), as
+# Resource Timing reports them. Cross-origin responses without
+# Timing-Allow-Origin count as 0, so this is a lower bound; requests the
+# RenderProfile blocked were never sent and aren't in it at all.
+TRANSFERRED_JS = (
+    "return performance.getEntriesByType('navigation')"
+    ".concat(performance.getEntriesByType('resource'))"
+    ".reduce((n, e) => n + (e.transferSize || 0), 0);"
+)
+
+# Polled by wait_until_ready. The MutationObserver is installed on the first
+# call and kept on window; body text is only sent back when the DOM changed.
+READINESS_JS = """
+(seen) => {
+  let q = window.__scraperQuiet;
+  if (!q) {
+    q = window.__scraperQuiet = {last: Date.now(), n: 0};
+    new MutationObserver(() => { q.last = Date.now(); q.n++; }).observe(
+      document, {subtree: true, childList: true, characterData: true});
+  }
+  return {
+    links: !!document.querySelector('a[href^="mailto:"], a[href^="tel:"]'),
+    quiet: (Date.now() - q.last) / 1000,
+    n: q.n,
+    text: q.n === seen ? null : (document.body ? document.body.innerText : ""),
+  };
+}
+"""
+
+HREFS_JS = "return Array.from(document.getElementsByTagName('a'), a => a.href || '');"
+
+
+def wait_until_ready(evaluate, timeout: float, quiet: float = 1.0, poll: float = 0.25) -> str:
+    """
+    Block until a rendered page is worth reading and return why.
+
+    `evaluate(js, arg)` runs READINESS_JS in the page. The page is ready as
+    soon as it has a mailto:/tel: link, a phone number or email in its text,
+    or its DOM has not changed for `quiet` seconds; never waits past `timeout`.
+    """
+    deadline = time.monotonic() + timeout
+    seen = -1
+    while True:
+        state = evaluate(READINESS_JS, seen)
+        if state["links"]:
+            return "contact link"
+        if state["text"] is not None:
+            seen = state["n"]
+            text = state["text"]
+            if CONTACT_MATCHER.has_phone(text) or CONTACT_MATCHER.has_email(text):
+                return "contact text"
+        if state["quiet"] >= quiet:
+            return "quiet"
+        if time.monotonic() >= deadline:
+            return "timeout"
+        time.sleep(poll)
+
+
+class BrowserPool:
+    """
+    Bounded set of long-lived headless Firefox drivers shared by all workers.
+
+    `session()` checks a driver out (launching one only while fewer than
+    `size` exist, otherwise waiting for one to come back) and gives the job
+    a tab in its own WebDriver BiDi user context, i.e. its own cookie jar
+    and storage. On return the user context is removed, which drops the
+    cookies, local/session storage and cache of every origin the job
+    visited. An idle driver that no longer answers is replaced at checkout;
+    one that fails on return or has served `max_pages` jobs is quit, and the
+    next checkout launches a fresh one.
+
+    `render(url)` is the usual entry point: load, wait until ready (at most
+    `render_timeout` seconds in all) and read the DOM. Browsers are launched
+    with `profile` (a default RenderProfile when none is given).
+
+    Fallback renders are only requested when score_render reaches
+    `threshold`; `history` keeps how past renders of each host went.
+    """
+
+    def __init__(
+        self,
+        size: int = 2,
+        max_pages: int = 50,
+        headless: bool = True,
+        render_timeout: float = 10,
+        profile: Optional[RenderProfile] = None,
+        threshold: float = 0.5,
+        history: Optional[RenderHistory] = None,
+    ):
+        self.size = size
+        self.max_pages = max_pages
+        self.render_timeout = render_timeout
+        self.threshold = threshold
+        self.history = history or RenderHistory()
+        self.profile = profile or RenderProfile()
+        self.options = self.profile.apply(Options())
+        self.options.enable_bidi = True  # for per-job user contexts
+        if headless:
+            self.options.add_argument("--headless")
+        self._slots = threading.BoundedSemaphore(size)
+        self._idle: List[webdriver.Firefox] = []
+        self._served: Dict[int, int] = {}
+        self._lock = threading.Lock()
+        self._closed = False
+
+    def _checkout(self) -> webdriver.Firefox:
+        self._slots.acquire()
+        try:
+            while True:
+                with self._lock:
+                    driver = self._idle.pop() if self._idle else None
+                if driver is None:
+                    break
+                if self._alive(driver):
+                    return driver
+                log_debug("Pooled browser stopped answering; replacing it")
+                with self._lock:
+                    self._served.pop(id(driver), None)
+                self._quit(driver)
+            driver = webdriver.Firefox(options=self.options)
+        except Exception:
+            self._slots.release()
+            raise
+        with self._lock:
+            self._served[id(driver)] = 0
+        return driver
+
+    @staticmethod
+    def _alive(driver: webdriver.Firefox) -> bool:
+        """Whether the driver (and its geckodriver) still answers a command."""
+        try:
+            driver.current_window_handle
+            return True
+        except Exception:
+            return False
+
+    def _checkin(self, driver: webdriver.Firefox, healthy: bool):
+        with self._lock:
+            served = self._served.get(id(driver), 0) + 1
+            keep = healthy and not self._closed and served < self.max_pages
+            if keep:
+                self._served[id(driver)] = served
+                self._idle.append(driver)
+            else:
+                self._served.pop(id(driver), None)
+        if not keep:
+            self._quit(driver)
+        self._slots.release()
+
+    @staticmethod
+    def _quit(driver: webdriver.Firefox):
+        try:
+            driver.quit()
+        except Exception:
+            pass
+
+    @contextmanager
+    def session(self):
+        """Yield a pooled driver switched to a fresh, isolated tab for one job."""
+        driver = self._checkout()
+        healthy = False
+        home = user_context = None
+        try:
+            home = driver.current_window_handle
+            user_context = driver.browser.create_user_context()
+            driver.switch_to.window(
+                driver.browsing_context.create(type="tab", user_context=user_context)
+            )
+            yield driver
+        finally:
+            try:
+                if user_context is not None:
+                    # closes the job's tab and discards all of its storage
+                    driver.browser.remove_user_context(user_context)
+                driver.switch_to.window(home)
+                healthy = True
+            except Exception:
+                pass
+            self._checkin(driver, healthy)
+
+    def render(self, url: str) -> tuple:
+        """Return (page_source, hrefs) of url once it is ready to read."""
+        with self.session() as driver:
+            deadline = time.monotonic() + self.render_timeout
+            driver.set_page_load_timeout(self.render_timeout)
+            try:
+                driver.get(url)
+            except TimeoutException:
+                # read whatever has loaded; slow subresources don't matter
+                driver.execute_script("window.stop();")
+            reason = wait_until_ready(
+                lambda js, arg: driver.execute_script(f"return ({js})(arguments[0]);", arg),
+                timeout=max(0, deadline - time.monotonic()),
+            )
+            transferred = driver.execute_script(TRANSFERRED_JS)
+            log_debug(
+                f"Rendered {url} ({reason}; the page downloaded"
+                f" at least {transferred / 1024:.0f} KB)"
+            )
+            return driver.page_source, driver.execute_script(HREFS_JS)
+
+    def close(self):
+        with self._lock:
+            self._closed = True
+            idle, self._idle = self._idle, []
+        for driver in idle:
+            self._quit(driver)
+        self.history.close()
+
+
+_default_browser_pools: Dict[bool, BrowserPool] = {}
+
+
+def default_browser_pool(headless: bool = True) -> BrowserPool:
+    """Process-wide BrowserPool for callers that don't inject their own."""
+    with _default_fetcher_lock:
+        if headless not in _default_browser_pools:
+            pool = BrowserPool(headless=headless)
+            atexit.register(pool.close)
+            _default_browser_pools[headless] = pool
+        return _default_browser_pools[headless]
+
+
+# ==============================
+# Parsed Document Model
+# ==============================
+class ParsedPage:
+    """
+    One response body, parsed once and shared by every extraction pass.
+
+    The BeautifulSoup tree and the views the extractors need (contact-region
+    texts, anchor hrefs, footer text) are built lazily on first use and
+    cached, so extract_from_text, extract_from_contact_sections and
+    handle_hyperlinks no longer re-parse the same HTML.
+
+    Those views are the whole interface the extractors use; subclasses
+    provide them from other parser backends (see PARSER_BACKENDS) by
+    implementing hrefs, footer_text and iter_tree.
+    """
+
+    CONTACT_TAGS = ["div", "section", "p", "li", "span", "footer", "a"]
+    features = "html.parser"
+
+    def __init__(self, html: str):
+        self.html = html
+
+    @cached_property
+    def soup(self) -> BeautifulSoup:
+        return BeautifulSoup(self.html, self.features)
+
+    @cached_property
+    def hrefs(self) -> List[str]:
+        return [str(link["href"]) for link in self.soup("a") if "href" in link.attrs]
+
+    @cached_property
+    def links(self) -> List[Tuple[str, str]]:
+        """(href, anchor text) for every <a href>, for ranking crawl links."""
+        return [
+            (str(link["href"]), link.get_text(" ", strip=True))
+            for link in self.soup("a")
+            if "href" in link.attrs
+        ]
+
+    @cached_property
+    def contact_texts(self) -> List[str]:
+        return contact_region_texts(self.iter_tree(), self.CONTACT_TAGS)
+
+    def iter_tree(self):
+        """Yield ("start", tag) / ("text", string) / ("end", tag) in document order."""
+        stack = [iter(self.soup.contents)]
+        while stack:
+            node = next(stack[-1], None)
+            if node is None:
+                stack.pop()
+                if len(stack) > 0:
+                    yield ("end", None)
+            elif isinstance(node, Tag):
+                yield ("start", node.name)
+                stack.append(iter(node.contents))
+            elif type(node) in (NavigableString, CData):  # what get_text() keeps
+                yield ("text", str(node))
+
+    @cached_property
+    def footer_text(self) -> Optional[str]:
+        footer = self.soup.find("footer")
+        return footer.get_text() if footer else None
+
+
+class LxmlPage(ParsedPage):
+    """BeautifulSoup on top of the C lxml tree builder."""
+
+    features = "lxml"
+
+
+class SelectolaxPage(ParsedPage):
+    """Lexbor (selectolax) backend: C parser and C-side CSS selection."""
+
+    @cached_property
+    def tree(self) -> "LexborHTMLParser":
+        return LexborHTMLParser(self.html)
+
+    @cached_property
+    def hrefs(self) -> List[str]:
+        return [node.attributes.get("href") or "" for node in self.tree.css("a[href]")]
+
+    @cached_property
+    def links(self) -> List[Tuple[str, str]]:
+        return [
+            (node.attributes.get("href") or "", node.text(separator=" ", strip=True))
+            for node in self.tree.css("a[href]")
+        ]
+
+    def iter_tree(self):
+        stack = [self.tree.root.iter(include_text=True)] if self.tree.root else []
+        while stack:
+            node = next(stack[-1], None)
+            if node is None:
+                stack.pop()
+                if len(stack) > 0:
+                    yield ("end", None)
+            elif node.is_text_node:
+                yield ("text", node.text_content or "")
+            elif node.is_element_node and node.tag not in ("script", "style", "template"):
+                yield ("start", node.tag)
+                stack.append(node.iter(include_text=True))
+
+    @cached_property
+    def footer_text(self) -> Optional[str]:
+        footer = self.tree.css_first("footer")
+        return footer.text() if footer else None
+
+
+# Tags that don't break a line of text; anything else (p, td, br, ...) does
+INLINE_TAGS = {
+    "a", "abbr", "b", "bdi", "bdo", "cite", "code", "data", "dfn", "em", "font",
+    "i", "kbd", "mark", "q", "s", "samp", "small", "span", "strong", "sub", "sup",
+    "time", "u", "var",
+}
+# Longest phone number written as one run of digits: 977 + a 10-digit mobile
+MAX_PHONE_DIGITS = 13
+
+
+def contact_region_texts(events, tags) -> List[str]:
+    """
+    Text of every keyword-bearing contact tag, for the phone/email scan.
+
+    A tag (one of `tags`) counts as keyword-bearing when its text, the
+    concatenation of the text nodes in its subtree, mentions a
+    CONTACT_KEYWORD. One walk over the tree records the span of text nodes
+    each tag covers; one automaton pass over the whole document's text finds
+    the keywords, so a keyword split across inline tags still counts.
+
+    Each outermost span is returned as a single string. Its text nodes are
+    joined with a space wherever two letters or digits would otherwise run
+    together ("<td>9841234567</td><td>9851012345</td>", "<p>9841234567</p>
+    <span>Email</span>"), except between digits split only by inline tags
+    ("<b>98</b>41234567") that still fit in one phone number.
+    """
+    tags = set(tags)
+    nodes: List[str] = []
+    breaks = set()  # i: a non-inline tag starts or ends right before node i
+    spans = []
+    stack = []  # per open element: (is_contact_tag, first_node, is_inline)
+    for kind, value in events:
+        if kind == "start":
+            inline = value in INLINE_TAGS
+            if not inline:
+                breaks.add(len(nodes))
+            stack.append((value in tags, len(nodes), inline))
+        elif kind == "text":
+            nodes.append(value)
+        else:
+            is_tag, first, inline = stack.pop()
+            if not inline:
+                breaks.add(len(nodes))
+            if is_tag and first < len(nodes):
+                spans.append((first, len(nodes)))
+    if not spans:
+        return []
+
+    offsets = [0]  # offsets[i]: where node i starts in the joined, lowercased text
+    for node in nodes:
+        offsets.append(offsets[-1] + len(node.lower()))
+    # keyword hits ordered by end; best_start[k] = latest start among hits[:k + 1]
+    hits = KEYWORD_AUTOMATON.spans("".join(nodes), "contact")
+    hit_ends = [end for _start, end in hits]
+    best_start = list(itertools.accumulate((start for start, _end in hits), max))
+
+    def has_keyword(first: int, last: int) -> bool:
+        k = bisect.bisect_right(hit_ends, offsets[last])
+        return k > 0 and best_start[k - 1] >= offsets[first]
+
+    # elements nest, so spans are nested or disjoint: keep the outermost ones
+    texts, covered_to = [], 0
+    for first, last in sorted(spans, key=lambda span: (span[0], -span[1])):
+        if last <= covered_to or not has_keyword(first, last):
+            continue
+        covered_to = last
+        texts.append(_join_text_nodes(nodes, breaks, first, last))
+    return list(dict.fromkeys(texts))
+
+
+def _join_text_nodes(nodes: List[str], breaks, first: int, last: int) -> str:
+    parts, prev, run = [], "", 0  # run: length of the digit run the text ends with
+    for i in range(first, last):
+        node = nodes[i]
+        if not node:
+            continue
+        lead = len(node) - len(node.lstrip("0123456789"))
+        if prev.isalnum() and node[0].isalnum():
+            if not (run and lead) or i in breaks or run + lead > MAX_PHONE_DIGITS:
+                parts.append(" ")
+                run = 0
+        parts.append(node)
+        trail = len(node) - len(node.rstrip("0123456789"))
+        run = run + len(node) if trail == len(node) else trail
+        prev = node[-1]
+    return "".join(parts)
+
+
+PARSER_BACKENDS = {
+    "html.parser": ParsedPage,
+    "lxml": LxmlPage,
+    "selectolax": SelectolaxPage,
+}
+
+
+def get_page_class(name: str) -> type:
+    """Resolve a --parser name, failing early if its library isn't installed."""
+    if name not in PARSER_BACKENDS:
+        raise ValueError(f"Unknown parser backend: {name}")
+    if name == "lxml" and lxml is None:
+        raise RuntimeError("--parser lxml requires lxml (pip install lxml)")
+    if name == "selectolax" and LexborHTMLParser is None:
+        raise RuntimeError("--parser selectolax requires selectolax (pip install selectolax)")
+    return PARSER_BACKENDS[name]
+
+
+# ==============================
+# Crawl Frontier
+# ==============================
+TRACKING_PARAMS = {"gclid", "fbclid", "msclkid", "yclid", "igshid", "mc_cid", "mc_eid", "_ga", "_gl"}
+
+
+def normalize_url(url: str) -> str:
+    """
+    Canonical form of url for duplicate detection: lowercase scheme and
+    host, no default port, fragment, trailing slash or tracking parameters
+    (utm_* and friends), remaining query parameters sorted. A URL whose
+    port can't be parsed is returned as given.
+    """
+    parts = urlparse(url.strip())
+    try:
+        port = parts.port
+    except ValueError:  # "x.com:abc", "x.com:99999"
+        return url.strip()
+    scheme = parts.scheme.lower()
+    host = (parts.hostname or "").rstrip(".")
+    if ":" in host:  # IPv6 literal
+        host = f"[{host}]"
+    if port and (scheme, port) not in (("http", 80), ("https", 443)):
+        host = f"{host}:{port}"
+    query = sorted(
+        (key, value)
+        for key, value in parse_qsl(parts.query, keep_blank_values=True)
+        if not key.lower().startswith("utm_") and key.lower() not in TRACKING_PARAMS
+    )
+    return urlunparse((scheme, host, parts.path.rstrip("/"), "", urlencode(query), ""))
+
+
+def link_priority(href: str, anchor: str) -> Optional[int]:
+    """
+    How urgently a same-site link is worth fetching, lower first:
+    0 = contact page (href or anchor text), 1 = anchor text with another
+    contact keyword ("Get in touch", "Reach us", ...), 2 = about page.
+    None means the link isn't followed at all.
+    """
+    href, anchor = href.lower(), anchor.lower()
+    if "contact" in href or "contact" in anchor:
+        return 0
+    if anchor and KEYWORD_AUTOMATON.contains(anchor, "contact"):
+        return 1
+    if "about" in href or "about" in anchor:
+        return 2
+    return None
+
+
+class CrawlFrontier:
+    """
+    Per-site queue of pages to fetch, deduplicated on normalize_url.
+
+    Seen URLs are kept as 8-byte digests, so a mega-menu with thousands of
+    links costs a set lookup each. Queued links come out by priority (see
+    link_priority), and only links found on pages shallower than `max_depth`
+    are queued (seed pages are depth 0). Sitemap pages taken with take() and
+    queued links share one budget of `max_pages`.
+    """
+
+    def __init__(self, max_pages: int = 25, max_depth: int = 1):
+        self.max_pages = max_pages
+        self.max_depth = max_depth
+        self.fetched = 0
+        self._seen: Set[bytes] = set()
+        self._heap: List[Tuple[int, int, str, int]] = []
+        self._order = 0
+
+    def __len__(self) -> int:
+        return len(self._heap)
+
+    def claim(self, url: str) -> bool:
+        """Mark url as seen; False if it (or an equivalent URL) already was."""
+        key = hashlib.blake2b(normalize_url(url).encode(), digest_size=8).digest()
+        if key in self._seen:
+            return False
+        self._seen.add(key)
+        return True
+
+    def add(self, url: str, depth: int, priority: int) -> bool:
+        if depth > self.max_depth or not self.claim(url):
+            return False
+        heapq.heappush(self._heap, (priority, self._order, url, depth))
+        self._order += 1
+        self._trim()
+        return True
+
+    def take(self, urls: List[str]) -> List[str]:
+        """Claim pages found elsewhere (the sitemap), charging them to the budget."""
+        taken = []
+        for url in urls:
+            if self.fetched >= self.max_pages:
+                break
+            if self.claim(url):
+                taken.append(url)
+                self.fetched += 1
+        self._trim()
+        return taken
+
+    def _trim(self):
+        # never hold more than the budget can still fetch: drop the worst
+        budget = self.max_pages - self.fetched
+        if len(self._heap) > budget:
+            self._heap = heapq.nsmallest(max(budget, 0), self._heap)
+            heapq.heapify(self._heap)
+
+    def pop_all(self) -> List[Tuple[str, int]]:
+        """Take every queued (url, depth), best first, charging the budget."""
+        batch = [heapq.heappop(self._heap)[2:] for _ in range(len(self._heap))]
+        self.fetched += len(batch)
+        return batch
+
+
+# ==============================
+# Input Normalization
+# ==============================
+def site_key(url: str) -> str:
+    """
+    Scheme- and www-insensitive form of an input URL, so http/https,
+    www/non-www and UTM-tagged variants of one site compare equal.
+    """
+    parts = urlparse(normalize_url(with_scheme(url)))
+    host = parts.netloc[4:] if parts.netloc.startswith("www.") else parts.netloc
+    return host + parts.path + (f"?{parts.query}" if parts.query else "")
+
+
+def with_scheme(url: str) -> str:
+    url = url.strip()
+    return url if "://" in url else f"http://{url}"
+
+
+def scrape_root(start: str, final: str) -> str:
+    """
+    Where to scrape a site that `start` redirects to `final`: final's scheme
+    and host, with start's path kept only if final is under it.
+    """
+    start_path = urlparse(normalize_url(start)).path
+    parts = urlparse(final)
+    under = parts.path == start_path or parts.path.startswith(start_path + "/")
+    path = start_path if under else ""
+    return urlunparse((parts.scheme, parts.netloc, path, "", "", ""))
+
+
+def group_site_aliases(urls: List[str], fetcher: Fetcher) -> Dict[str, List[str]]:
+    """
+    Map each distinct site among `urls` to the input URLs that name it.
+
+    Inputs are grouped by site_key, then one URL per group (https first) is
+    resolved through its redirects; groups that land on the same page merge.
+    Keys are the URLs to scrape, in input order: the final URL's origin (plus
+    the input's own path when the redirect stays under it), or the input as
+    given when it could not be resolved. A homepage that redirects deeper
+    (/ -> /en/index.php) is still scraped, and probed, at its root.
+    """
+    groups: Dict[str, List[str]] = {}
+    for url in urls:
+        if url.strip():
+            groups.setdefault(site_key(url), []).append(url.strip())
+    starts = {
+        key: with_scheme(next((u for u in aliases if u.startswith("https")), aliases[0]))
+        for key, aliases in groups.items()
+    }
+    resolving = {key: fetcher.submit_resolve(url) for key, url in starts.items()}
+    sites: Dict[str, List[str]] = {}
+    by_final: Dict[str, str] = {}
+    for key, aliases in groups.items():
+        try:
+            final = normalize_url(resolving[key].result())
+            site = scrape_root(starts[key], final)
+        except requests.RequestException:
+            final = site = starts[key].rstrip("/")
+        site = by_final.setdefault(site_key(final), site)
+        sites.setdefault(site, []).extend(aliases)
+    if len(sites) < len(urls):
+        log_info(f"{len(urls)} input URLs are {len(sites)} distinct sites")
+    return sites
+
+
+class SiteAliases:
+    """
+    Scraped site -> the input URLs it stands for, shared by the job's workers.
+
+    Batch inputs arrive pre-grouped (group_site_aliases, via update). Streamed
+    inputs (Maps results as the feed scrolls) are folded in one at a time by
+    site_key with add(); there's no redirect check for those, since the
+    other half of a pair may not have been seen yet. Finished results are
+    kept so an alias that turns up after its site is done still gets a row.
+    """
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.groups: Dict[str, List[str]] = {}
+        self._by_key: Dict[str, str] = {}
+        self._done: Dict[str, Dict] = {}
+
+    def update(self, groups: Dict[str, List[str]]):
+        with self.lock:
+            for site, aliases in groups.items():
+                self.groups.setdefault(site, []).extend(aliases)
+                self._by_key.setdefault(site_key(site), site)
+
+    def add(self, url: str) -> Tuple[Optional[str], List[Dict]]:
+        """
+        Take one streamed input URL. Returns the site to scrape if it's new
+        (else None) and the rows `url` is owed right away, if its site has
+        already finished.
+        """
+        url = url.strip()
+        site = with_scheme(url).rstrip("/")
+        with self.lock:
+            owner = self._by_key.setdefault(site_key(url), site)
+            aliases = self.groups.setdefault(owner, [])
+            if url in aliases:
+                return None, []
+            aliases.append(url)
+            if owner == site and len(aliases) == 1:
+                return site, []
+            done = self._done.get(owner)
+        return None, ([{**done, "website": url}] if done else [])
+
+    def names(self, site: str) -> List[str]:
+        with self.lock:
+            return list(self.groups.get(site) or [site])
+
+    def finish(self, result: Dict) -> List[Dict]:
+        """One copy of a site's result per input URL it stands for."""
+        site = result["website"]
+        # one critical section: an add() for this site lands wholly before
+        # (its alias is in the snapshot) or after (it sees _done)
+        with self.lock:
+            self._done[site] = result
+            names = list(self.groups.get(site) or [site])
+        return [{**result, "website": alias} for alias in names]
+
+
+# ==============================
+# Sitemap Discovery
+# ==============================
+# path keywords of sitemap pages worth fetching, most useful first
+SITEMAP_KEYWORDS = ("contact", "reach-us", "get-in-touch", "about", "team", "info")
+SITEMAP_FALLBACKS = ("/sitemap.xml", "/sitemap")  # when robots.txt lists none
+SITEMAP_MAX_FILES = 10  # sitemaps read per site, index children included
+SITEMAP_MAX_BYTES = 50 << 20  # the sitemap protocol's own uncompressed limit
+
+
+def robots_sitemaps(text: str) -> List[str]:
+    """The `Sitemap:` URLs a robots.txt advertises."""
+    return [
+        line.split(":", 1)[1].strip()
+        for line in text.splitlines()
+        if line.strip().lower().startswith("sitemap:") and line.split(":", 1)[1].strip()
+    ]
+
+
+def sitemap_priority(url: str) -> Optional[int]:
+    path = urlparse(url).path.lower()
+    return next((i for i, kw in enumerate(SITEMAP_KEYWORDS) if kw in path), None)
+
+
+def sitemap_file_rank(url: str) -> int:
+    """Read page sitemaps of an index before post/product/media ones."""
+    url = url.lower()
+    if "page" in url:
+        return 0
+    if any(k in url for k in ("post", "product", "tag", "categor", "author", "image", "video", "news")):
+        return 2
+    return 1
+
+
+class SitemapPages:
+    """
+    What one site's sitemaps yield: the best `cap` about/contact page URLs
+    (ranked by SITEMAP_KEYWORDS, then path depth, then length) and the
+    sitemaps still to read. Only the current top `cap` pages are kept, so
+    a 50k-URL sitemap costs a heap of `cap` entries. Thread-safe, as the
+    sitemaps of one level are read concurrently.
+    """
+
+    def __init__(
+        self,
+        cap: int = 25,
+        accept: Optional[Callable[[str], bool]] = None,
+        max_sitemaps: int = SITEMAP_MAX_FILES,
+    ):
+        self.cap = cap
+        self.accept = accept
+        self.max_sitemaps = max_sitemaps
+        self.read = 0
+        self.lock = threading.Lock()
+        self._best: List[Tuple[Tuple[int, int, int], str]] = []  # worst on top
+        self._kept: Set[str] = set()
+        self._queued: List[str] = []
+        self._known: Set[str] = set()
+
+    def add_sitemap(self, url: str):
+        with self.lock:
+            if url not in self._known:
+                self._known.add(url)
+                self._queued.append(url)
+
+    def take_sitemaps(self) -> List[str]:
+        """The next sitemaps to read, page sitemaps first, within max_sitemaps."""
+        with self.lock:
+            batch = sorted(self._queued, key=sitemap_file_rank)
+            batch = batch[: max(0, self.max_sitemaps - self.read)]
+            self._queued = []
+            self.read += len(batch)
+            return batch
+
+    def add_page(self, url: str):
+        priority = sitemap_priority(url)
+        if priority is None or (self.accept and not self.accept(url)):
+            return
+        rank = (-priority, -urlparse(url).path.count("/"), -len(url))
+        with self.lock:
+            if url in self._kept:
+                return
+            heapq.heappush(self._best, (rank, url))
+            self._kept.add(url)
+            if len(self._best) > self.cap:
+                self._kept.discard(heapq.heappop(self._best)[1])
+
+    def ranked(self) -> List[str]:
+        return [url for _rank, url in sorted(self._best, reverse=True)]
+
+
+class SitemapReader:
+    """
+    Push parser for one sitemap response: feed() it body chunks as they
+    arrive. Gzipped files are inflated on the fly and XML is parsed
+    incrementally, clearing each <url>/<sitemap> entry once read, so memory
+    stays flat however large the file. <loc>s of a <sitemapindex> are queued
+    as sitemaps, those of a <urlset> offered as pages. A body that isn't
+    sitemap XML (an HTML "/sitemap" page) is scanned with
+    Patterns.ABOUT_PAGE instead.
+    """
+
+    def __init__(self, pages: SitemapPages, max_bytes: int = SITEMAP_MAX_BYTES):
+        self.pages = pages
+        self.max_bytes = max_bytes
+        self.size = 0
+        self.mode: Optional[str] = None  # "xml" or "text", from the first bytes
+        self._gunzip = None
+        self._first = True
+        self._xml = ET.XMLPullParser(events=("start", "end"))
+        self._root = None
+        self._depth = 0
+        self._decoder = codecs.getincrementaldecoder("utf-8")(errors="replace")
+        self._carry = ""
+
+    def feed(self, chunk: bytes) -> bool:
+        """Take the next body chunk; False once the rest isn't wanted."""
+        if self._first:
+            self._first = False
+            if chunk[:2] == b"\x1f\x8b":
+                self._gunzip = zlib.decompressobj(16 + zlib.MAX_WBITS)
+        try:
+            for piece in self._inflate(chunk):
+                if self.mode is None:
+                    head = piece.lstrip(b"\xef\xbb\xbf \t\r\n")[:64].lower()
+                    is_xml = head.startswith((b"<?xml", b"<urlset", b"<sitemapindex"))
+                    self.mode = "xml" if is_xml else "text"
+                self.size += len(piece)
+                feed = self._feed_xml if self.mode == "xml" else self._feed_text
+                if not feed(piece) or self.size >= self.max_bytes:
+                    return False
+        except zlib.error:
+            return False
+        return True
+
+    def _inflate(self, chunk: bytes):
+        """Yield the body in pieces of at most STREAM_CHUNK decompressed bytes."""
+        if not self._gunzip:
+            yield chunk
+            return
+        while chunk:
+            piece = self._gunzip.decompress(chunk, STREAM_CHUNK)
+            chunk = self._gunzip.unconsumed_tail
+            if piece:
+                yield piece
+
+    def _feed_xml(self, chunk: bytes) -> bool:
+        try:
+            self._xml.feed(chunk)
+            for event, elem in self._xml.read_events():
+                if event == "start":
+                    if self._root is None:
+                        self._root = elem
+                    self._depth += 1
+                    continue
+                self._depth -= 1
+                tag = elem.tag.rpartition("}")[2]
+                # only <urlset>/<url>/<loc>: skips <image:loc> and friends
+                if tag == "loc" and self._depth == 2 and elem.text:
+                    if self._root.tag.endswith("sitemapindex"):
+                        self.pages.add_sitemap(elem.text.strip())
+                    else:
+                        self.pages.add_page(elem.text.strip())
+                elif self._depth == 1:
+                    self._root.clear()  # entry done; keep the tree empty
+        except ET.ParseError:
+            return False  # keep what was read before the damage
+        return True
+
+    def _feed_text(self, chunk: bytes) -> bool:
+        text = self._carry + self._decoder.decode(chunk)
+        # scan up to the last delimiter so no URL is cut at a chunk boundary
+        cut = max(text.rfind(c) for c in " \n<\"'")
+        if cut < 0 and len(text) < STREAM_CHUNK:
+            self._carry = text
+            return True
+        cut = cut if cut >= 0 else len(text)
+        self._scan(text[:cut])
+        self._carry = text[cut:]
+        return True
+
+    def _scan(self, text: str):
+        for url in Patterns.ABOUT_PAGE.findall(text):
+            self.pages.add_page(with_scheme(url))
+
+    def close(self):
+        if self.mode == "text":
+            self._scan(self._carry + self._decoder.decode(b"", final=True))
+        self._carry = ""
+
+
+# ==============================
+# Extraction Stage
+# ==============================
+class ContactExtractor:
+    """
+    The per-page extraction passes, accumulating into emails/phones.
+
+    ContactScraper runs them in its own thread; extract_page runs them in
+    an ExtractionPool process. Neither needs anything but the page.
+    """
+
+    def __init__(self, parser: str = "html.parser"):
+        self.page_class = get_page_class(parser)
+        self.emails: Set[str] = set()
+        self.phones: Set[str] = set()
+
+    def _page(self, html) -> ParsedPage:
+        """Accept either raw HTML or an already parsed page."""
+        return html if isinstance(html, ParsedPage) else self.page_class(html)
+
+    def extract_from_html(self, html):
+        page = self._page(html)
+        for email in Patterns.EMAIL.findall(page.html):
+            self.emails.add(email.lower())
+        # Phones
+        # for match in Patterns.PHONE_NP.finditer(html):
+        #     if norm := normalize_phone(match.group()):
+        #         self.phones.add(norm)
+
+    def extract_from_contact_sections(self, html) -> set:
+        page = self._page(html)
+        phones = set()
+        # 1. Find <div>, <section>, <p> with contact keywords
+        # (scans each text node under a keyword-bearing tag exactly once)
+        for text in page.contact_texts:
+            self._add_candidates(text)
+
+        # 2. Bonus: Footer is gold
+        footer = page.footer_text
+        if footer:
+            self._add_candidates(footer)
+
+        if DEBUGGER == True:
+            print(self.emails)
+            print(self.phones)
+            pdb.set_trace()
+
+        return phones
+
+    def _add_candidates(self, text: str):
+        for kind, value, _span in CONTACT_MATCHER.scan(text):
+            if kind == "email":
+                self.emails.add(value)
+            elif norm := normalize_phone(value):
+                self.phones.add(norm)
+
+    def extract_from_text(self, text):
+        page = self._page(text)
+        # Emails
+        for email in Patterns.EMAIL.findall(page.html):
+            self.emails.add(email.lower())
+        # Extract mailto: links
+        for href in page.hrefs:
+            if href.startswith("mailto:"):
+                email = href[7:].split("?")[0]
+                if Patterns.EMAIL.match(email):
+                    self.emails.add(email.lower())
+            elif href.startswith("tel:"):
+                phone = href[4:]
+                if CONTACT_MATCHER.has_phone(phone.strip()):
+                    self.phones.add(phone)
+
+        # Phones
+        # for match in Patterns.PHONE_NP.finditer(text):
+        # if norm := normalize_phone(match.group()):
+        # self.phones.add(norm)
+        smart_phones = self.extract_from_contact_sections(page)
+        self.phones.update(smart_phones)
+
+
+@dataclass
+class PageExtract:
+    """What extract_page sends back from a worker process (small to pickle)."""
+    emails: Set[str]
+    phones: Set[str]
+    links: List[Tuple[str, str]]  # (href, anchor text) worth queueing
+
+
+def extract_page(html: str, parser: str = "html.parser") -> PageExtract:
+    """Parse one page and run every extraction pass on it."""
+    extractor = ContactExtractor(parser)
+    page = extractor._page(html)
+    extractor.extract_from_text(page)
+    links = [
+        (href, anchor)
+        for href, anchor in page.links
+        if href.startswith(("https", "http")) and link_priority(href, anchor) is not None
+    ]
+    return PageExtract(extractor.emails, extractor.phones, links)
+
+
+class ExtractionPool:
+    """
+    Worker processes for the CPU-bound half of scraping (parsing and the
+    regex passes), so fetch threads or the event loop only move bytes.
+
+    At most `max_pending` bodies wait for a worker; past that, submit()
+    blocks the fetcher that called it until a parse finishes, rather than
+    letting fetched pages pile up in memory.
+    """
+
+    def __init__(self, workers: int, parser: str = "html.parser", max_pending: int = 0):
+        self.parser = parser
+        # spawn: forking a process that already runs fetch threads isn't safe
+        self.executor = ProcessPoolExecutor(
+            max_workers=workers, mp_context=multiprocessing.get_context("spawn")
+        )
+        self.slots = threading.BoundedSemaphore(max_pending or workers * 4)
+
+    def submit(self, html: str) -> Future:
+        self.slots.acquire()
+        try:
+            future = self.executor.submit(extract_page, html, self.parser)
+        except BaseException:
+            self.slots.release()
+            raise
+        future.add_done_callback(lambda _future: self.slots.release())
+        return future
+
+    def close(self):
+        self.executor.shutdown(wait=True, cancel_futures=True)
+
+
+# ==============================
+# Core Scraper Module
+# ==============================
+def failed_result(url: str, status: str = "unreachable") -> Dict:
+    """Result for a site whose homepage couldn't be fetched at all."""
+    return {"website": url, "emails": [], "numbers": [], "truncated": False, "status": status}
+
+
+class ContactScraper(ContactExtractor):
+    def __init__(
+        self,
+        url: str,
+        use_headless: bool = True,
+        fetcher: Optional[Fetcher] = None,
+        parser: str = "html.parser",
+        browser_pool: Optional[BrowserPool] = None,
+        max_pages: int = 25,
+        max_depth: int = 1,
+        extraction_pool: Optional[ExtractionPool] = None,
+    ):
+        super().__init__(parser)
+        self.url = url.rstrip("/")
+        self.fetcher = fetcher or default_fetcher()
+        self.browser_pool = browser_pool or default_browser_pool(use_headless)
+        self.extraction_pool = extraction_pool
+        self.content = ""
+        self.is_react = False
+        self.has_sitemap = False
+        self.captcha_detected = False
+        self.about_pages: List[str] = []
+        self.allow_redirects = True
+        self.frontier = CrawlFrontier(max_pages=max_pages, max_depth=max_depth)
+        self.frontier.claim(self.url)
+        self.html_content = None
+        self.home_page: Optional[ParsedPage] = None
+        self.rendered = False
+        self.truncated = False  # some page of the site was cut off at max_body
+        self.root_domain = self._get_root_domain(self.url)
+
+    def _get_root_domain(self, url: str) -> str:
+        """Extract the root domain (e.g., example.edu.np) from URL."""
+        parsed = urlparse(url)
+        domain = parsed.netloc.lower()
+        # For .edu.np, include the college name as root
+        parts = domain.split(".")
+        if len(parts) >= 3 and parts[-2] == "edu" and parts[-1] == "np":
+            return ".".join(parts[-3:])
+        # Fallback for other domains (e.g., example.com)
+        if len(parts) >= 2:
+            return ".".join(parts[-2:])
+        return domain
+
+    def fetch_page(self) -> bool:
+        try:
+            response = self.fetcher.get(
+                self.url,
+                headers=HEADERS,
+                timeout=5,
+                allow_redirects=self.allow_redirects,
+                probe=False,
+            )
+            if response.status_code // 100 in [4, 5]:
+                headers = ALT_HEADERS
+                response = self.fetcher.get(
+                    self.url,
+                    headers=headers,
+                    timeout=5,
+                    allow_redirects=self.allow_redirects,
+                    probe=False,
+                )
+            if response.status_code != 200:
+                log_error(f"{self.url} returned {response.status_code}")
+                # return False
+            self.truncated |= response.truncated
+            self.content = response.text
+            self._detect_frameworks(self.content)
+            # self.captcha_detected = "captcha" in self.content.lower()
+            if self.captcha_detected:
+                log_error("CAPTCHA detected. Skipping content scraping.")
+                return False
+            # EDU_PATHS probes run in the background while sitemap/about pages
+            # are fetched; fetch_common_paths picks up their results later
+            self._start_probes()
+            self._check_sitemap()
+            return True
+        except requests.RequestException as e:
+            log_error(f"Failed to fetch {self.url}: {e}")
+            return False
+
+    def _detect_frameworks(self, content: str):
+        # one automaton pass answers both the Vue and the React fingerprints
+        found = KEYWORD_AUTOMATON.find(content)
+        self.is_vue = bool(found["vue"])
+        if self.is_vue:
+            log_info("Vue.js detected → will use Selenium")
+            self.is_react = False  # Vue wins over generic React checks
+        else:
+            self.is_react = bool(found["react"])
+
+    def _start_probes(self):
+        # "/contact" and "/contact/" are one page; links to a probe aren't refetched
+        self._probes = [
+            (
+                edu_path,
+                self.fetcher.submit(
+                    f"{self.url}{edu_path}", allow_redirects=self.allow_redirects, timeout=3
+                ),
+            )
+            for edu_path in EDU_PATHS
+            if self.frontier.claim(f"{self.url}{edu_path}")
+        ]
+
+    def _fetch_many(self, urls: List[str], **kwargs) -> List[Optional[FetchResult]]:
+        """Fetch independent URLs concurrently; None where a fetch failed."""
+        futures = [
+            self.fetcher.submit(url, allow_redirects=self.allow_redirects, **kwargs)
+            for url in urls
+        ]
+        return [self._settle(url, future) for url, future in zip(urls, futures)]
+
+    def _settle(self, url: str, future: Future):
+        try:
+            result = future.result()
+        except requests.RequestException as e:
+            log_error(f"Failed to fetch {url}: {e}")
+            return None
+        if isinstance(result, FetchResult):
+            self.truncated |= result.truncated
+        return result
+
+    def fetch_common_paths(self):
+        if getattr(self, "_probes", None) is None:
+            self._start_probes()
+        bodies = []
+        for edu_path, probe in self._probes:
+            response = self._settle(f"{self.url}{edu_path}", probe)
+            log_info(f"Checking {self.url}{edu_path}")
+            if response is None:
+                continue
+            if response.status_code != 200:
+                log_error(f"{self.url} returned {response.status_code}")
+                continue
+            bodies.append(response.text)
+        for page in self._extract_all(bodies):
+            self.handle_hyperlinks(page)
+        self._probes = []
+
+    def _check_sitemap(self):
+        """Read the sitemaps robots.txt lists (or the usual paths), indexes included."""
+        sitemaps = self._new_sitemaps()
+        robots = self._settle(
+            f"{self._origin}/robots.txt",
+            self.fetcher.submit(f"{self._origin}/robots.txt", headers=HEADERS, timeout=5),
+        )
+        self._queue_sitemaps(sitemaps, robots)
+        while batch := sitemaps.take_sitemaps():
+            readers = [SitemapReader(sitemaps) for _ in batch]
+            futures = [
+                self.fetcher.fanout.submit(
+                    self.fetcher.stream, url, reader.feed, headers=HEADERS, timeout=5
+                )
+                for url, reader in zip(batch, readers)
+            ]
+            for url, reader, future in zip(batch, readers, futures):
+                self._sitemap_read(url, reader, self._settle(url, future))
+        self._collect_sitemap_pages(sitemaps)
+
+    @property
+    def _origin(self) -> str:
+        parts = urlparse(self.url)
+        return f"{parts.scheme}://{parts.netloc}"
+
+    def _new_sitemaps(self) -> SitemapPages:
+        return SitemapPages(cap=self.frontier.max_pages, accept=self._is_same_root_domain)
+
+    def _queue_sitemaps(self, sitemaps: SitemapPages, robots: Optional[FetchResult]):
+        listed = robots_sitemaps(robots.text) if robots and robots.status_code == 200 else []
+        for url in listed or [f"{self._origin}{path}" for path in SITEMAP_FALLBACKS]:
+            sitemaps.add_sitemap(url)
+
+    def _sitemap_read(self, url: str, reader: SitemapReader, status: Optional[int]):
+        reader.close()
+        if status == 200 and reader.mode:
+            self.has_sitemap = True
+            log_debug(f"Read sitemap {url} ({reader.size // 1024} KB)")
+
+    def _collect_sitemap_pages(self, sitemaps: SitemapPages):
+        self.about_pages = sitemaps.ranked()
+        if self.has_sitemap:
+            log_debug(f"Found {len(self.about_pages)} about/contact pages in sitemap")
+
+    def _is_same_root_domain(self, url: str) -> bool:
+        """Check if the given URL has the same root domain as self.url."""
+        if not url.startswith(("http://", "https://")):
+            # Relative URL: assume same domain
+            return True
+        target_root = self._get_root_domain(url)
+        return target_root == self.root_domain
+
+    def _extract_all(self, bodies: List[str]) -> List:
+        """
+        Run the extraction passes on each body, here or in the extraction
+        pool. Returns what each page's links can be read from (the parsed
+        page, or the PageExtract a worker sent back).
+        """
+        if not self.extraction_pool:
+            pages = [self._page(body) for body in bodies]
+            for page in pages:
+                self.extract_from_text(page)
+            return pages
+        futures = [self.extraction_pool.submit(body) for body in bodies]
+        return [self._merge(future.result()) for future in futures]
+
+    def _merge(self, extract: PageExtract) -> PageExtract:
+        self.emails |= extract.emails
+        self.phones |= extract.phones
+        return extract
+
+    def scrape_static(self):
+        if not self.content:
+            return
+        page = self._extract_all([self.content])[0]
+        if isinstance(page, ParsedPage):
+            self.home_page = page  # reused by the render decision
+        # sitemap pages come out of the same --max-pages budget as links
+        pages = self.frontier.take(self.about_pages) if self.has_sitemap else []
+        self.handle_hyperlinks(page)
+        if pages:
+            responses = self._fetch_many(pages, headers=HEADERS, timeout=5)
+            self._extract_all(
+                [res.text for res in responses if res is not None and res.status_code == 200]
+            )
+
+    def scrape_dynamic(self, url, forced=False):
+        if forced or self.is_vue or self.is_react:
+            self._render(url)
+
+    def _render(self, url):
+        """Render url in a pooled browser, then extract from the final DOM."""
+        before = (len(self.phones), len(self.emails))
+        self.rendered = True
+        try:
+            html_content, hrefs = self.browser_pool.render(url)
+        except Exception as e:
+            log_error(f"Selenium failed for {url}: {e}")
+            return
+        # the browser is already back in the pool; extraction doesn't need it
+        self.handle_hyperlinks(self._extract_all([html_content])[0])
+        # Extract mailto: links
+        for href in hrefs:
+            if href.startswith("mailto:"):
+                email = href[7:].split("?")[0]
+                if Patterns.EMAIL.match(email):
+                    self.emails.add(email.lower())
+        gained = (len(self.phones), len(self.emails)) != before
+        self.browser_pool.history.record(urlparse(self.url).netloc, gained)
+
+    def render_decision(self) -> RenderDecision:
+        if self.rendered:
+            return RenderDecision(False, 0.0, ["already rendered"])
+        return score_render(
+            self.home_page or self._page(self.content),
+            missing_both=not (self.phones or self.emails),
+            history=self.browser_pool.history.outcomes(urlparse(self.url).netloc),
+            threshold=self.browser_pool.threshold,
+        )
+
+    def _fallback_render(self):
+        """Render the homepage only when it is likely to add contacts."""
+        decision = self.render_decision()
+        verdict = "rendering" if decision.render else "skipping browser"
+        log_info(
+            f"Render decision for {self.url}: {verdict} "
+            f"(score {decision.score:.2f}: {'; '.join(decision.reasons)})"
+        )
+        if decision.render:
+            self.scrape_dynamic(self.url, forced=True)
+
+    def handle_hyperlinks(self, html, depth: int = 0):
+        """
+        Hyperlinks like "Contact Us", "About Us" etc. may exist,
+        despite the site not having sitemap.xml
+        """
+        self._queue_links(html, depth)
+        while self.frontier:
+            batch = self.frontier.pop_all()
+            urls = [href for href, _depth in batch]
+            fetched = []
+            for (href, link_depth), res in zip(batch, self._fetch_many(urls, timeout=5)):
+                if res is None:
+                    continue
+                if res.status_code == 200:
+                    fetched.append((res.text, link_depth))
+                else:
+                    log_error(f"{href} returned {res.status_code}")
+            pages = self._extract_all([body for body, _depth in fetched])
+            for page, (_body, link_depth) in zip(pages, fetched):
+                self._queue_links(page, link_depth)
+
+    def _queue_links(self, html, depth: int):
+        """Queue this page's same-site about/contact links in the frontier."""
+        if depth >= self.frontier.max_depth:
+            return
+        source = html if isinstance(html, PageExtract) else self._page(html)
+        for href, anchor in source.links:
+            if not href.startswith(("https", "http")):
+                continue
+            priority = link_priority(href, anchor)
+            if priority is None or not self._is_same_root_domain(href):
+                continue
+            if self.frontier.add(href, depth + 1, priority):
+                log_debug(f"Found {anchor or 'contact/about'} Hyperlink at {href}")
+
+    def is_vue_page(self, html: str) -> bool:
+        """Return True if Vue 2 or Vue 3 is detected"""
+        return bool(KEYWORD_AUTOMATON.find(html)["vue"])
+
+    def clean_emails(self):
+        gibberish = ["example", "yoursite", ".png", ".svg", ".jpg", ".jpeg", ".gif"]
+        for email in self.emails.copy():
+            for g in gibberish:
+                if g in email:
+                    self.emails.remove(email)
+
+    def debug_phone_regex(self):
+        for phone in self.phones:
+            print(phone)
+            # print(f"NEW_NEW_PHONE regex:\t\t{bool(Patterns.NEW_NEW_PHONE_NP.search(phone))}")
+            # print(f"NEW_PHONE regex:\t\t{bool(Patterns.NEW_PHONE_NP.search(phone))}")
+            # print(f"PHONE regex:\t\t{bool(Patterns.PHONE_NP.search(phone))}")
+            print(
+                f"OTHER_PHONE regex:\t\t{bool(Patterns.OTHER_PHONE_NP.search(phone))}"
+            )
+
+    def run(self) -> Dict:
+        log_info(f"Scraping: {self.url}")
+        if not self.fetch_page():
+            return failed_result(self.url)
+        self.scrape_static()
+        if self.is_react or self.is_vue:
+            self.scrape_dynamic(self.url)
+        self.fetch_common_paths()
+        if len(self.phones) == 0 or len(self.emails) == 0:
+            log_info("Static Scraping didn't return proper results")
+            self._fallback_render()
+
+        return self._result()
+
+    def _result(self) -> Dict:
+        self.clean_emails()
+        self.debug_phone_regex()
+
+        return {
+            "website": self.url,
+            "emails": sorted(self.emails) or "Not found",
+            "numbers": sorted(self.phones) or "Not found",
+            "truncated": self.truncated,
+            "status": "ok",
+        }
+
+
+# ==============================
+# Google Maps URL Extractor
+# ==============================
+class MapsScraper:
+    def __init__(
+        self,
+        keywords: str,
+        limit: int = 4,
+        inpfile=None,
+        profile: Optional[RenderProfile] = None,
+    ):
+        self.keywords = keywords
+        self.limit = limit
+        self.profile = profile or RenderProfile()
+        self.search_url = f"https://www.google.com/maps/search/{urllib.parse.quote_plus(keywords)}?hl=en"
+        self.websites: Set[str] = set()
+        self.inpfile = inpfile
+        if self.inpfile:
+            try:
+                with open(self.inpfile, "r") as f:
+                    urls = [line.strip() for line in f if line.strip()]
+                    self.limit = len(urls)
+                    self.websites.update(urls)
+            except FileNotFoundError:
+                log_error(f"{self.inpfile} not found")
+
+    def run(self) -> List[str]:
+        return list(self.iter_websites())
+
+    def iter_websites(self) -> Iterator[str]:
+        """
+        Yield each new website URL as soon as it shows up in the results
+        feed, so scraping can start while Maps is still scrolling. Stops at
+        `limit`, at the end of the feed, or on error; the browser is closed
+        when the generator finishes or is closed early.
+        """
+        driver = None
+        try:
+            options = self.profile.apply(Options())
+            options.add_argument("--headless")
+            driver = webdriver.Firefox(options=options)
+            driver.get(self.search_url)
+            driver.maximize_window()
+            WebDriverWait(driver, 20).until(
+                EC.presence_of_element_located((By.XPATH, "//a[@data-value='Website']"))
+            )
+            feed = driver.find_element(By.XPATH, '//div[@role="feed"]')
+            last_height = driver.execute_script("return arguments[0].scrollTop", feed)
+            while len(self.websites) < self.limit:
+                elements = driver.find_elements(By.XPATH, "//a[@data-value='Website']")
+                for el in elements:
+                    url = el.get_attribute("href")
+                    if url and url.startswith("http") and url not in self.websites:
+                        self.websites.add(url)
+                        yield url
+                    if len(self.websites) >= self.limit:
+                        break
+                # Scroll, then wait for the next batch of results (3s at most)
+                driver.execute_script("arguments[0].scrollTop += 600", feed)
+                try:
+                    WebDriverWait(driver, 3, poll_frequency=0.2).until(
+                        lambda d: len(
+                            d.find_elements(By.XPATH, "//a[@data-value='Website']")
+                        )
+                        > len(elements)
+                    )
+                except TimeoutException:
+                    pass
+                new_height = driver.execute_script(
+                    "return arguments[0].scrollTop", feed
+                )
+                if new_height == last_height:
+                    log_info("No more results. End of scroll.")
+                    break
+                last_height = new_height
+            log_info(f"Collected {len(self.websites)} websites from Maps.")
+        except TimeoutException:
+            log_error("Website links not found in Google Maps.")
+        except Exception as e:
+            log_error(f"Maps scraping failed: {e}")
+        finally:
+            if driver:
+                driver.quit()
+
+
+# ==============================
+# Async Crawl Engine
+# ==============================
+class AsyncFetcher:
+    """
+    aiohttp counterpart of Fetcher for the asyncio engine.
+
+    One ClientSession/TCPConnector is shared by every site in the job;
+    `concurrency` bounds requests in flight overall and `per_host` bounds
+    them per origin (an AIMDController, if given, adapts the overall cap
+    below `concurrency`). Transport errors are re-raised as
+    requests.RequestException so scraper code handles both engines alike.
+    Shares the job's ResponseCache/NegativeCache/HostScheduler with the
+    threaded Fetcher, and reads bodies under the same type/size rules.
+    """
+
+    def __init__(
+        self,
+        concurrency: int = 200,
+        per_host: int = 8,
+        cache: Optional[ResponseCache] = None,
+        negative: Optional[NegativeCache] = None,
+        scheduler: Optional[HostScheduler] = None,
+        controller: Optional[AIMDController] = None,
+        max_body: int = MAX_BODY,
+        dns_cache: Optional[DNSCache] = None,
+    ):
+        self.cache = cache
+        self.negative = negative
+        self.scheduler = scheduler
+        self.controller = controller
+        self.max_body = max_body
+        self.semaphore = asyncio.Semaphore(concurrency)
+        self._inflight = 0
+        self._gate = asyncio.Condition()
+        self.session = aiohttp.ClientSession(
+            connector=aiohttp.TCPConnector(
+                limit=concurrency,
+                limit_per_host=per_host,
+                ssl=False,
+                resolver=dns_cache.aiohttp_resolver() if dns_cache else None,
+            ),
+            cookie_jar=aiohttp.DummyCookieJar(),
+        )
+
+    async def get(
+        self,
+        url: str,
+        headers: Optional[Dict[str, str]] = None,
+        timeout: float = 5,
+        allow_redirects: bool = True,
+        probe: bool = True,
+    ) -> FetchResult:
+        if self.negative and (miss := self.negative.lookup(url, probe)):
+            return miss
+        entry = self.cache.lookup(url) if self.cache else None
+        if entry and entry["fresh"]:
+            return entry["result"]
+        if entry:
+            headers = {**(headers or {}), **self.cache.conditional_headers(entry)}
+        for attempt in range(2):
+            if self.scheduler:
+                if not self.scheduler.resolved(url):
+                    await asyncio.to_thread(self.scheduler.ip_for, url)
+                await asyncio.sleep(self.scheduler.reserve(url))
+            async with self.semaphore, self._admitted():
+                started = time.monotonic()
+                try:
+                    async with self.session.get(
+                        url,
+                        headers=headers,
+                        # same meaning as requests' timeout: connect / between reads
+                        timeout=aiohttp.ClientTimeout(sock_connect=timeout, sock_read=timeout),
+                        allow_redirects=allow_redirects,
+                    ) as response:
+                        self._observe(started, failed=is_overload(response.status))
+                        if self.scheduler and not attempt:
+                            pause = self.scheduler.throttle(
+                                url, response.status, response.headers.get("Retry-After")
+                            )
+                            if pause is not None and pause <= self.scheduler.max_retry_wait:
+                                continue  # retried once the pause is over
+                        if self.negative:
+                            self.negative.record_response(url, response.status, probe)
+                        if entry and response.status == 304:
+                            self.cache.refresh(url)
+                            return entry["result"]
+                        content_type = response.headers.get("Content-Type", "")
+                        reader = None
+                        if is_page_type(content_type):
+                            reader = BodyReader(content_type, self.max_body)
+                            async for chunk in response.content.iter_chunked(STREAM_CHUNK):
+                                if not reader.feed(chunk):
+                                    log_debug(f"{url}: body cut off at {self.max_body // 1024} KB")
+                                    break
+                        else:
+                            log_debug(f"Skipping {url}: {content_type}")
+                        result = FetchResult(
+                            url=str(response.url),
+                            status_code=response.status,
+                            text=reader.text() if reader else "",
+                            headers=dict(response.headers),
+                            truncated=bool(reader and reader.truncated),
+                        )
+                except (aiohttp.ClientError, asyncio.TimeoutError, ValueError) as e:
+                    self._observe(started, failed=True)
+                    if self.negative:
+                        self.negative.record_error(url, e)
+                    raise requests.ConnectionError(f"{url}: {e!r}") from e
+            break
+        if self.cache and not result.truncated:
+            self.cache.store(url, result)
+        return result
+
+    async def stream(
+        self,
+        url: str,
+        feed: Callable[[bytes], bool],
+        headers: Optional[Dict[str, str]] = None,
+        timeout: float = 5,
+    ) -> int:
+        """Async Fetcher.stream: feed a 200 body chunk by chunk, uncached."""
+        if self.negative and (miss := self.negative.lookup(url)):
+            return miss.status_code
+        if self.scheduler:
+            if not self.scheduler.resolved(url):
+                await asyncio.to_thread(self.scheduler.ip_for, url)
+            await asyncio.sleep(self.scheduler.reserve(url))
+        async with self.semaphore, self._admitted():
+            started = time.monotonic()
+            try:
+                async with self.session.get(
+                    url,
+                    headers=headers,
+                    timeout=aiohttp.ClientTimeout(sock_connect=timeout, sock_read=timeout),
+                ) as response:
+                    self._observe(started, failed=is_overload(response.status))
+                    if self.negative:
+                        self.negative.record_response(url, response.status)
+                    if response.status == 200:
+                        async for chunk in response.content.iter_chunked(STREAM_CHUNK):
+                            if not feed(chunk):
+                                break
+                    return response.status
+            except (aiohttp.ClientError, asyncio.TimeoutError, ValueError) as e:
+                self._observe(started, failed=True)
+                if self.negative:
+                    self.negative.record_error(url, e)
+                raise requests.ConnectionError(f"{url}: {e!r}") from e
+
+    @asynccontextmanager
+    async def _admitted(self):
+        if not self.controller:
+            yield
+            return
+        async with self._gate:
+            await self._gate.wait_for(lambda: self._inflight < self.controller.limit)
+            self._inflight += 1
+        try:
+            yield
+        finally:
+            async with self._gate:
+                self._inflight -= 1
+                self._gate.notify_all()
+
+    def _observe(self, started: float, failed: bool):
+        if self.controller:
+            self.controller.record(time.monotonic() - started, failed)
+
+    async def close(self):
+        await self.session.close()
+
+
+class AsyncContactScraper(ContactScraper):
+    """
+    ContactScraper whose sub-requests run concurrently on an event loop.
+
+    The homepage is fetched first; sitemap and EDU_PATHS probes then go out
+    together, followed by every sitemap/about/contact page discovered.
+    Extraction reuses the ContactScraper methods unchanged, and the browser
+    fallback runs in a worker thread so it never blocks the loop.
+    """
+
+    def __init__(
+        self,
+        url: str,
+        client: AsyncFetcher,
+        use_headless: bool = True,
+        fetcher: Optional[Fetcher] = None,
+        parser: str = "html.parser",
+        browser_pool: Optional[BrowserPool] = None,
+        max_pages: int = 25,
+        max_depth: int = 1,
+        extraction_pool: Optional[ExtractionPool] = None,
+    ):
+        super().__init__(
+            url,
+            use_headless=use_headless,
+            fetcher=fetcher,
+            parser=parser,
+            browser_pool=browser_pool,
+            max_pages=max_pages,
+            max_depth=max_depth,
+            extraction_pool=extraction_pool,
+        )
+        self.client = client
+
+    async def _get(
+        self,
+        url: str,
+        headers: Optional[Dict[str, str]] = None,
+        timeout: float = 5,
+        probe: bool = True,
+    ) -> Optional[FetchResult]:
+        try:
+            result = await self.client.get(
+                url,
+                headers=headers,
+                timeout=timeout,
+                allow_redirects=self.allow_redirects,
+                probe=probe,
+            )
+        except requests.RequestException as e:
+            log_error(f"Failed to fetch {url}: {e}")
+            return None
+        self.truncated |= result.truncated
+        return result
+
+    async def _check_sitemap_async(self):
+        sitemaps = self._new_sitemaps()
+        robots = await self._get(f"{self._origin}/robots.txt", headers=HEADERS)
+        self._queue_sitemaps(sitemaps, robots)
+        while batch := sitemaps.take_sitemaps():
+            readers = [SitemapReader(sitemaps) for _ in batch]
+            statuses = await asyncio.gather(
+                *(self._stream(url, reader.feed) for url, reader in zip(batch, readers))
+            )
+            for url, reader, status in zip(batch, readers, statuses):
+                self._sitemap_read(url, reader, status)
+        self._collect_sitemap_pages(sitemaps)
+
+    async def _extract_all_async(self, bodies: List[str]) -> List:
+        """_extract_all without blocking the loop on a full extraction queue."""
+        if not bodies:
+            return []
+        if not self.extraction_pool:
+            # parsing in a thread keeps the loop serving the other sites' fetches
+            return await asyncio.to_thread(self._extract_all, bodies)
+        futures = [
+            await asyncio.to_thread(self.extraction_pool.submit, body) for body in bodies
+        ]
+        extracts = await asyncio.gather(*(asyncio.wrap_future(f) for f in futures))
+        return [self._merge(extract) for extract in extracts]
+
+    async def _stream(self, url: str, feed) -> Optional[int]:
+        try:
+            return await self.client.stream(url, feed, headers=HEADERS)
+        except requests.RequestException as e:
+            log_error(f"Failed to fetch {url}: {e}")
+            return None
+
+    async def fetch_page_async(self) -> bool:
+        response = await self._get(self.url, headers=HEADERS, probe=False)
+        if response is not None and response.status_code // 100 in [4, 5]:
+            response = await self._get(self.url, headers=ALT_HEADERS, probe=False)
+        if response is None:
+            return False
+        if response.status_code != 200:
+            log_error(f"{self.url} returned {response.status_code}")
+        self.content = response.text
+        self._detect_frameworks(self.content)
+        return True
+
+    async def run_async(self) -> Dict:
+        log_info(f"Scraping: {self.url}")
+        if not await self.fetch_page_async():
+            return failed_result(self.url)
+
+        edu_paths = [p for p in EDU_PATHS if self.frontier.claim(f"{self.url}{p}")]
+        _, probes = await asyncio.gather(
+            self._check_sitemap_async(),
+            asyncio.gather(
+                *(self._get(f"{self.url}{path}", timeout=3) for path in edu_paths)
+            ),
+        )
+
+        bodies = [self.content]
+        for path, res in zip(edu_paths, probes):
+            log_info(f"Checking {self.url}{path}")
+            if res is None:
+                continue
+            if res.status_code != 200:
+                log_error(f"{self.url} returned {res.status_code}")
+                continue
+            bodies.append(res.text)
+        pages = await self._extract_all_async(bodies)
+        if isinstance(pages[0], ParsedPage):
+            self.home_page = pages[0]
+        for page in pages:
+            self._queue_links(page, 0)
+
+        about_pages = self.frontier.take(self.about_pages) if self.has_sitemap else []
+        responses = await asyncio.gather(
+            *(self._get(page, headers=HEADERS) for page in about_pages)
+        )
+        await self._extract_all_async(
+            [res.text for res in responses if res is not None and res.status_code == 200]
+        )
+        # links found on linked pages are queued too, down to max_depth
+        while self.frontier:
+            batch = self.frontier.pop_all()
+            responses = await asyncio.gather(*(self._get(href) for href, _depth in batch))
+            fetched = [
+                (res.text, depth)
+                for (_href, depth), res in zip(batch, responses)
+                if res is not None and res.status_code == 200
+            ]
+            pages = await self._extract_all_async([body for body, _depth in fetched])
+            for page, (_body, depth) in zip(pages, fetched):
+                self._queue_links(page, depth)
+
+        if self.is_react or self.is_vue:
+            await asyncio.to_thread(self.scrape_dynamic, self.url)
+        if len(self.phones) == 0 or len(self.emails) == 0:
+            log_info("Static Scraping didn't return proper results")
+            await asyncio.to_thread(self._fallback_render)
+
+        return self._result()
+
+
+async def scrape_sites_async(
+    sites: Union[Iterable[str], AsyncIterator[str]],
+    concurrency: int = 200,
+    per_host: int = 8,
+    fetcher: Optional[Fetcher] = None,
+    parser: str = "html.parser",
+    browser_pool: Optional[BrowserPool] = None,
+    on_result=None,
+    on_error=None,
+    max_pages: int = 25,
+    max_depth: int = 1,
+    extraction_pool: Optional[ExtractionPool] = None,
+) -> List[Dict]:
+    """
+    Scrape every site on one event loop. `on_result` sees each result as it
+    lands; without one, results are collected and returned. `on_error` gets
+    (site, exception) for sites that failed outright. `sites` may be an
+    async iterator, in which case each site starts as soon as it arrives.
+    """
+    client = AsyncFetcher(
+        concurrency=concurrency,
+        per_host=per_host,
+        cache=fetcher.cache if fetcher else None,
+        negative=fetcher.negative if fetcher else None,
+        scheduler=fetcher.scheduler if fetcher else None,
+        controller=fetcher.controller if fetcher else None,
+        max_body=fetcher.max_body if fetcher else MAX_BODY,
+        dns_cache=fetcher.dns_cache if fetcher else None,
+    )
+    # bound sites in flight too, so a 10k-line file doesn't hold 10k pages at once
+    site_slots = asyncio.Semaphore(concurrency)
+    results = []
+
+    async def scrape(site: str):
+        async with site_slots:
+            try:
+                scraper = AsyncContactScraper(
+                    site,
+                    client,
+                    fetcher=fetcher,
+                    parser=parser,
+                    browser_pool=browser_pool,
+                    max_pages=max_pages,
+                    max_depth=max_depth,
+                    extraction_pool=extraction_pool,
+                )
+                result = await scraper.run_async()
+            except Exception as e:
+                log_error(f"Task failed on {site}: {e}")
+                if on_error:
+                    on_error(site, e)
+                return
+            if on_result:
+                on_result(result)
+            else:
+                results.append(result)
+
+    try:
+        if hasattr(sites, "__aiter__"):
+            tasks = [asyncio.ensure_future(scrape(site)) async for site in sites]
+            await asyncio.gather(*tasks)
+        else:
+            await asyncio.gather(*(scrape(site) for site in sites))
+    finally:
+        await client.close()
+    return results
+
+
+async def iterate_in_thread(items: Iterable[str]) -> AsyncIterator[str]:
+    """Drive a blocking iterator (e.g. MapsScraper.iter_websites) off the event loop."""
+    items = iter(items)
+    done = object()
+    while (item := await asyncio.to_thread(next, items, done)) is not done:
+        yield item
+
+
+def require_aiohttp():
+    if aiohttp is None:
+        raise RuntimeError(
+            "--engine async requires aiohttp "
+            "(pip install aiohttp, or uv sync --extra async)"
+        )
+
+
+def run_async_engine(sites: Union[Iterable[str], AsyncIterator[str]], **kwargs) -> List[Dict]:
+    require_aiohttp()
+    return asyncio.run(scrape_sites_async(sites, **kwargs))
+
+
+# ==============================
+# CLI & Main Runner
+# ==============================
+
+
+# import os
+# import re
+# import json
+# import csv
+from pathlib import Path
+from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import List, Dict
 # 
 # # ← Add these imports if missing
 # from pprint import pprint
@@ -791,6 +3661,294 @@ def save_results(data: List[Dict], filename: str):
         log_error(f"Failed to save results: {e}")
 
 
+# Columns of a result row, in output order
+RESULT_FIELDS = ("website", "emails", "numbers", "truncated", "status")
+
+
+class ResultSink:
+    """
+    Writes each result to disk the moment its site finishes.
+
+    Rows are appended to json_data/<name>.jsonl and csv_data/<name>.csv and
+    flushed right away; the files are also fsync'ed at most every
+    `fsync_every` seconds (0 turns that off), so a crash loses at most the
+    last few rows. The files are created with the first result. With
+    `final_json`, close() also writes the pretty-printed json_data/<name>.json
+    array, streamed back from the JSONL file rather than held in memory. A
+    site written more than once (a failed site retried by --resume) keeps
+    only its last row there; the JSONL/CSV files keep every row.
+    """
+
+    def __init__(self, base_name: str, fsync_every: float = 5.0, final_json: bool = False):
+        output_dir = get_output_dir()
+        self.jsonl_path = output_dir / "json_data" / f"{base_name}.jsonl"
+        self.csv_path = output_dir / "csv_data" / f"{base_name}.csv"
+        self.json_path = output_dir / "json_data" / f"{base_name}.json"
+        self.fsync_every = fsync_every
+        self.final_json = final_json
+        self.count = 0
+        self.lock = threading.Lock()
+        self._jsonl = self._csv = self._writer = None
+        self._last_sync = time.monotonic()
+
+    def _open(self):
+        self.jsonl_path.parent.mkdir(parents=True, exist_ok=True)
+        self.csv_path.parent.mkdir(parents=True, exist_ok=True)
+        self._jsonl = open(self.jsonl_path, "a", encoding="utf-8")
+        new_csv = not self.csv_path.exists() or self.csv_path.stat().st_size == 0
+        self._csv = open(self.csv_path, "a", newline="", encoding="utf-8")
+        self._writer = csv.DictWriter(self._csv, fieldnames=RESULT_FIELDS, extrasaction="ignore")
+        if new_csv:
+            self._writer.writeheader()
+
+    def write(self, result: Dict):
+        with self.lock:
+            if self._jsonl is None:
+                self._open()
+            self._jsonl.write(json.dumps(result, ensure_ascii=False) + "\n")
+            self._writer.writerow(result)
+            self._jsonl.flush()
+            self._csv.flush()
+            self.count += 1
+            if self.fsync_every and time.monotonic() - self._last_sync >= self.fsync_every:
+                self._sync()
+
+    def _sync(self):
+        for f in (self._jsonl, self._csv):
+            os.fsync(f.fileno())
+        self._last_sync = time.monotonic()
+
+    def close(self):
+        with self.lock:
+            if self._jsonl is None:
+                return
+            self._sync()
+            self._jsonl.close()
+            self._csv.close()
+            self._jsonl = None
+            log_info(f"Results saved to {self.jsonl_path}")
+            log_info(f"Results saved to {self.csv_path}")
+            if self.final_json:
+                self._write_json_array()
+
+    def _write_json_array(self):
+        try:
+            # first pass: the line holding each website's latest row
+            last_line: Dict[str, int] = {}
+            with open(self.jsonl_path, encoding="utf-8") as src:
+                for i, line in enumerate(src):
+                    last_line[json.loads(line).get("website")] = i
+            keep = set(last_line.values())
+            with open(self.jsonl_path, encoding="utf-8") as src, open(
+                self.json_path, "w", encoding="utf-8"
+            ) as out:
+                out.write("[")
+                written = 0
+                for i, line in enumerate(src):
+                    if i not in keep:
+                        continue
+                    row = json.dumps(json.loads(line), indent=2, ensure_ascii=False)
+                    out.write(("," if written else "") + "\n  " + row.replace("\n", "\n  "))
+                    written += 1
+                out.write("\n]")
+            log_info(f"Results saved to {self.json_path}")
+        except Exception as e:
+            log_error(f"Failed to save results: {e}")
+
+
+class JobJournal:
+    """
+    Progress of one file/keyword job, so an interrupted run can resume.
+
+    One SQLite file per job under FetchedData/jobs/. Every input URL starts
+    out pending and becomes completed (with its result) or failed (with the
+    error or empty result) as it finishes; `todo()` lists what a resumed
+    run still has to do. The job's settings (mode, output name, ...) are
+    kept alongside so a resume writes into the same result files.
+    """
+
+    PENDING, COMPLETED, FAILED = "pending", "completed", "failed"
+
+    def __init__(self, name: str):
+        self.name = name
+        self.path = self.path_for(name)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.lock = threading.Lock()
+        self.db = sqlite3.connect(str(self.path), check_same_thread=False)
+        self.db.execute("PRAGMA journal_mode=WAL")
+        self.db.execute("CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT)")
+        self.db.execute(
+            """
+            CREATE TABLE IF NOT EXISTS urls (
+                url TEXT PRIMARY KEY,
+                pos INTEGER,
+                status TEXT,
+                attempts INTEGER,
+                error TEXT,
+                result TEXT,
+                updated REAL
+            )
+            """
+        )
+
+    @staticmethod
+    def path_for(name: str) -> Path:
+        return get_output_dir() / "jobs" / f"{name}.sqlite3"
+
+    @staticmethod
+    def key(url: str) -> str:
+        # ContactScraper reports its site without the trailing slash
+        return url.strip().rstrip("/")
+
+    def set_meta(self, **values):
+        with self.lock:
+            self.db.executemany(
+                "INSERT OR REPLACE INTO meta (key, value) VALUES (?, ?)",
+                [(k, json.dumps(v)) for k, v in values.items()],
+            )
+            self.db.commit()
+
+    def meta(self) -> Dict:
+        with self.lock:
+            rows = self.db.execute("SELECT key, value FROM meta").fetchall()
+        return {k: json.loads(v) for k, v in rows}
+
+    def add(self, urls: List[str]):
+        """Register input URLs as pending; ones already journaled keep their state."""
+        with self.lock:
+            start = self.db.execute("SELECT COUNT(*) FROM urls").fetchone()[0]
+            self.db.executemany(
+                "INSERT OR IGNORE INTO urls (url, pos, status, attempts) VALUES (?, ?, ?, 0)",
+                [(self.key(url), start + i, self.PENDING) for i, url in enumerate(urls)],
+            )
+            self.db.commit()
+
+    def todo(self, max_attempts: int) -> List[str]:
+        """Pending URLs plus failed ones that have had fewer than max_attempts tries."""
+        with self.lock:
+            rows = self.db.execute(
+                "SELECT url FROM urls WHERE status = ? OR (status = ? AND attempts < ?)"
+                " ORDER BY pos",
+                (self.PENDING, self.FAILED, max_attempts),
+            ).fetchall()
+        return [url for (url,) in rows]
+
+    def record(self, url: str, result: Optional[Dict] = None, error: Optional[str] = None):
+        status = self.COMPLETED if result is not None and not error else self.FAILED
+        with self.lock:
+            self.db.execute(
+                "UPDATE urls SET status = ?, attempts = attempts + 1, error = ?,"
+                " result = ?, updated = ? WHERE url = ?",
+                (
+                    status,
+                    error,
+                    json.dumps(result, ensure_ascii=False) if result is not None else None,
+                    time.time(),
+                    self.key(url),
+                ),
+            )
+            self.db.commit()
+
+    def counts(self) -> Dict[str, int]:
+        with self.lock:
+            rows = self.db.execute("SELECT status, COUNT(*) FROM urls GROUP BY status").fetchall()
+        return {self.PENDING: 0, self.COMPLETED: 0, self.FAILED: 0, **dict(rows)}
+
+    def reset(self):
+        with self.lock:
+            self.db.execute("DELETE FROM urls")
+            self.db.execute("DELETE FROM meta")
+            self.db.commit()
+
+    def close(self):
+        with self.lock:
+            self.db.close()
+
+
+def site_failed(result: Dict) -> bool:
+    # run() answers with empty lists (not "Not found") when the homepage
+    # could not be fetched at all
+    return result.get("emails") == [] and result.get("numbers") == []
+
+
+def failure_reason(result: Dict) -> Optional[str]:
+    """Journal error for a failed result, None if the site was scraped."""
+    if not site_failed(result):
+        return None
+    return "NXDOMAIN" if result.get("status") == "nxdomain" else "homepage unreachable"
+
+
+def drop_dead_hosts(sites: List[str], dns_cache: DNSCache, workers: int, emit) -> List[str]:
+    """
+    Resolve every site's host up front; emit an "nxdomain" result for the
+    sites whose domain doesn't exist and return the rest.
+    """
+    hosts = {site: (urlparse(with_scheme(site)).hostname or "") for site in sites}
+    started = time.monotonic()
+    dead = dns_cache.prefetch(list(hosts.values()), workers=workers)
+    log_info(
+        f"Resolved {len(set(hosts.values()))} hosts in {time.monotonic() - started:.1f}s, "
+        f"{len(dead)} don't exist"
+    )
+    alive = []
+    for site in sites:
+        if hosts[site] in dead:
+            emit(failed_result(site, status="nxdomain"))
+        else:
+            alive.append(site)
+    return alive
+
+
+def harvest_sites(
+    urls: Iterable[str],
+    aliases: SiteAliases,
+    dns_cache: Optional[DNSCache],
+    write,
+    on_input=None,
+) -> Iterator[str]:
+    """
+    Yield the streamed input URLs that need scraping, as they arrive.
+    `on_input` sees every input URL first; URLs on dead domains get an
+    "nxdomain" row from `write` straight away, and aliases of a site already
+    taken are folded into it.
+    """
+    for url in urls:
+        if on_input:
+            on_input(url)
+        host = urlparse(with_scheme(url)).hostname
+        if dns_cache and host and not dns_cache.exists(host):
+            write(failed_result(url, status="nxdomain"))
+            continue
+        site, rows = aliases.add(url)
+        for row in rows:
+            write(row)
+        if site:
+            yield site
+
+
+def file_job_name(path: str) -> str:
+    """Stable job name for a URL file, so the same file resumes the same job."""
+    stem = re.sub(r"[^\w.-]", "_", Path(path).stem)
+    digest = hashlib.sha1(str(Path(path).resolve()).encode()).hexdigest()[:8]
+    return f"file_{stem}_{digest}"
+
+
+def output_name(args) -> str:
+    """Base name of the result files for this invocation."""
+    if args.keywords:
+        timestamp = datetime.now().strftime("%Y-%m-%d_%H:%M:%S")
+        safe_kw = re.sub(r"[^\w\-_]", "_", args.keywords)
+        return f"contacts_[{safe_kw}]_{timestamp}"
+    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+    if args.file:
+        # Use only the filename, not the full path
+        input_filename = Path(args.file).stem  # ← "Schools in Kathmandu-123"
+        safe_name = re.sub(r"[^\w\s.-]", "", input_filename)   # keep spaces & dots
+        safe_name = re.sub(r"\s+", "_", safe_name.strip())     # collapse spaces
+        return f"contacts_{safe_name}_{timestamp}"
+    return f"contacts_[single]_{timestamp}"
+
+
 # def save_results(data: List[Dict], filename: str):
 #     dirs_to_create = ["json_data", "csv_data"]
 #     for folder in dirs_to_create:
@@ -829,6 +3987,19 @@ def main():
         "--file",
         help="Scrapes websites in the file containing URLs in each new line",
     )
+    group.add_argument(
+        "--resume",
+        metavar="JOB",
+        help="Continue an interrupted -f/-k job: skip finished URLs and\n"
+        "retry failed ones (see --max-attempts)",
+    )
+    parser.add_argument(
+        "--max-attempts",
+        type=int,
+        default=3,
+        help="With --resume, retry a failed URL until it has had this many\n"
+        "tries (default: 3)",
+    )
     parser.add_argument(
         "-n",
         "--number",
@@ -837,91 +4008,430 @@ def main():
         help="Number of sites to scrape (default: 4)",
     )
     parser.add_argument(
-        "-l", "--log", action="store_true", help="Save output to JSON file"
+        "-l",
+        "--log",
+        action="store_true",
+        help="Save results to JSONL and CSV files as each site finishes",
+    )
+    parser.add_argument(
+        "--final-json",
+        action="store_true",
+        help="With -l, also write one pretty-printed JSON array at the end",
+    )
+    parser.add_argument(
+        "--fsync",
+        type=float,
+        default=5,
+        help="With -l, fsync the result files at most every N seconds\n"
+        "(default: 5, 0 leaves it to the OS)",
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        help="Sites scraped in parallel by the threads engine\n"
+        "(default: 13 for -k, 12 for -f); per-host rate limits keep\n"
+        "higher values polite",
+    )
+    parser.add_argument(
+        "--host-rate",
+        type=float,
+        default=5,
+        help="Requests per second to one host (default: 5)",
+    )
+    parser.add_argument(
+        "--ip-rate",
+        type=float,
+        default=20,
+        help="Requests per second to one server IP, shared by every site\n"
+        "hosted on it (default: 20)",
+    )
+    parser.add_argument(
+        "--adaptive",
+        action="store_true",
+        help="Adapt requests in flight to the link (AIMD on latency and\n"
+        "error rate) instead of relying on fixed worker counts",
+    )
+    parser.add_argument(
+        "--max-inflight",
+        type=int,
+        default=512,
+        help="Upper bound for --adaptive (default: 512)",
+    )
+    parser.add_argument(
+        "--pool-hosts",
+        type=int,
+        default=100,
+        help="Hosts to keep keep-alive connection pools for (default: 100)",
+    )
+    parser.add_argument(
+        "--pool-size",
+        type=int,
+        default=10,
+        help="Keep-alive connections per host (default: 10)",
+    )
+    parser.add_argument(
+        "--per-host",
+        type=int,
+        default=4,
+        help="Max concurrent requests to one host (default: 4)",
+    )
+    parser.add_argument(
+        "--fanout",
+        type=int,
+        default=64,
+        help="Threads for a site's parallel probe requests, shared by all\n"
+        "sites (default: 64)",
+    )
+    parser.add_argument(
+        "--engine",
+        choices=["threads", "async"],
+        default="threads",
+        help="threads: one worker thread per site (default)\n"
+        "async: every site's requests on one asyncio loop (needs aiohttp)",
+    )
+    parser.add_argument(
+        "--concurrency",
+        type=int,
+        default=200,
+        help="Requests in flight for --engine async (default: 200)",
+    )
+    parser.add_argument(
+        "--parser",
+        choices=list(PARSER_BACKENDS),
+        default="html.parser",
+        help="HTML parser backend (default: html.parser)\n"
+        "lxml / selectolax are C parsers and much faster on big pages",
+    )
+    parser.add_argument(
+        "--parse-workers",
+        type=int,
+        default=0,
+        help="Parse and extract pages in this many worker processes, apart\n"
+        "from the fetch threads/event loop (default: 0, parse in the\n"
+        "fetching thread). Fetch concurrency stays --workers/--concurrency",
+    )
+    parser.add_argument(
+        "--browsers",
+        type=int,
+        default=2,
+        help="Headless Firefox instances shared by all workers for\n"
+        "React/Vue rendering (default: 2)",
+    )
+    parser.add_argument(
+        "--browser-recycle",
+        type=int,
+        default=50,
+        help="Pages a browser renders before it is restarted (default: 50)",
+    )
+    parser.add_argument(
+        "--render-timeout",
+        type=float,
+        default=10,
+        help="Max seconds to load and wait for one rendered page (default: 10)",
+    )
+    parser.add_argument(
+        "--render-threshold",
+        type=float,
+        default=0.5,
+        help="Score a site needs before static results that came up short\n"
+        "fall back to a browser render; lower renders more (default: 0.5)",
+    )
+    parser.add_argument(
+        "--max-pages",
+        type=int,
+        default=25,
+        help="Most linked about/contact pages fetched per site (default: 25)",
+    )
+    parser.add_argument(
+        "--max-depth",
+        type=int,
+        default=1,
+        help="How many links deep to follow about/contact links from the\n"
+        "homepage (default: 1, links on the homepage only)",
+    )
+    parser.add_argument(
+        "--full-render",
+        action="store_true",
+        help="Let rendered pages load images, media, fonts and trackers\n"
+        "(blocked by default)",
+    )
+    parser.add_argument(
+        "--block-hosts",
+        default="",
+        help="Extra comma-separated hosts to block while rendering",
+    )
+    parser.add_argument(
+        "--allow-hosts",
+        default="",
+        help="Comma-separated hosts never blocked while rendering",
+    )
+    parser.add_argument(
+        "--cache",
+        action="store_true",
+        help="Keep fetched pages in an on-disk cache (FetchedData/http_cache)\n"
+        "and revalidate them with ETag/Last-Modified on later runs;\n"
+        "also remembers 404 probe paths and dead hosts (with backoff)",
+    )
+    parser.add_argument(
+        "--cache-ttl",
+        type=float,
+        default=168,
+        help="Hours a cached page is reused without revalidation (default: 168)",
+    )
+    parser.add_argument(
+        "--cache-size",
+        type=int,
+        default=2048,
+        help="Maximum cache size in MB, least recently used pages go first (default: 2048)",
+    )
+    parser.add_argument(
+        "--dns-workers",
+        type=int,
+        default=32,
+        help="Resolve every host of the job up front, this many at a time,\n"
+        "and cache the answers in-process; sites whose domain doesn't\n"
+        "exist are reported as \"nxdomain\" without being fetched\n"
+        "(default: 32, 0 = use the system resolver per connection)",
+    )
+    parser.add_argument(
+        "--dns-ttl",
+        type=float,
+        default=300,
+        help="Seconds to keep a DNS answer when its record TTL is unknown\n"
+        "(without dnspython installed) (default: 300)",
+    )
+    parser.add_argument(
+        "--max-body",
+        type=float,
+        default=MAX_BODY / (1 << 20),
+        help="Read at most this many MB of a page; longer pages are cut off\n"
+        "and flagged \"truncated\" in the results (default: 5)",
     )
     args = parser.parse_args()
-    results = []
-    if args.url:
-        scraper = ContactScraper(args.url)
-        result = scraper.run()
-        results.append(result)
-        pprint(result)
-    elif args.keywords:
-        maps = MapsScraper(args.keywords, limit=args.number)
-        websites = maps.run()
-        if not websites:
-            log_error("No websites found.")
+    try:
+        get_page_class(args.parser)
+        if args.engine == "async":
+            require_aiohttp()
+    except RuntimeError as e:
+        log_error(str(e))
+        return
+    # file/keyword jobs are journaled so that --resume can pick them up
+    journal = None
+    name = output_name(args)
+    mode, log_results, final_json = None, args.log, args.final_json
+    if args.resume:
+        if not JobJournal.path_for(args.resume).exists():
+            log_error(f"No job {args.resume} in {get_output_dir() / 'jobs'}")
             return
-        results = []
-        MAX_WORKERS = 13  # Tune: 5–15 safe for most home IPs
+        journal = JobJournal(args.resume)
+        meta = journal.meta()
+        mode, name = meta["mode"], meta["output"]
+        log_results, final_json = meta["log"], meta["final_json"]
+    elif args.keywords or args.file:
+        mode = "keywords" if args.keywords else "file"
+        journal = JobJournal(name)
+        journal.set_meta(
+            mode=mode,
+            source=args.keywords or args.file,
+            output=name,
+            log=args.log,
+            final_json=args.final_json,
+        )
+        log_info(f"Job {name} (continue it later with --resume {name})")
+    # One pooled session shared by every worker thread
+    cache = negative = None
+    if args.cache:
+        cache = ResponseCache(
+            get_output_dir() / "http_cache" / "responses.sqlite3",
+            ttl=args.cache_ttl * 3600,
+            max_bytes=args.cache_size * 1024 * 1024,
+        )
+        negative = NegativeCache(get_output_dir() / "http_cache" / "failures.sqlite3")
+    controller = AIMDController(max_limit=args.max_inflight) if args.adaptive else None
+    dns_cache = DNSCache(ttl=args.dns_ttl) if args.dns_workers > 0 else None
+    fetcher = Fetcher(
+        pool_connections=args.pool_hosts,
+        pool_maxsize=args.pool_size,
+        cache=cache,
+        negative=negative,
+        per_host=args.per_host,
+        # enough threads that the controller, not the pool, is the cap
+        fanout_workers=max(args.fanout, args.max_inflight) if args.adaptive else args.fanout,
+        controller=controller,
+        max_body=int(args.max_body * (1 << 20)),
+        scheduler=HostScheduler(
+            host_rate=args.host_rate,
+            host_burst=max(1, round(args.host_rate * 2)),
+            ip_rate=args.ip_rate,
+            ip_burst=max(1, round(args.ip_rate * 2)),
+            dns_cache=dns_cache,
+        ),
+        dns_cache=dns_cache,
+    )
+    profile = RenderProfile(
+        block_types=() if args.full_render else RenderProfile.BLOCK_TYPES,
+        trackers=not args.full_render,
+        deny=[h.strip() for h in args.block_hosts.split(",") if h.strip()],
+        allow=[h.strip() for h in args.allow_hosts.split(",") if h.strip()],
+    )
+    browser_pool = BrowserPool(
+        size=args.browsers,
+        max_pages=args.browser_recycle,
+        render_timeout=args.render_timeout,
+        profile=profile,
+        threshold=args.render_threshold,
+        history=RenderHistory(get_output_dir() / "http_cache" / "renders.sqlite3")
+        if args.cache
+        else None,
+    )
+    sink = None
+    if log_results:
+        sink = ResultSink(name, fsync_every=args.fsync, final_json=final_json)
+    extraction_pool = None
+    if args.parse_workers > 0:
+        get_page_class(args.parser)  # fail here, not in every worker
+        extraction_pool = ExtractionPool(args.parse_workers, parser=args.parser)
 
-        def subscraper(site: str):
-            try:
-                scraper = ContactScraper(site)
-                result = scraper.run()
-                results.append(result)
-                pprint(result)
-                # time.sleep(0.8) # Be nice to servers
-            except Exception as e:
-                log_error(f"Thread failed on {site}: {e}")
+    progress = {"done": 0, "total": 1}
+    progress_lock = threading.Lock()
 
-        # THREAD POOL (fast, clean, auto-join)
-        with ThreadPoolExecutor(max_workers=MAX_WORKERS) as executor:
-            executor.map(subscraper, websites)
-        # SAVE AFTER ALL DONE
-        if args.log and results:
-            timestamp = datetime.now().strftime("%Y-%m-%d_%H:%M:%S")
-            safe_kw = re.sub(r"[^\w\-_]", "_", args.keywords)
-            filename = f"contacts_[{safe_kw}]_{timestamp}.json"
-            save_results(results, filename)
-    elif args.file:
-        maps = MapsScraper("", inpfile=args.file)
-        websites = maps.websites
-        if not websites:
-            log_error("No websites found.")
-            return
-        results = []
-        MAX_WORKERS = 12  # Tune: 5–15 safe for most home IPs
+    def report_progress():
+        with progress_lock:
+            progress["done"] += 1
+            status = f"Progress: {progress['done']}/{progress['total']} sites"
+        if controller:
+            status += f", in-flight limit {controller.limit}"
+        log_info(status)
+
+    # scraped site -> the input URLs it stands for
+    aliases = SiteAliases()
+
+    def write(result: Dict):
+        pprint(result)
+        if sink:
+            sink.write(result)
+        report_progress()
+        if journal:
+            journal.record(result["website"], result, error=failure_reason(result))
+
+    def emit(result: Dict):
+        for row in aliases.finish(result):
+            write(row)
+
+    def record_failure(site: str, e: Exception):
+        for alias in aliases.names(site):
+            report_progress()
+            if journal:
+                journal.record(alias, error=str(e))
+
+    engine_opts = {
+        "fetcher": fetcher,
+        "parser": args.parser,
+        "browser_pool": browser_pool,
+        "concurrency": max(args.concurrency, args.max_inflight)
+        if args.adaptive
+        else args.concurrency,
+        "per_host": args.per_host,
+        "on_result": emit,
+        "on_error": record_failure,
+        "max_pages": args.max_pages,
+        "max_depth": args.max_depth,
+        "extraction_pool": extraction_pool,
+    }
+    if args.url and args.engine == "async":
+        run_async_engine([args.url], **engine_opts)
+    elif args.url:
+        scraper = ContactScraper(
+            args.url,
+            fetcher=fetcher,
+            parser=args.parser,
+            browser_pool=browser_pool,
+            max_pages=args.max_pages,
+            max_depth=args.max_depth,
+            extraction_pool=extraction_pool,
+        )
+        emit(scraper.run())
+    else:
+        if args.resume:
+            sites = journal.todo(args.max_attempts)
+            log_info(f"Resuming {args.resume}: {len(sites)} URLs left")
+        elif args.keywords:
+            # scrape each Maps result while the feed is still scrolling
+            maps = MapsScraper(args.keywords, limit=args.number, profile=profile)
+            progress["total"] = 0
+
+            def add_input(url: str):
+                journal.add([url])
+                with progress_lock:
+                    progress["total"] += 1
+
+            sites = harvest_sites(maps.iter_websites(), aliases, dns_cache, write, add_input)
+        else:
+            maps = MapsScraper("", inpfile=args.file)
+            websites = maps.websites
+            if not websites:
+                log_error("No websites found.")
+                return
+            sites = list(websites)
+        if isinstance(sites, list):
+            if not args.resume:
+                journal.add(sites)
+            progress["total"] = len(sites)
+            if dns_cache:
+                sites = drop_dead_hosts(sites, dns_cache, args.dns_workers, emit)
+            # scrape each site once, however many aliases the input has for it
+            aliases.update(group_site_aliases(sites, fetcher))
+            sites = list(aliases.groups)
+        MAX_WORKERS = args.workers or (13 if mode == "keywords" else 12)
+        if controller and not args.workers:
+            # sites mostly wait on the controller's gate; keep enough queued
+            MAX_WORKERS = max(MAX_WORKERS, args.max_inflight // 8)
 
         def subscraper(site: str):
-            site = site.strip()
             try:
-                if site:
-                    scraper = ContactScraper(site)
-                    result = scraper.run()
-                    results.append(result)
-                    pprint(result)
+                scraper = ContactScraper(
+                    site,
+                    fetcher=fetcher,
+                    parser=args.parser,
+                    browser_pool=browser_pool,
+                    max_pages=args.max_pages,
+                    max_depth=args.max_depth,
+                    extraction_pool=extraction_pool,
+                )
+                emit(scraper.run())
                 # time.sleep(0.8) # Be nice to servers
             except Exception as e:
                 log_error(f"Thread failed on {site}: {e}")
+                record_failure(site, e)
+
+        if args.engine == "async":
+            if not isinstance(sites, list):
+                sites = iterate_in_thread(sites)
+            run_async_engine(sites, **engine_opts)
+        else:
+            # THREAD POOL (fast, clean, auto-join); map submits each site as
+            # soon as it's yielded, so streamed Maps results start right away
+            with ThreadPoolExecutor(max_workers=MAX_WORKERS) as executor:
+                executor.map(subscraper, sites)
+        if args.keywords and not args.resume and not progress["total"]:
+            log_error("No websites found.")
+        counts = journal.counts()
+        log_info(
+            f"Job {journal.name}: {counts['completed']} completed, "
+            f"{counts['failed']} failed, {counts['pending']} pending"
+        )
+        journal.close()
 
-        # THREAD POOL (fast, clean, auto-join)
-        with ThreadPoolExecutor(max_workers=MAX_WORKERS) as executor:
-            executor.map(subscraper, websites)
-        # SAVE AFTER ALL DONE
-        if args.log and results:
-            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        
-            # Use only the filename, not the full path
-            input_filename = Path(args.file).stem  # ← "Schools in Kathmandu-123"
-        
-            # Clean it safely
-            safe_name = re.sub(r"[^\w\s.-]", "", input_filename)   # keep spaces & dots
-            safe_name = re.sub(r"\s+", "_", safe_name.strip())     # collapse spaces
-        
-            filename = f"contacts_{safe_name}_{timestamp}"
-            save_results(results, filename)
-            # timestamp = datetime.now().strftime("%Y-%m-%d_%H:%M:%S")
-            # safe_kw = re.sub(r"[^\w\-_]", "_", args.file)
-            # filename = f"contacts_[{safe_kw}]_{timestamp}.json"
-            # save_results(results, filename)
-
-    if args.log and results and args.url:
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        keyword_part = args.keywords.replace(" ", "_") if args.keywords else "single"
-        filename = f"contacts_[{keyword_part}]_{timestamp}"
-        save_results(results, filename)
+    if sink:
+        sink.close()
+    if extraction_pool:
+        extraction_pool.close()
+    browser_pool.close()
+    fetcher.close()
 
 
 if __name__ == "__main__":
+    # frozen (pyinstaller/nuitka) builds: a spawned ExtractionPool worker
+    # must run the pool's task, not the CLI again
+    multiprocessing.freeze_support()
     main()
@@ -0,0 +1,109 @@
+import itertools
+
+import pytest
+
+import scraper_v3
+from scraper_v3 import BrowserPool
+
+
+class FakeFirefox:
+    """Just enough of webdriver.Firefox (classic + BiDi) for BrowserPool."""
+
+    ids = itertools.count()
+
+    def __init__(self, options=None):
+        self.options = options
+        self.dead = False
+        self.quit_called = False
+        self.handle = "home"
+        self.contexts = {}  # live user context -> its tab
+        self.removed = []
+        self.browser = self
+        self.browsing_context = self
+        self.switch_to = self
+
+    def _command(self):
+        if self.dead:
+            raise ConnectionRefusedError("geckodriver is gone")
+
+    @property
+    def current_window_handle(self):
+        self._command()
+        return self.handle
+
+    # driver.browser
+    def create_user_context(self):
+        self._command()
+        user_context = f"uc{next(self.ids)}"
+        self.contexts[user_context] = None
+        return user_context
+
+    def remove_user_context(self, user_context):
+        self._command()
+        del self.contexts[user_context]
+        self.removed.append(user_context)
+
+    # driver.browsing_context
+    def create(self, type, user_context=None):
+        self._command()
+        tab = f"tab-{user_context}"
+        self.contexts[user_context] = tab
+        return tab
+
+    # driver.switch_to
+    def window(self, handle):
+        self._command()
+        if handle is None:
+            raise ValueError("no such window")
+        self.handle = handle
+
+    def quit(self):
+        self.quit_called = True
+
+
+@pytest.fixture
+def launched(monkeypatch):
+    drivers = []
+
+    def firefox(options=None):
+        drivers.append(FakeFirefox(options))
+        return drivers[-1]
+
+    monkeypatch.setattr(scraper_v3.webdriver, "Firefox", firefox)
+    return drivers
+
+
+def test_each_job_gets_its_own_user_context(launched):
+    pool = BrowserPool(size=1)
+    assert pool.options.enable_bidi
+    seen = []
+    for _ in range(2):
+        with pool.session() as driver:
+            seen.append(driver.current_window_handle)
+            assert len(driver.contexts) == 1
+        assert driver.contexts == {}
+        assert driver.current_window_handle == "home"
+    assert len(launched) == 1
+    assert seen[0] != seen[1]
+    assert len(launched[0].removed) == 2
+
+
+def test_dead_idle_driver_is_replaced_at_checkout(launched):
+    pool = BrowserPool(size=1)
+    with pool.session():
+        pass
+    launched[0].dead = True
+    with pool.session() as driver:
+        assert driver is launched[1]
+    assert launched[0].quit_called
+    assert pool._served == {id(launched[1]): 1}
+
+
+def test_driver_failing_on_return_is_quit(launched):
+    pool = BrowserPool(size=1)
+    with pool.session() as driver:
+        driver.dead = True
+    assert driver.quit_called
+    assert pool._idle == []
+    with pool.session() as driver:
+        assert driver is launched[1]
@@ -0,0 +1,78 @@
+"""ContactMatcher must report exactly what the Patterns regexes find on the whole text."""
+import random
+
+import pytest
+
+from scraper_v3 import ContactMatcher, Patterns
+
+PHONE_PATTERNS = (
+    Patterns.PHONE_NP,
+    Patterns.NEW_PHONE_NP,
+    Patterns.NEW_NEW_PHONE_NP,
+    Patterns.OTHER_PHONE_NP,
+)
+EMAIL_PATTERNS = (Patterns.EMAIL, Patterns.EMAIL_STRICT)
+
+CORPUS = [
+    "",
+    "no contact details here",
+    "Phone: 01-4261234, 9841234567",
+    "Call us: 980 123 4567 or +977-1-4261234",
+    "Tel. 061-531234 | Fax 061 531 235",
+    "Mobile: 9841-234-567 / 9851012345",
+    "+977 98 4123 4567 and 977-9801234567",
+    "Landline 021-525252, 023.456789, 0101234567",
+    "Contact: 061-531234 | office (at) testschool.edu.np",
+    "Email us at admin@testschool.edu.np or info [at] school.org",
+    "mailto:Info@Example.COM?subject=hi",
+    "a@b.c x@y.io first.last+tag@sub.example.co.uk",
+    "1234 12345 123456 1234567 12345678 123456789 1234567890",
+    "2024-01-15 12:30 ID 98412345678901234",
+    "01-4261234\n01 4261234\t01.4261234",
+    "+ + 9 8 4 1 2 3 4 5 6 7",
+    "9841234567Email 014261234Contact",
+    "०१-४२६१२३४ (Devanagari digits)",
+]
+
+ALPHABET = "0123456789" * 4 + " -.+\t\n" * 2 + "abcxyzEMAIL@()[]:,/"
+TOKENS = ["977", "+977", "01", "98", "97", "at", "[at]", "(at)", "@", ".com", ".np", "mail", "info"]
+
+
+def random_strings(count, seed=20260418):
+    rng = random.Random(seed)
+    for _ in range(count):
+        parts = []
+        for _ in range(rng.randint(1, 12)):
+            if rng.random() < 0.3:
+                parts.append(rng.choice(TOKENS))
+            else:
+                parts.append("".join(rng.choice(ALPHABET) for _ in range(rng.randint(1, 12))))
+        yield "".join(parts)
+
+
+def reference_scan(text):
+    found = []
+    for pattern in PHONE_PATTERNS:
+        for match in pattern.finditer(text):
+            found.append(("phone", match.group(), match.span()))
+    for pattern in EMAIL_PATTERNS:
+        for match in pattern.finditer(text):
+            found.append(("email", match.group(), match.span()))
+    return sorted(found)
+
+
+def check(matcher, text):
+    assert sorted(matcher.scan(text)) == reference_scan(text), text
+    assert matcher.has_phone(text) == any(p.search(text) for p in PHONE_PATTERNS), text
+    assert matcher.has_email(text) == any(p.search(text) for p in EMAIL_PATTERNS), text
+
+
+@pytest.mark.parametrize("text", CORPUS)
+def test_matches_patterns_on_corpus(text):
+    check(ContactMatcher(), text)
+
+
+def test_matches_patterns_on_random_strings():
+    matcher = ContactMatcher()
+    for text in random_strings(5000):
+        check(matcher, text)
@@ -0,0 +1,52 @@
+import pytest
+
+from scraper_v3 import PARSER_BACKENDS, ContactExtractor, get_page_class
+
+
+def extractor(parser):
+    try:
+        get_page_class(parser)
+    except RuntimeError as e:
+        pytest.skip(str(e))
+    return ContactExtractor(parser)
+
+
+@pytest.mark.parametrize("parser", list(PARSER_BACKENDS))
+@pytest.mark.parametrize(
+    "html, phones, emails",
+    [
+        # numbers and keywords split across inline tags
+        ("<p>Phone: <b>01</b>-4261234</p>", {"014261234"}, set()),
+        ("<div>Contact <span>9841</span> <span>234567</span></div>", {"09841234567"}, set()),
+        ("<div><b>Con</b>tact: 9841234567</div>", {"09841234567"}, set()),
+        # block text glued to the next tag's text
+        (
+            "<div><section><p>Phone: 01-4261234, 9841234567</p>"
+            "<span>Email us at admin@school.edu.np</span></section></div>",
+            {"014261234", "09841234567"},
+            {"admin@school.edu.np"},
+        ),
+        ("<div><p>Call us: 980 123 4567</p><p>contact: hello@school.edu.np</p></div>",
+         {"09801234567"}, {"hello@school.edu.np"}),
+        # adjacent numeric text nodes
+        ("<div>Phone <span>01</span><span>4261234</span></div>", {"014261234"}, set()),
+        ("<p>Call <b>98</b>41234567</p>", {"09841234567"}, set()),
+        (
+            "<div>Contact: <span>9841234567</span><span>9851012345</span></div>",
+            {"09841234567", "09851012345"},
+            set(),
+        ),
+        (
+            "<div>Contact<table><tr><td>9841234567</td><td>9851012345</td></tr></table></div>",
+            {"09841234567", "09851012345"},
+            set(),
+        ),
+        # no keyword, not a contact region
+        ("<li>nothing here 9841234567</li>", set(), set()),
+    ],
+)
+def test_contact_sections(parser, html, phones, emails):
+    contacts = extractor(parser)
+    contacts.extract_from_contact_sections(f"<html><body>{html}</body></html>")
+    assert contacts.phones == phones
+    assert contacts.emails == emails
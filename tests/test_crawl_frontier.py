@@ -0,0 +1,29 @@
+from scraper_v3 import CrawlFrontier
+
+
+def test_sitemap_pages_share_the_link_budget():
+    frontier = CrawlFrontier(max_pages=3, max_depth=1)
+    for i in range(5):
+        frontier.add(f"http://x.com/contact-{i}", 1, 0)
+    taken = frontier.take([f"http://x.com/about-{i}" for i in range(2)])
+    assert taken == ["http://x.com/about-0", "http://x.com/about-1"]
+    assert frontier.pop_all() == [("http://x.com/contact-0", 1)]
+    assert frontier.fetched == 3
+    assert frontier.take(["http://x.com/about-9"]) == []
+
+
+def test_take_skips_seen_pages():
+    frontier = CrawlFrontier(max_pages=5)
+    frontier.claim("http://x.com/about")
+    assert frontier.take(["http://x.com/about/", "http://www.x.com/team?utm_source=a"]) == [
+        "http://www.x.com/team?utm_source=a"
+    ]
+    assert frontier.fetched == 1
+
+
+def test_queue_keeps_best_links_within_budget():
+    frontier = CrawlFrontier(max_pages=2)
+    frontier.add("http://x.com/about", 1, 2)
+    frontier.add("http://x.com/contact", 1, 0)
+    frontier.add("http://x.com/team", 1, 1)
+    assert [url for url, _depth in frontier.pop_all()] == ["http://x.com/contact", "http://x.com/team"]
@@ -0,0 +1,71 @@
+import socket
+import types
+
+import pytest
+
+import scraper_v3
+from scraper_v3 import DNSCache
+
+
+class DNSException(Exception):
+    pass
+
+
+class NXDOMAIN(DNSException):
+    pass
+
+
+class NoAnswer(DNSException):
+    pass
+
+
+class Timeout(DNSException):
+    pass
+
+
+class Answer(list):
+    def __init__(self, ips, ttl):
+        super().__init__(types.SimpleNamespace(address=ip) for ip in ips)
+        self.rrset = types.SimpleNamespace(ttl=ttl)
+
+
+def fake_dns(answers):
+    """A stand-in for dnspython whose resolve() replays `answers[rdtype]`."""
+
+    def resolve(host, rdtype):
+        answer = answers[rdtype]
+        if isinstance(answer, Exception):
+            raise answer
+        return Answer(*answer)
+
+    return types.SimpleNamespace(
+        resolver=types.SimpleNamespace(resolve=resolve, NXDOMAIN=NXDOMAIN, NoAnswer=NoAnswer),
+        exception=types.SimpleNamespace(DNSException=DNSException),
+    )
+
+
+@pytest.fixture
+def use_dns(monkeypatch):
+    def install(answers):
+        monkeypatch.setattr(scraper_v3, "dns", fake_dns(answers))
+
+    return install
+
+
+def test_a_records_survive_an_aaaa_timeout(use_dns):
+    use_dns({"A": (["192.0.2.1"], 600), "AAAA": Timeout("timed out")})
+    assert DNSCache().lookup("example.com") == ["192.0.2.1"]
+
+
+def test_aaaa_records_survive_an_a_timeout(use_dns):
+    use_dns({"A": Timeout("timed out"), "AAAA": (["2001:db8::1"], 600)})
+    assert DNSCache().lookup("example.com") == ["2001:db8::1"]
+
+
+def test_both_timeouts_are_temporary_failures(use_dns):
+    use_dns({"A": Timeout("timed out"), "AAAA": Timeout("timed out")})
+    cache = DNSCache()
+    with pytest.raises(socket.gaierror) as failure:
+        cache.lookup("example.com")
+    assert failure.value.errno == socket.EAI_AGAIN
+    assert not cache.is_dead("example.com")  # not cached as NXDOMAIN
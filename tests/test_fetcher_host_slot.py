@@ -0,0 +1,74 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from scraper_v3 import Fetcher
+
+
+class SlowBody(BaseHTTPRequestHandler):
+    """Sends headers at once, then dribbles the body; tracks peak concurrency."""
+
+    active = 0
+    peak = 0
+    lock = threading.Lock()
+
+    def do_GET(self):
+        cls = type(self)
+        with cls.lock:
+            cls.active += 1
+            cls.peak = max(cls.peak, cls.active)
+        self.send_response(200)
+        self.send_header("Content-Type", "text/html")
+        self.send_header("Content-Length", str(4 * len(b"<p>chunk</p>")))
+        self.end_headers()
+        for _ in range(3):
+            self.wfile.write(b"<p>chunk</p>")
+            self.wfile.flush()
+            time.sleep(0.05)
+        # Done before the last chunk goes out, so the client can't be ahead.
+        with cls.lock:
+            cls.active -= 1
+        self.wfile.write(b"<p>chunk</p>")
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def server():
+    SlowBody.active = SlowBody.peak = 0
+    httpd = ThreadingHTTPServer(("127.0.0.1", 0), SlowBody)
+    thread = threading.Thread(target=httpd.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{httpd.server_port}"
+    httpd.shutdown()
+    httpd.server_close()
+
+
+def test_per_host_limits_body_downloads(server):
+    fetcher = Fetcher(per_host=1)
+    try:
+        with ThreadPoolExecutor(4) as pool:
+            results = list(
+                pool.map(lambda i: fetcher.get(f"{server}/p{i}", timeout=5), range(4))
+            )
+    finally:
+        fetcher.close()
+    assert all(r.status_code == 200 for r in results)
+    assert SlowBody.peak == 1
+
+
+def test_slot_released_after_each_response(server):
+    fetcher = Fetcher(per_host=1)
+    try:
+        for i in range(3):
+            assert fetcher.get(f"{server}/p{i}", timeout=5).status_code == 200
+        assert fetcher.stream(f"{server}/s", lambda chunk: False, timeout=5) == 200
+        slot = fetcher._host_slot(f"{server}/")
+        assert slot.acquire(timeout=1)
+        slot.release()
+    finally:
+        fetcher.close()
@@ -0,0 +1,48 @@
+from scraper_v3 import HostScheduler
+
+URL = "http://x.com/contact"
+
+
+def interval(scheduler):
+    return scheduler._hosts["x.com"].interval
+
+
+def end_pause(scheduler):
+    scheduler._hosts["x.com"].paused_until = 0.0
+
+
+def test_burst_of_429s_halves_the_rate_once():
+    scheduler = HostScheduler(host_rate=5.0)
+    for _ in range(10):
+        assert scheduler.throttle(URL, 429, "60") == 60
+    assert interval(scheduler) == 0.4
+
+
+def test_slowdown_is_capped():
+    scheduler = HostScheduler(host_rate=5.0)
+    for _ in range(20):
+        scheduler.throttle(URL, 429, "1")
+        end_pause(scheduler)
+    assert interval(scheduler) == HostScheduler.MAX_SLOWDOWN / 5.0
+
+
+def test_healthy_answers_restore_the_configured_rate():
+    scheduler = HostScheduler(host_rate=5.0)
+    for _ in range(3):
+        scheduler.throttle(URL, 429, "1")
+        end_pause(scheduler)
+    assert interval(scheduler) == 1.6
+    assert scheduler.throttle(URL, 200, None) is None
+    assert interval(scheduler) == 0.8
+    scheduler.throttle(URL, 500, None)  # still struggling: no recovery
+    assert interval(scheduler) == 0.8
+    for _ in range(5):
+        scheduler.throttle(URL, 404, None)
+    assert interval(scheduler) == 0.2
+
+
+def test_no_recovery_while_paused():
+    scheduler = HostScheduler(host_rate=5.0)
+    scheduler.throttle(URL, 429, "60")
+    scheduler.throttle(URL, 200, None)
+    assert interval(scheduler) == 0.4
@@ -0,0 +1,168 @@
+"""KeywordAutomaton and the area-code trie must agree with the scans they replaced."""
+import random
+import re
+
+import pytest
+
+import scraper_v3
+from scraper_v3 import (
+    CONTACT_KEYWORDS,
+    REACT_INDICATORS,
+    VUE_INDICATORS,
+    KeywordAutomaton,
+    Patterns,
+    _AREA_CODE_PATTERN,
+    _VALID_AREA_CODES,
+)
+
+# the Vue checks as they were before the automaton
+VUE_REGEXES = [
+    r"__vue__",
+    r"data-v-",
+    r"_v-",
+    r"vue\.min\.js",
+    r"vue\.global\.prod\.js",
+    r"__vue_app__",
+    r"__VUE__",
+    r"@vue/runtime-core",
+    r"runtime-dom",
+    r"Vue\.config",
+    r"vue-devtools",
+    r'id="app"',
+]
+GROUPS = {"contact": CONTACT_KEYWORDS, "react": REACT_INDICATORS, "vue": VUE_INDICATORS}
+
+CORPUS = [
+    "",
+    "<div id=\"root\"></div><script src=\"react-dom.production.min.js\"></script>",
+    "<div ID=\"ROOT\" data-reactroot></div>",
+    "<div id=\"app\" data-v-1a2b3c></div><script src=\"vue.global.prod.js\"></script>",
+    "window.__VUE__ = true; Vue.config.productionTip = false",
+    "Contact Us | PHONE: 01-4261234 | Email: info@school.edu.np | Address: Kathmandu",
+    "contactcontact phonephone emailemail",
+    "İd=\"root\" and İd=\"app\" Contact İnfo",  # lowercasing changes the length
+    "café Location — téléphone",
+]
+
+
+@pytest.fixture(params=["native", "python"])
+def automaton(request):
+    if request.param == "native":
+        if scraper_v3.ahocorasick is None:
+            pytest.skip("pyahocorasick not installed")
+        built = KeywordAutomaton(GROUPS, case_sensitive=["react"])
+        assert built._native is not None
+        return built
+    saved = scraper_v3.ahocorasick
+    scraper_v3.ahocorasick = None
+    try:
+        built = KeywordAutomaton(GROUPS, case_sensitive=["react"])
+    finally:
+        scraper_v3.ahocorasick = saved
+    assert built._native is None
+    return built
+
+
+def random_strings(count, seed=20260418):
+    words = CONTACT_KEYWORDS + REACT_INDICATORS + VUE_INDICATORS
+    alphabet = "abcdeilnoprtuvxACEIOPRTUV_-.=\"'/@ <>"
+    rng = random.Random(seed)
+    for _ in range(count):
+        parts = []
+        for _ in range(rng.randint(1, 10)):
+            if rng.random() < 0.3:
+                word = rng.choice(words)
+                if rng.random() < 0.5:
+                    word = "".join(ch.upper() if rng.random() < 0.5 else ch for ch in word)
+                if rng.random() < 0.3:  # broken keyword
+                    cut = rng.randrange(len(word))
+                    word = word[:cut] + word[cut + 1 :]
+                parts.append(word)
+            else:
+                parts.append("".join(rng.choice(alphabet) for _ in range(rng.randint(1, 8))))
+        yield "".join(parts)
+
+
+def expected(text, vue=True):
+    lowered = text.lower()
+    found = {
+        "contact": {kw for kw in CONTACT_KEYWORDS if kw in lowered},
+        "react": {kw for kw in REACT_INDICATORS if kw in text},
+    }
+    if vue:
+        found["vue"] = {kw for kw in VUE_INDICATORS if kw.lower() in lowered}
+    return found
+
+
+def check(automaton, text, vue=True):
+    found = automaton.find(text)
+    if not vue:
+        del found["vue"]
+    assert found == expected(text, vue), text
+    # the checks callers used to run
+    assert bool(found["contact"]) == any(kw in text.lower() for kw in CONTACT_KEYWORDS), text
+    assert bool(found["react"]) == any(ind in text for ind in REACT_INDICATORS), text
+    if vue:
+        assert bool(found["vue"]) == any(re.search(p, text, re.IGNORECASE) for p in VUE_REGEXES), text
+    assert automaton.contains(text, "contact") == bool(found["contact"]), text
+
+
+@pytest.mark.parametrize("text", CORPUS)
+def test_matches_old_checks_on_corpus(automaton, text):
+    # re.IGNORECASE folds "İ" to "i" where str.lower() gives "i̇", so the
+    # Vue regexes only compare on text whose lowercase keeps its length
+    check(automaton, text, vue=len(text.lower()) == len(text))
+
+
+def test_matches_old_checks_on_random_strings(automaton):
+    for text in random_strings(5000):
+        check(automaton, text)
+
+
+def test_spans(automaton):
+    for text in random_strings(1000):
+        lowered = text.lower()
+        naive = []
+        for kw in set(CONTACT_KEYWORDS):
+            start = lowered.find(kw)
+            while start != -1:
+                naive.append((start, start + len(kw)))
+                start = lowered.find(kw, start + 1)
+        spans = automaton.spans(text, "contact")
+        assert sorted(spans) == sorted(naive), text
+        assert [end for _start, end in spans] == sorted(end for _start, end in spans)
+
+
+# ----------------------------------------------------------------------
+# area-code trie vs the longest-first alternation it replaced
+# ----------------------------------------------------------------------
+ALTERNATION = "|".join(sorted(_VALID_AREA_CODES, key=len, reverse=True))
+
+
+def digit_strings(count, seed=7):
+    rng = random.Random(seed)
+    for _ in range(count):
+        yield "".join(rng.choice("0123456789 -+.") for _ in range(rng.randint(1, 30)))
+
+
+def test_area_code_trie_matches_alternation():
+    trie, alternation = re.compile(f"(?:{_AREA_CODE_PATTERN})"), re.compile(f"(?:{ALTERNATION})")
+    for code in _VALID_AREA_CODES:
+        assert trie.fullmatch(code)
+    for text in digit_strings(3000):
+        for pos in range(len(text)):
+            a, b = trie.match(text, pos), alternation.match(text, pos)
+            assert (a and a.span()) == (b and b.span()), (text, pos)
+
+
+def test_other_phone_pattern_unchanged():
+    assert _AREA_CODE_PATTERN in Patterns.OTHER_PHONE_NP.pattern
+    old = re.compile(
+        Patterns.OTHER_PHONE_NP.pattern.replace(_AREA_CODE_PATTERN, ALTERNATION),
+        Patterns.OTHER_PHONE_NP.flags,
+    )
+    texts = list(digit_strings(3000)) + ["Tel: 061-531234, 021 525252, 0101234567, +977-1-4261234"]
+    for text in texts:
+        new_matches = [(m.group(), m.span()) for m in Patterns.OTHER_PHONE_NP.finditer(text)]
+        old_matches = [(m.group(), m.span()) for m in old.finditer(text)]
+        assert new_matches == old_matches, text
@@ -0,0 +1,43 @@
+import pytest
+
+from scraper_v3 import Fetcher, group_site_aliases, normalize_url, site_key
+
+
+@pytest.mark.parametrize(
+    "url, expected",
+    [
+        ("HTTP://WWW.Example.com:80/About/?utm_source=x&b=2&a=1#top", "http://www.example.com/About?a=1&b=2"),
+        ("https://example.com:443/", "https://example.com"),
+        ("https://example.com:8443/x/", "https://example.com:8443/x"),
+    ],
+)
+def test_normalize_url(url, expected):
+    assert normalize_url(url) == expected
+
+
+@pytest.mark.parametrize("url", ["http://x.com:99999/", "http://x.com:abc/", "http://x.com:-1/"])
+def test_bad_port_is_returned_unchanged(url):
+    assert normalize_url(url) == url
+    assert site_key(url)
+
+
+@pytest.mark.parametrize(
+    "url, expected",
+    [
+        ("http://[::1]:8080/x", "http://[::1]:8080/x"),
+        ("http://[2001:DB8::1]/a/?utm_medium=y", "http://[2001:db8::1]/a"),
+        ("https://[::1]:443/", "https://[::1]"),
+    ],
+)
+def test_ipv6_host_keeps_brackets(url, expected):
+    assert normalize_url(url) == expected
+
+
+def test_group_site_aliases_survives_bad_ports():
+    fetcher = Fetcher()
+    try:
+        urls = ["http://x.com:99999/", "http://x.com:abc/"]
+        groups = group_site_aliases(urls, fetcher)
+    finally:
+        fetcher.close()
+    assert sorted(alias for aliases in groups.values() for alias in aliases) == sorted(urls)
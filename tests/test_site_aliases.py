@@ -0,0 +1,77 @@
+import threading
+from concurrent.futures import Future
+
+from scraper_v3 import SiteAliases, group_site_aliases
+
+
+class RedirectingFetcher:
+    """Resolves URLs through a fixed redirect map."""
+
+    def __init__(self, redirects):
+        self.redirects = redirects
+
+    def submit_resolve(self, url):
+        future = Future()
+        future.set_result(self.redirects.get(url, url))
+        return future
+
+
+def result(site):
+    return {"website": site, "emails": [], "numbers": [], "truncated": False, "status": "ok"}
+
+
+def test_streamed_aliases_fold_into_the_first_url():
+    aliases = SiteAliases()
+    assert aliases.add("http://x.com/") == ("http://x.com", [])
+    assert aliases.add("https://www.x.com") == (None, [])
+    assert aliases.add("http://x.com/") == (None, [])  # exact repeat
+    rows = aliases.finish(result("http://x.com"))
+    assert [row["website"] for row in rows] == ["http://x.com/", "https://www.x.com"]
+
+
+def test_alias_after_finish_gets_its_row_at_once():
+    aliases = SiteAliases()
+    site, _ = aliases.add("http://x.com")
+    aliases.finish(result(site))
+    assert aliases.add("http://x.com/?utm_source=maps") == (
+        None,
+        [{**result(site), "website": "http://x.com/?utm_source=maps"}],
+    )
+
+
+def test_every_alias_gets_exactly_one_row_under_contention():
+    for _ in range(100):
+        aliases = SiteAliases()
+        site, _ = aliases.add("http://x.com")
+        urls = [f"http://x.com/?utm_source={i}" for i in range(200)]
+        rows, rows_lock = [], threading.Lock()
+
+        def add_all():
+            for url in urls:
+                _, ready = aliases.add(url)
+                with rows_lock:
+                    rows.extend(ready)
+
+        adder = threading.Thread(target=add_all)
+        adder.start()
+        finished = aliases.finish(result(site))
+        adder.join()
+        emitted = [row["website"] for row in rows + finished]
+        assert sorted(emitted) == sorted(["http://x.com"] + urls)
+
+
+def test_redirect_to_a_deeper_page_scrapes_at_the_origin():
+    fetcher = RedirectingFetcher(
+        {
+            "https://x.com": "https://www.x.com/en/index.php",
+            "http://x.com/": "https://www.x.com/en/index.php",
+            "https://y.com/school": "https://y.com/school/en/home?lang=en",
+        }
+    )
+    sites = group_site_aliases(
+        ["https://x.com", "www.x.com/en/index.php", "https://y.com/school"], fetcher
+    )
+    assert sites == {
+        "https://www.x.com": ["https://x.com", "www.x.com/en/index.php"],
+        "https://y.com/school": ["https://y.com/school"],
+    }